@@ -19,6 +19,7 @@ from utils.logger import logger
 from services.billing import check_billing_status, can_use_model
 from utils.config import config
 from sandbox.sandbox import create_sandbox, delete_sandbox, get_or_start_sandbox
+from sandbox.api import invalidate_sandbox_cache
 from services.llm import make_llm_api_call
 from run_agent_background import run_agent_background, _cleanup_redis_response_list, update_agent_run_status
 from utils.constants import MODEL_NAME_ALIASES
@@ -911,6 +912,7 @@ async def initiate_agent_with_files(
         except Exception as e:
             logger.error(f"Error creating sandbox: {str(e)}")
             await client.table('projects').delete().eq('project_id', project_id).execute()
+            invalidate_sandbox_cache(sandbox_id=sandbox_id, project_id=project_id)
             if sandbox_id:
               try: await delete_sandbox(sandbox_id)
               except Exception as e: pass
@@ -924,6 +926,7 @@ async def initiate_agent_with_files(
                 'sandbox_url': website_url, 'token': token
             }
         }).eq('project_id', project_id).execute()
+        invalidate_sandbox_cache(project_id=project_id)
 
         if not update_result.data:
             logger.error(f"Failed to update project {project_id} with new sandbox {sandbox_id}")
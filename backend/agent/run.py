@@ -1,6 +1,7 @@
 import os
 import json
 import re
+import time
 from uuid import uuid4
 from typing import Optional
 
@@ -34,6 +35,69 @@ from agentpress.tool import SchemaType
 
 load_dotenv()
 
+BROWSER_STATE_HIDDEN_FIELDS = ("screenshot_base64", "image_url", "elements", "elements_ref", "element_hashes", "elements_hash", "interactive_elements", "role")
+
+async def load_browser_state_blocks(client, message_id: str, cache: dict) -> dict:
+    """Fetch a browser_state message and render it into temporary message content blocks.
+
+    The element listing is resolved through `elements_ref` when the stored state is unchanged
+    from an earlier one, using the per-run cache before falling back to the database.
+    """
+    result = await client.table('messages').select('content').eq('message_id', message_id).execute()
+    blocks = []
+    elements_cache = cache["elements"]
+    if not result.data:
+        return {"message_id": message_id, "blocks": blocks, "elements": elements_cache}
+
+    browser_content = result.data[0]["content"]
+    if isinstance(browser_content, str):
+        browser_content = json.loads(browser_content)
+
+    elements = browser_content.get("elements")
+    elements_ref = browser_content.get("elements_ref")
+    if elements is None and elements_ref:
+        elements = elements_cache.get(elements_ref)
+        if elements is None:
+            ref_result = await client.table('messages').select('content').eq('message_id', elements_ref).execute()
+            if ref_result.data:
+                ref_content = ref_result.data[0]["content"]
+                if isinstance(ref_content, str):
+                    ref_content = json.loads(ref_content)
+                elements = ref_content.get("elements")
+    # Only the listing the next state can reference needs to stay cached
+    elements_cache = {elements_ref or message_id: elements} if elements else {}
+
+    browser_state_text = {k: v for k, v in browser_content.items() if k not in BROWSER_STATE_HIDDEN_FIELDS and v not in (None, "", [], {})}
+    if browser_state_text or elements:
+        text = f"The following is the current state of the browser:\n{json.dumps(browser_state_text, separators=(',', ':'))}"
+        if elements:
+            text += f"\n\nInteractive elements:\n{elements}"
+        blocks.append({"type": "text", "text": text})
+
+    # Prioritize screenshot_url if available
+    screenshot_url = browser_content.get("image_url")
+    screenshot_base64 = browser_content.get("screenshot_base64")
+    if screenshot_url:
+        blocks.append({
+            "type": "image_url",
+            "image_url": {
+                "url": screenshot_url,
+                "format": "image/jpeg"
+            }
+        })
+    elif screenshot_base64:
+        # Fallback to base64 if URL not available
+        blocks.append({
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/jpeg;base64,{screenshot_base64}",
+            }
+        })
+    else:
+        logger.warning("Browser state found but no screenshot data.")
+
+    return {"message_id": message_id, "blocks": blocks, "elements": elements_cache}
+
 async def run_agent(
     thread_id: str,
     project_id: str,
@@ -88,6 +152,8 @@ async def run_agent(
     # Register tools based on configuration
     # If no agent config (enabled_tools is None), register ALL tools for full Suna capabilities
     # If agent config exists, only register explicitly enabled tools
+    # Tools are registered lazily: schemas now, instances (and their clients) on first use
+    tool_registration_start = time.perf_counter()
     if is_agent_builder:
         logger.info("Agent builder mode - registering only update agent tool")
         from agent.tools.update_agent_tool import UpdateAgentTool
@@ -98,37 +164,37 @@ async def run_agent(
     if enabled_tools is None:
         # No agent specified - register ALL tools for full Suna experience
         logger.info("No agent specified - registering all tools for full Suna capabilities")
-        thread_manager.add_tool(SandboxShellTool, project_id=project_id, thread_manager=thread_manager)
-        thread_manager.add_tool(SandboxFilesTool, project_id=project_id, thread_manager=thread_manager)
-        thread_manager.add_tool(SandboxBrowserTool, project_id=project_id, thread_id=thread_id, thread_manager=thread_manager)
-        thread_manager.add_tool(SandboxDeployTool, project_id=project_id, thread_manager=thread_manager)
-        thread_manager.add_tool(SandboxExposeTool, project_id=project_id, thread_manager=thread_manager)
-        thread_manager.add_tool(ExpandMessageTool, thread_id=thread_id, thread_manager=thread_manager)
-        thread_manager.add_tool(MessageTool)
-        thread_manager.add_tool(SandboxWebSearchTool, project_id=project_id, thread_manager=thread_manager)
-        thread_manager.add_tool(SandboxVisionTool, project_id=project_id, thread_id=thread_id, thread_manager=thread_manager)
+        thread_manager.add_tool(SandboxShellTool, lazy=True, project_id=project_id, thread_manager=thread_manager)
+        thread_manager.add_tool(SandboxFilesTool, lazy=True, project_id=project_id, thread_manager=thread_manager)
+        thread_manager.add_tool(SandboxBrowserTool, lazy=True, project_id=project_id, thread_id=thread_id, thread_manager=thread_manager)
+        thread_manager.add_tool(SandboxDeployTool, lazy=True, project_id=project_id, thread_manager=thread_manager)
+        thread_manager.add_tool(SandboxExposeTool, lazy=True, project_id=project_id, thread_manager=thread_manager)
+        thread_manager.add_tool(ExpandMessageTool, lazy=True, thread_id=thread_id, thread_manager=thread_manager)
+        thread_manager.add_tool(MessageTool, lazy=True)
+        thread_manager.add_tool(SandboxWebSearchTool, lazy=True, project_id=project_id, thread_manager=thread_manager)
+        thread_manager.add_tool(SandboxVisionTool, lazy=True, project_id=project_id, thread_id=thread_id, thread_manager=thread_manager)
         if config.RAPID_API_KEY:
-            thread_manager.add_tool(DataProvidersTool)
+            thread_manager.add_tool(DataProvidersTool, lazy=True)
     else:
         logger.info("Custom agent specified - registering only enabled tools")
-        thread_manager.add_tool(ExpandMessageTool, thread_id=thread_id, thread_manager=thread_manager)
-        thread_manager.add_tool(MessageTool)
+        thread_manager.add_tool(ExpandMessageTool, lazy=True, thread_id=thread_id, thread_manager=thread_manager)
+        thread_manager.add_tool(MessageTool, lazy=True)
         if enabled_tools.get('sb_shell_tool', {}).get('enabled', False):
-            thread_manager.add_tool(SandboxShellTool, project_id=project_id, thread_manager=thread_manager)
+            thread_manager.add_tool(SandboxShellTool, lazy=True, project_id=project_id, thread_manager=thread_manager)
         if enabled_tools.get('sb_files_tool', {}).get('enabled', False):
-            thread_manager.add_tool(SandboxFilesTool, project_id=project_id, thread_manager=thread_manager)
+            thread_manager.add_tool(SandboxFilesTool, lazy=True, project_id=project_id, thread_manager=thread_manager)
         if enabled_tools.get('sb_browser_tool', {}).get('enabled', False):
-            thread_manager.add_tool(SandboxBrowserTool, project_id=project_id, thread_id=thread_id, thread_manager=thread_manager)
+            thread_manager.add_tool(SandboxBrowserTool, lazy=True, project_id=project_id, thread_id=thread_id, thread_manager=thread_manager)
         if enabled_tools.get('sb_deploy_tool', {}).get('enabled', False):
-            thread_manager.add_tool(SandboxDeployTool, project_id=project_id, thread_manager=thread_manager)
+            thread_manager.add_tool(SandboxDeployTool, lazy=True, project_id=project_id, thread_manager=thread_manager)
         if enabled_tools.get('sb_expose_tool', {}).get('enabled', False):
-            thread_manager.add_tool(SandboxExposeTool, project_id=project_id, thread_manager=thread_manager)
+            thread_manager.add_tool(SandboxExposeTool, lazy=True, project_id=project_id, thread_manager=thread_manager)
         if enabled_tools.get('web_search_tool', {}).get('enabled', False):
-            thread_manager.add_tool(SandboxWebSearchTool, project_id=project_id, thread_manager=thread_manager)
+            thread_manager.add_tool(SandboxWebSearchTool, lazy=True, project_id=project_id, thread_manager=thread_manager)
         if enabled_tools.get('sb_vision_tool', {}).get('enabled', False):
-            thread_manager.add_tool(SandboxVisionTool, project_id=project_id, thread_id=thread_id, thread_manager=thread_manager)
+            thread_manager.add_tool(SandboxVisionTool, lazy=True, project_id=project_id, thread_id=thread_id, thread_manager=thread_manager)
         if config.RAPID_API_KEY and enabled_tools.get('data_providers_tool', {}).get('enabled', False):
-            thread_manager.add_tool(DataProvidersTool)
+            thread_manager.add_tool(DataProvidersTool, lazy=True)
 
     # Register MCP tool wrapper if agent has configured MCPs or custom MCPs
     mcp_wrapper_instance = None
@@ -180,16 +246,18 @@ async def run_agent(
                             # Register each dynamic tool in the registry
                             for schema in schema_list:
                                 if schema.schema_type == SchemaType.OPENAPI:
-                                    thread_manager.tool_registry.tools[method_name] = {
-                                        "instance": mcp_wrapper_instance,
-                                        "schema": schema
-                                    }
+                                    thread_manager.tool_registry.register_function(method_name, mcp_wrapper_instance, schema)
                                     logger.debug(f"Registered dynamic MCP tool: {method_name}")
                 
                 except Exception as e:
                     logger.error(f"Failed to initialize MCP tools: {e}")
                     # Continue without MCP tools if initialization fails
 
+    tool_registration_ms = (time.perf_counter() - tool_registration_start) * 1000
+    construction_times = thread_manager.tool_registry.construction_times
+    logger.info(f"Registered {len(thread_manager.tool_registry.tools)} tool functions in {tool_registration_ms:.1f}ms (constructed eagerly: {', '.join(f'{name}={ms:.1f}ms' for name, ms in construction_times.items()) or 'none'})")
+    trace.event(name="tool_registration", level="DEFAULT", status_message=(f"{tool_registration_ms:.1f}ms"), metadata={"construction_ms": dict(construction_times)})
+
     # Prepare system prompt
     # First, get the default system prompt
     if "gemini-2.5-flash" in model_name.lower():
@@ -295,6 +363,9 @@ async def run_agent(
             data = json.loads(data)
         trace.update(input=data['content'])
 
+    # Rendered browser state for this run, rebuilt only when a new browser_state message appears
+    browser_state_cache = {"message_id": None, "blocks": [], "elements": {}}
+
     while continue_execution and iteration_count < max_iterations:
         iteration_count += 1
         logger.info(f"🔄 Running iteration {iteration_count} of {max_iterations}...")
@@ -325,73 +396,52 @@ async def run_agent(
         temporary_message = None
         temp_message_content_list = [] # List to hold text/image blocks
 
-        # Get the latest browser_state message
-        latest_browser_state_msg = await client.table('messages').select('*').eq('thread_id', thread_id).eq('type', 'browser_state').order('created_at', desc=True).limit(1).execute()
+        # Get the latest browser_state message id; content is only fetched when it changed
+        latest_browser_state_msg = await client.table('messages').select('message_id').eq('thread_id', thread_id).eq('type', 'browser_state').order('created_at', desc=True).limit(1).execute()
         if latest_browser_state_msg.data and len(latest_browser_state_msg.data) > 0:
-            try:
-                browser_content = latest_browser_state_msg.data[0]["content"]
-                if isinstance(browser_content, str):
-                    browser_content = json.loads(browser_content)
-                screenshot_base64 = browser_content.get("screenshot_base64")
-                screenshot_url = browser_content.get("image_url")
-                
-                # Create a copy of the browser state without screenshot data
-                browser_state_text = browser_content.copy()
-                browser_state_text.pop('screenshot_base64', None)
-                browser_state_text.pop('image_url', None)
-
-                if browser_state_text:
-                    temp_message_content_list.append({
-                        "type": "text",
-                        "text": f"The following is the current state of the browser:\n{json.dumps(browser_state_text, indent=2)}"
-                    })
-                    
-                # Prioritize screenshot_url if available
-                if screenshot_url:
-                    temp_message_content_list.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": screenshot_url,
-                            "format": "image/jpeg"
-                        }
-                    })
-                elif screenshot_base64:
-                    # Fallback to base64 if URL not available
-                    temp_message_content_list.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/jpeg;base64,{screenshot_base64}",
-                        }
-                    })
-                else:
-                    logger.warning("Browser state found but no screenshot data.")
-
-            except Exception as e:
-                logger.error(f"Error parsing browser state: {e}")
-                trace.event(name="error_parsing_browser_state", level="ERROR", status_message=(f"{e}"))
+            browser_state_id = latest_browser_state_msg.data[0]["message_id"]
+            if browser_state_id != browser_state_cache["message_id"]:
+                try:
+                    browser_state_cache = await load_browser_state_blocks(client, browser_state_id, browser_state_cache)
+                except Exception as e:
+                    logger.error(f"Error parsing browser state: {e}")
+                    trace.event(name="error_parsing_browser_state", level="ERROR", status_message=(f"{e}"))
+                    browser_state_cache = {"message_id": None, "blocks": [], "elements": {}}
+            temp_message_content_list.extend(browser_state_cache["blocks"])
 
         # Get the latest image_context message (NEW)
         latest_image_context_msg = await client.table('messages').select('*').eq('thread_id', thread_id).eq('type', 'image_context').order('created_at', desc=True).limit(1).execute()
         if latest_image_context_msg.data and len(latest_image_context_msg.data) > 0:
             try:
                 image_context_content = latest_image_context_msg.data[0]["content"] if isinstance(latest_image_context_msg.data[0]["content"], dict) else json.loads(latest_image_context_msg.data[0]["content"])
+                image_url = image_context_content.get("image_url")
                 base64_image = image_context_content.get("base64")
                 mime_type = image_context_content.get("mime_type")
                 file_path = image_context_content.get("file_path", "unknown file")
 
-                if base64_image and mime_type:
+                # Prefer the stored object reference; inline base64 is the upload-failure fallback
+                if image_url or (base64_image and mime_type):
                     temp_message_content_list.append({
                         "type": "text",
                         "text": f"Here is the image you requested to see: '{file_path}'"
                     })
-                    temp_message_content_list.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:{mime_type};base64,{base64_image}",
-                        }
-                    })
+                    if image_url:
+                        temp_message_content_list.append({
+                            "type": "image_url",
+                            "image_url": {
+                                "url": image_url,
+                                "format": mime_type or "image/jpeg"
+                            }
+                        })
+                    else:
+                        temp_message_content_list.append({
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:{mime_type};base64,{base64_image}",
+                            }
+                        })
                 else:
-                    logger.warning(f"Image context found for '{file_path}' but missing base64 or mime_type.")
+                    logger.warning(f"Image context found for '{file_path}' but missing image_url or base64 data.")
 
                 await client.table('messages').delete().eq('message_id', latest_image_context_msg.data[0]["message_id"]).execute()
             except Exception as e:
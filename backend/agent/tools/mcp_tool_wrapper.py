@@ -27,6 +27,9 @@ class MCPToolWrapper(Tool):
     through the same underlying implementation.
     """
     
+    # Schemas are added per instance once the MCP servers are connected
+    dynamic_schemas = True
+    
     def __init__(self, mcp_configs: Optional[List[Dict[str, Any]]] = None):
         """
         Initialize the MCP tool wrapper.
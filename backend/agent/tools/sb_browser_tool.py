@@ -1,5 +1,8 @@
+import asyncio
 import traceback
 import json
+import hashlib
+from typing import Optional
 
 from agentpress.tool import ToolResult, openapi_schema, xml_schema
 from agentpress.thread_manager import ThreadManager
@@ -14,6 +17,88 @@ class SandboxBrowserTool(SandboxToolsBase):
     def __init__(self, project_id: str, thread_id: str, thread_manager: ThreadManager):
         super().__init__(project_id, thread_manager)
         self.thread_id = thread_id
+        # Hashes of the last stored browser_state, used to store diffs instead of full element lists
+        self._last_browser_state: Optional[dict] = None
+
+    async def _call_browser_api(self, endpoint: str, params: dict = None, method: str = "POST", timeout: int = 30):
+        """Call the browser automation API inside the sandbox
+        
+        Args:
+            endpoint (str): The API endpoint to call
+            params (dict, optional): Parameters to send. Defaults to None.
+            method (str, optional): HTTP method to use. Defaults to "POST".
+            timeout (int, optional): Seconds to wait for the command. Defaults to 30.
+            
+        Returns:
+            The sandbox command response
+        """
+        # Ensure sandbox is initialized
+        await self._ensure_sandbox()
+        
+        # Build the curl command
+        url = f"http://localhost:8003/api/automation/{endpoint}"
+        
+        if method == "GET" and params:
+            query_params = "&".join([f"{k}={v}" for k, v in params.items()])
+            url = f"{url}?{query_params}"
+            curl_cmd = f"curl -s -X {method} '{url}' -H 'Content-Type: application/json'"
+        else:
+            curl_cmd = f"curl -s -X {method} '{url}' -H 'Content-Type: application/json'"
+            if params:
+                json_data = json.dumps(params)
+                curl_cmd += f" -d '{json_data}'"
+        
+        logger.debug("\033[95mExecuting curl command:\033[0m")
+        logger.debug(f"{curl_cmd}")
+        
+        # The SDK call is synchronous; run it in a worker thread so a long batch visit
+        # does not block the event loop for every other agent run
+        return await asyncio.to_thread(self.sandbox.process.exec, curl_cmd, timeout=timeout)
+
+    def _compact_browser_state(self, result: dict) -> dict:
+        """Build the browser_state row: hashed element list plus a diff against the previous state.
+        
+        When the element listing is identical to the previous one, the text is replaced by a
+        reference to the message that already carries it.
+        """
+        state = dict(result)
+        interactive_elements = state.pop("interactive_elements", None) or []
+        element_hashes = {
+            str(element.get("index")): hashlib.sha1(json.dumps(element, sort_keys=True).encode()).hexdigest()[:10]
+            for element in interactive_elements
+        }
+        state["element_hashes"] = element_hashes
+        state["elements_hash"] = hashlib.sha1((state.get("elements") or "").encode()).hexdigest()[:16]
+
+        previous = self._last_browser_state
+        if previous:
+            if state.get("snapshot_type") == "incremental":
+                # Incremental snapshots only report changed/viewport elements, so absence is not removal
+                removed = state.get("removed_element_indexes") or []
+            else:
+                removed = sorted(int(index) for index in previous["element_hashes"] if index not in element_hashes)
+            state["state_diff"] = {
+                "previous_message_id": previous.get("message_id"),
+                "url_changed": previous.get("url") != state.get("url"),
+                "changed_element_indexes": sorted(
+                    int(index) for index, digest in element_hashes.items() if previous["element_hashes"].get(index) != digest
+                ),
+                "removed_element_indexes": removed
+            }
+            if state["elements_hash"] == previous["elements_hash"] and previous.get("elements_message_id"):
+                state["elements"] = None
+                state["elements_ref"] = previous["elements_message_id"]
+        return state
+
+    def _remember_browser_state(self, state: dict, added_message: Optional[dict]):
+        message_id = added_message.get("message_id") if added_message else None
+        self._last_browser_state = {
+            "message_id": message_id,
+            "url": state.get("url"),
+            "element_hashes": state["element_hashes"],
+            "elements_hash": state["elements_hash"],
+            "elements_message_id": state.get("elements_ref") or message_id
+        }
 
     async def _execute_browser_action(self, endpoint: str, params: dict = None, method: str = "POST") -> ToolResult:
         """Execute a browser automation action through the API
@@ -27,26 +112,7 @@ class SandboxBrowserTool(SandboxToolsBase):
             ToolResult: Result of the execution
         """
         try:
-            # Ensure sandbox is initialized
-            await self._ensure_sandbox()
-            
-            # Build the curl command
-            url = f"http://localhost:8003/api/automation/{endpoint}"
-            
-            if method == "GET" and params:
-                query_params = "&".join([f"{k}={v}" for k, v in params.items()])
-                url = f"{url}?{query_params}"
-                curl_cmd = f"curl -s -X {method} '{url}' -H 'Content-Type: application/json'"
-            else:
-                curl_cmd = f"curl -s -X {method} '{url}' -H 'Content-Type: application/json'"
-                if params:
-                    json_data = json.dumps(params)
-                    curl_cmd += f" -d '{json_data}'"
-            
-            logger.debug("\033[95mExecuting curl command:\033[0m")
-            logger.debug(f"{curl_cmd}")
-            
-            response = self.sandbox.process.exec(curl_cmd, timeout=30)
+            response = await self._call_browser_api(endpoint, params, method)
             
             if response.exit_code == 0:
                 try:
@@ -71,12 +137,14 @@ class SandboxBrowserTool(SandboxToolsBase):
                             logger.error(f"Failed to upload screenshot: {e}")
                             result["image_upload_error"] = str(e)
 
+                    browser_state = self._compact_browser_state(result)
                     added_message = await self.thread_manager.add_message(
                         thread_id=self.thread_id,
                         type="browser_state",
-                        content=result,
+                        content=browser_state,
                         is_llm_message=False
                     )
+                    self._remember_browser_state(browser_state, added_message)
 
                     success_response = {
                         "success": True,
@@ -717,6 +785,36 @@ class SandboxBrowserTool(SandboxToolsBase):
         logger.debug(f"\033[95mScrolling to text: {text}\033[0m")
         return await self._execute_browser_action("scroll_to_text", {"text": text})
 
+    @openapi_schema({
+        "type": "function",
+        "function": {
+            "name": "browser_extract_ocr_text",
+            "description": "Extract visible text from the current viewport using OCR. Only needed when the page renders text the element list does not expose, such as canvases, images or embedded PDFs.",
+            "parameters": {
+                "type": "object",
+                "properties": {}
+            }
+        }
+    })
+    @xml_schema(
+        tag_name="browser-extract-ocr-text",
+        mappings=[],
+        example='''
+        <function_calls>
+        <invoke name="browser_extract_ocr_text">
+        </invoke>
+        </function_calls>
+        '''
+    )
+    async def browser_extract_ocr_text(self) -> ToolResult:
+        """Extract visible text from the current viewport using OCR
+
+        Returns:
+            dict: Result of the execution
+        """
+        logger.debug("\033[95mExtracting OCR text from viewport\033[0m")
+        return await self._execute_browser_action("extract_ocr_text", {})
+
     @openapi_schema({
         "type": "function",
         "function": {
@@ -943,4 +1041,89 @@ class SandboxBrowserTool(SandboxToolsBase):
             dict: Result of the execution
         """
         logger.debug(f"\033[95mClicking at coordinates: ({x}, {y})\033[0m")
-        return await self._execute_browser_action("click_coordinates", {"x": x, "y": y})
\ No newline at end of file
+        return await self._execute_browser_action("click_coordinates", {"x": x, "y": y})
+
+    @openapi_schema({
+        "type": "function",
+        "function": {
+            "name": "browser_visit_urls",
+            "description": "Open several URLs concurrently in background browser pages and return the visible text of each, keyed by URL. Use this instead of navigating to each page one at a time when researching a list of pages that need a real browser (JavaScript-rendered content). It does not change the current tab.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "urls": {
+                        "type": "string",
+                        "description": "URLs to visit, separated by commas"
+                    },
+                    "include_screenshots": {
+                        "type": "boolean",
+                        "description": "Also capture a viewport screenshot of each page",
+                        "default": False
+                    }
+                },
+                "required": ["urls"]
+            }
+        }
+    })
+    @xml_schema(
+        tag_name="browser-visit-urls",
+        mappings=[
+            {"param_name": "urls", "node_type": "content", "path": "."},
+            {"param_name": "include_screenshots", "node_type": "attribute", "path": ".", "required": False}
+        ],
+        example='''
+        <function_calls>
+        <invoke name="browser_visit_urls">
+        <parameter name="urls">https://www.crunchbase.com/organization/kortix,https://www.crunchbase.com/organization/daytona</parameter>
+        </invoke>
+        </function_calls>
+        '''
+    )
+    async def browser_visit_urls(self, urls: str, include_screenshots: bool = False) -> ToolResult:
+        """Open several URLs concurrently in background pages and return their text
+        
+        Args:
+            urls (str): URLs to visit, separated by commas
+            include_screenshots (bool): Also capture a viewport screenshot of each page
+            
+        Returns:
+            dict: Result of the execution
+        """
+        url_list = [url.strip() for url in urls.split(',') if url.strip()]
+        if not url_list:
+            return self.fail_response("No valid URLs provided.")
+        
+        logger.debug(f"\033[95mVisiting {len(url_list)} URLs in background pages\033[0m")
+        try:
+            params = {
+                "urls": url_list,
+                "include_text": True,
+                "include_screenshot": include_screenshots,
+                "max_text_length": 5000
+            }
+            # Pages are visited in a bounded pool, so allow time proportional to the batch
+            response = await self._call_browser_api("batch_visit", params, timeout=min(600, 30 + 15 * len(url_list)))
+            if response.exit_code != 0:
+                return self.fail_response(f"Browser batch visit failed: {response}")
+            
+            result = json.loads(response.result)
+            for page_result in result.get("results", {}).values():
+                screenshot = page_result.pop("screenshot_base64", None)
+                if screenshot:
+                    try:
+                        page_result["image_url"] = await upload_base64_image(screenshot)
+                    except Exception as e:
+                        logger.error(f"Failed to upload screenshot: {e}")
+                        page_result["image_upload_error"] = str(e)
+            
+            if not result.get("success"):
+                return self.fail_response(result.get("error") or result.get("message", "Browser batch visit failed"))
+            return self.success_response(result)
+        
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse response JSON: {response.result} {e}")
+            return self.fail_response(f"Failed to parse response JSON: {response.result} {e}")
+        except Exception as e:
+            logger.error(f"Error executing browser batch visit: {e}")
+            logger.debug(traceback.format_exc())
+            return self.fail_response(f"Error executing browser batch visit: {e}")
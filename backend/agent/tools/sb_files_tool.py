@@ -1,9 +1,43 @@
 from agentpress.tool import ToolResult, openapi_schema, xml_schema
 from sandbox.tool_base import SandboxToolsBase    
-from utils.files_utils import should_exclude_file, clean_path
+from utils.files_utils import should_exclude_file, clean_path, EXCLUDED_FILES, EXCLUDED_DIRS, EXCLUDED_EXT
 from agentpress.thread_manager import ThreadManager
 from utils.logger import logger
+from typing import Dict, List, Optional
+import base64
+import io
+import json
 import os
+import shlex
+import tarfile
+import time
+import uuid
+
+# Files up to this size are written inline in a single exec call; larger ones go through upload + move.
+# Inline content is base64-encoded twice (heredoc + script) and passed as one `sh -c` argument, which
+# grows it ~1.78x; 48 KB keeps that under Linux's 128 KiB single-argument limit (MAX_ARG_STRLEN).
+INLINE_WRITE_LIMIT = 48 * 1024
+
+STR_REPLACE_SCRIPT = '''
+import base64, json, sys
+path = base64.b64decode("{path}").decode()
+old = base64.b64decode("{old}").decode()
+new = base64.b64decode("{new}").decode()
+try:
+    with open(path, encoding="utf-8", newline="") as f:
+        content = f.read()
+except FileNotFoundError:
+    print(json.dumps({{"status": "missing"}}))
+    sys.exit(0)
+occurrences = content.count(old)
+lines = []
+if occurrences == 1:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(content.replace(old, new))
+elif occurrences > 1:
+    lines = [i + 1 for i, line in enumerate(content.split("\\n")) if old in line]
+print(json.dumps({{"status": "ok", "occurrences": occurrences, "lines": lines}}))
+'''
 
 class SandboxFilesTool(SandboxToolsBase):
     """Tool for executing file system operations in a Daytona sandbox. All operations are performed relative to the /workspace directory."""
@@ -29,32 +63,170 @@ class SandboxFilesTool(SandboxToolsBase):
         except Exception:
             return False
 
+    def _run_script(self, script: str, interpreter: str = "sh", timeout: int = 60):
+        """Run a script in the sandbox with a single exec call.
+
+        The script is shipped base64-encoded so paths and file contents never need shell quoting.
+        """
+        encoded = base64.b64encode(script.encode()).decode()
+        return self.sandbox.process.exec(f"/bin/sh -c 'echo {encoded} | base64 -d | {interpreter}'", timeout=timeout)
+
+    def _find_workspace_files_command(self) -> str:
+        """Shell command printing NUL-separated workspace files, pruning excluded dirs, names and extensions."""
+        prune = " -o ".join(f"-name {shlex.quote(name)}" for name in sorted(EXCLUDED_DIRS))
+        skip = [f"! -name {shlex.quote(name)}" for name in sorted(EXCLUDED_FILES)]
+        skip += [f"! -iname {shlex.quote('*' + ext)}" for ext in sorted(EXCLUDED_EXT)]
+        return f"find . -type d \\( {prune} \\) -prune -o -type f {' '.join(skip)} -print0"
+
+    def _parse_manifest(self, output: str) -> Dict[str, dict]:
+        """Parse the stat / sha256sum sections printed by the manifest script."""
+        manifest = {}
+        stats, _, hashes = output.partition("__HASHES__\n")
+        for line in stats.splitlines():
+            parts = line.split(" ", 2)
+            if len(parts) != 3:
+                continue
+            size, mtime, name = parts
+            rel_path = name[2:] if name.startswith("./") else name
+            if self._should_exclude_file(rel_path):
+                continue
+            manifest[rel_path] = {"size": int(size), "modified": int(mtime), "hash": None}
+        for line in hashes.splitlines():
+            digest, _, name = line.partition("  ")
+            rel_path = name[2:] if name.startswith("./") else name
+            if rel_path in manifest:
+                manifest[rel_path]["hash"] = digest
+        return manifest
+
+    def _manifest_script(self, archive_path: Optional[str] = None) -> str:
+        list_file = f"/tmp/suna_manifest_{uuid.uuid4().hex}.lst"
+        lines = [
+            f"cd {shlex.quote(self.workspace_path)} || exit 1",
+            f"{self._find_workspace_files_command()} > {list_file}",
+            f"xargs -0 -r stat -c '%s %Y %n' < {list_file}",
+            "echo __HASHES__",
+            f"xargs -0 -r sha256sum < {list_file}",
+        ]
+        if archive_path:
+            lines.append(f"tar -czf {archive_path} --null -T {list_file} 2>/dev/null")
+        lines.append(f"rm -f {list_file}")
+        return "\n".join(lines) + "\n"
+
+    def _extract_archive(self, data: bytes) -> Dict[str, bytes]:
+        """Unpack a tar.gz produced in the sandbox into rel_path -> bytes."""
+        files = {}
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as archive:
+            for member in archive.getmembers():
+                if not member.isfile():
+                    continue
+                name = member.name[2:] if member.name.startswith("./") else member.name
+                extracted = archive.extractfile(member)
+                if extracted is not None:
+                    files[name] = extracted.read()
+        return files
+
+    def _download_archive(self, archive_path: str) -> Dict[str, bytes]:
+        try:
+            return self._extract_archive(self.sandbox.fs.download_file(archive_path))
+        finally:
+            try:
+                self.sandbox.fs.delete_file(archive_path)
+            except Exception as e:
+                logger.warning(f"Failed to remove archive {archive_path}: {str(e)}")
+
+    def _read_archive(self, rel_paths: List[str]) -> Dict[str, bytes]:
+        """Read several workspace files with one archive round trip instead of one download per file.
+
+        Paths that do not exist are left out of the result.
+        """
+        archive_path = f"/tmp/suna_read_{uuid.uuid4().hex}.tar.gz"
+        quoted = " ".join(shlex.quote(path) for path in rel_paths)
+        script = f"cd {shlex.quote(self.workspace_path)} && tar -czf {archive_path} --ignore-failed-read -- {quoted} 2>/dev/null; test -f {archive_path}\n"
+        response = self._run_script(script)
+        if response.exit_code != 0:
+            raise RuntimeError(f"Failed to archive files: {response.result}")
+        return self._download_archive(archive_path)
+
+    def _write_archive(self, files: Dict[str, bytes], permissions: str) -> None:
+        """Write several workspace files by uploading one tar archive and extracting it in the sandbox."""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for rel_path, content in files.items():
+                info = tarfile.TarInfo(rel_path)
+                info.size = len(content)
+                info.mode = int(permissions, 8)
+                info.mtime = time.time()
+                archive.addfile(info, io.BytesIO(content))
+
+        archive_path = f"/tmp/suna_write_{uuid.uuid4().hex}.tar.gz"
+        self.sandbox.fs.upload_file(archive_path, buffer.getvalue())
+        workspace = shlex.quote(self.workspace_path)
+        response = self._run_script(f"mkdir -p {workspace} && tar -xzf {archive_path} -C {workspace}; status=$?; rm -f {archive_path}; exit $status\n")
+        if response.exit_code != 0:
+            raise RuntimeError(f"Failed to extract archive: {response.result}")
+
+    def _write_file(self, full_path: str, content: bytes, permissions: str, must_exist: bool) -> str:
+        """Check existence, create parent dirs, write and chmod in a single exec call.
+
+        Returns "ok", "exists" (creating over an existing file) or "missing" (rewriting a missing file).
+        """
+        target = shlex.quote(full_path)
+        staged = None
+        if len(content) > INLINE_WRITE_LIMIT:
+            staged = f"/tmp/suna_upload_{uuid.uuid4().hex}"
+            self.sandbox.fs.upload_file(staged, content)
+
+        if must_exist:
+            guard = f"[ -e {target} ] || {{ echo missing; exit 0; }}"
+        else:
+            guard = f"[ -e {target} ] && {{ echo exists; exit 0; }}"
+        if staged:
+            write = f"mv {staged} {target}"
+            guard = guard.replace("exit 0", f"rm -f {staged}; exit 0")
+        else:
+            encoded = base64.b64encode(content).decode()
+            write = f"base64 -d > {target} <<'__SUNA_EOF__'\n{encoded}\n__SUNA_EOF__"
+        script = "\n".join([
+            guard,
+            f"mkdir -p \"$(dirname {target})\" || exit 1",
+            write,
+            f"chmod {shlex.quote(permissions)} {target} || exit 1",
+            "echo ok",
+        ]) + "\n"
+        response = self._run_script(script)
+        if response.exit_code != 0:
+            raise RuntimeError(response.result.strip() or f"exit code {response.exit_code}")
+        return response.result.strip().splitlines()[-1] if response.result.strip() else "ok"
+
     async def get_workspace_state(self) -> dict:
-        """Get the current workspace state by reading all files"""
+        """Get the current workspace state by reading all files.
+
+        The manifest and a tar archive of the workspace are produced by one remote command,
+        so the whole state costs two round trips regardless of the number of files.
+        """
         files_state = {}
         try:
             # Ensure sandbox is initialized
             await self._ensure_sandbox()
             
-            files = self.sandbox.fs.list_files(self.workspace_path)
-            for file_info in files:
-                rel_path = file_info.name
-                
-                # Skip excluded files and directories
-                if self._should_exclude_file(rel_path) or file_info.is_dir:
-                    continue
+            archive_path = f"/tmp/suna_workspace_{uuid.uuid4().hex}.tar.gz"
+            response = self._run_script(self._manifest_script(archive_path), timeout=120)
+            if response.exit_code != 0:
+                raise RuntimeError(response.result)
+            manifest = self._parse_manifest(response.result)
+            contents = self._download_archive(archive_path) if manifest else {}
 
+            for rel_path, entry in manifest.items():
+                if rel_path not in contents:
+                    continue
                 try:
-                    full_path = f"{self.workspace_path}/{rel_path}"
-                    content = self.sandbox.fs.download_file(full_path).decode()
                     files_state[rel_path] = {
-                        "content": content,
-                        "is_dir": file_info.is_dir,
-                        "size": file_info.size,
-                        "modified": file_info.mod_time
+                        "content": contents[rel_path].decode(),
+                        "is_dir": False,
+                        "size": entry["size"],
+                        "modified": entry["modified"],
+                        "hash": entry["hash"]
                     }
-                except Exception as e:
-                    print(f"Error reading file {rel_path}: {e}")
                 except UnicodeDecodeError:
                     print(f"Skipping binary file: {rel_path}")
 
@@ -126,18 +298,10 @@ class SandboxFilesTool(SandboxToolsBase):
             
             file_path = self.clean_path(file_path)
             full_path = f"{self.workspace_path}/{file_path}"
-            if self._file_exists(full_path):
+            # Existence check, parent dirs, write and chmod in one round trip
+            if self._write_file(full_path, file_contents.encode(), permissions, must_exist=False) == "exists":
                 return self.fail_response(f"File '{file_path}' already exists. Use update_file to modify existing files.")
             
-            # Create parent directories if needed
-            parent_dir = '/'.join(full_path.split('/')[:-1])
-            if parent_dir:
-                self.sandbox.fs.create_folder(parent_dir, "755")
-            
-            # Write the file content
-            self.sandbox.fs.upload_file(full_path, file_contents.encode())
-            self.sandbox.fs.set_file_permissions(full_path, permissions)
-            
             message = f"File '{file_path}' created successfully."
             
             # Check if index.html was created and add 8080 server info (only in root workspace)
@@ -154,6 +318,35 @@ class SandboxFilesTool(SandboxToolsBase):
         except Exception as e:
             return self.fail_response(f"Error creating file: {str(e)}")
 
+    def _server_side_replace(self, full_path: str, old_str: str, new_str: str) -> Optional[dict]:
+        """Run the replacement with python3 in the sandbox. Returns None if that is not possible."""
+        if len(old_str.encode()) + len(new_str.encode()) > INLINE_WRITE_LIMIT:
+            # Too large to pass inline as a single exec argument
+            return None
+        encode = lambda value: base64.b64encode(value.encode()).decode()
+        script = STR_REPLACE_SCRIPT.format(path=encode(full_path), old=encode(old_str), new=encode(new_str))
+        try:
+            response = self._run_script(script, interpreter="python3")
+            if response.exit_code != 0:
+                logger.warning(f"Server-side str_replace failed, falling back to download: {response.result}")
+                return None
+            return json.loads(response.result.strip().splitlines()[-1])
+        except Exception as e:
+            logger.warning(f"Server-side str_replace failed, falling back to download: {str(e)}")
+            return None
+
+    def _client_side_replace(self, full_path: str, old_str: str, new_str: str) -> dict:
+        if not self._file_exists(full_path):
+            return {"status": "missing"}
+        content = self.sandbox.fs.download_file(full_path).decode()
+        occurrences = content.count(old_str)
+        lines = []
+        if occurrences == 1:
+            self.sandbox.fs.upload_file(full_path, content.replace(old_str, new_str).encode())
+        elif occurrences > 1:
+            lines = [i+1 for i, line in enumerate(content.split('\n')) if old_str in line]
+        return {"status": "ok", "occurrences": occurrences, "lines": lines}
+
     @openapi_schema({
         "type": "function",
         "function": {
@@ -203,29 +396,21 @@ class SandboxFilesTool(SandboxToolsBase):
             
             file_path = self.clean_path(file_path)
             full_path = f"{self.workspace_path}/{file_path}"
-            if not self._file_exists(full_path):
-                return self.fail_response(f"File '{file_path}' does not exist")
-            
-            content = self.sandbox.fs.download_file(full_path).decode()
             old_str = old_str.expandtabs()
             new_str = new_str.expandtabs()
-            
-            occurrences = content.count(old_str)
+
+            # Count and replace inside the sandbox so the file never leaves it
+            result = self._server_side_replace(full_path, old_str, new_str)
+            if result is None:
+                result = self._client_side_replace(full_path, old_str, new_str)
+
+            if result["status"] == "missing":
+                return self.fail_response(f"File '{file_path}' does not exist")
+            occurrences = result["occurrences"]
             if occurrences == 0:
                 return self.fail_response(f"String '{old_str}' not found in file")
             if occurrences > 1:
-                lines = [i+1 for i, line in enumerate(content.split('\n')) if old_str in line]
-                return self.fail_response(f"Multiple occurrences found in lines {lines}. Please ensure string is unique")
-            
-            # Perform replacement
-            new_content = content.replace(old_str, new_str)
-            self.sandbox.fs.upload_file(full_path, new_content.encode())
-            
-            # Show snippet around the edit
-            replacement_line = content.split(old_str)[0].count('\n')
-            start_line = max(0, replacement_line - self.SNIPPET_LINES)
-            end_line = replacement_line + self.SNIPPET_LINES + new_str.count('\n')
-            snippet = '\n'.join(new_content.split('\n')[start_line:end_line + 1])
+                return self.fail_response(f"Multiple occurrences found in lines {result['lines']}. Please ensure string is unique")
             
             # Get preview URL if it's an HTML file
             # preview_url = self._get_preview_url(file_path)
@@ -291,12 +476,9 @@ class SandboxFilesTool(SandboxToolsBase):
             
             file_path = self.clean_path(file_path)
             full_path = f"{self.workspace_path}/{file_path}"
-            if not self._file_exists(full_path):
+            if self._write_file(full_path, file_contents.encode(), permissions, must_exist=True) == "missing":
                 return self.fail_response(f"File '{file_path}' does not exist. Use create_file to create a new file.")
             
-            self.sandbox.fs.upload_file(full_path, file_contents.encode())
-            self.sandbox.fs.set_file_permissions(full_path, permissions)
-            
             message = f"File '{file_path}' completely rewritten successfully."
             
             # Check if index.html was rewritten and add 8080 server info (only in root workspace)
@@ -358,6 +540,129 @@ class SandboxFilesTool(SandboxToolsBase):
         except Exception as e:
             return self.fail_response(f"Error deleting file: {str(e)}")
 
+    @openapi_schema({
+        "type": "function",
+        "function": {
+            "name": "read_files",
+            "description": "Read the contents of several text files at once. All files are fetched in a single archive transfer, which is much faster than reading them one by one. Paths must be relative to /workspace.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_paths": {
+                        "type": "string",
+                        "description": "Paths of the files to read, relative to /workspace, separated by commas or newlines (e.g., 'src/main.py,src/utils.py')"
+                    }
+                },
+                "required": ["file_paths"]
+            }
+        }
+    })
+    @xml_schema(
+        tag_name="read-files",
+        mappings=[
+            {"param_name": "file_paths", "node_type": "content", "path": "."}
+        ],
+        example='''
+        <function_calls>
+        <invoke name="read_files">
+        <parameter name="file_paths">src/main.py,src/utils.py,README.md</parameter>
+        </invoke>
+        </function_calls>
+        '''
+    )
+    async def read_files(self, file_paths: str) -> ToolResult:
+        try:
+            # Ensure sandbox is initialized
+            await self._ensure_sandbox()
+            
+            rel_paths = list(dict.fromkeys(
+                self.clean_path(path.strip()) for path in file_paths.replace("\n", ",").split(",") if path.strip()
+            ))
+            if not rel_paths:
+                return self.fail_response("No file paths provided.")
+            
+            contents = self._read_archive(rel_paths)
+            
+            files, binary, missing = {}, [], []
+            for rel_path in rel_paths:
+                if rel_path not in contents:
+                    missing.append(rel_path)
+                    continue
+                try:
+                    files[rel_path] = contents[rel_path].decode()
+                except UnicodeDecodeError:
+                    binary.append(rel_path)
+            
+            result = {"files": files}
+            if missing:
+                result["missing"] = missing
+            if binary:
+                result["binary"] = binary
+            return self.success_response(result)
+        except Exception as e:
+            return self.fail_response(f"Error reading files: {str(e)}")
+
+    @openapi_schema({
+        "type": "function",
+        "function": {
+            "name": "write_files",
+            "description": "Create or overwrite several files at once. All files are sent in a single archive transfer, which is much faster than creating them one by one. Missing parent directories are created. Paths must be relative to /workspace.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "files": {
+                        "type": "object",
+                        "description": "Mapping of file path (relative to /workspace) to the full file contents",
+                        "additionalProperties": {"type": "string"}
+                    },
+                    "permissions": {
+                        "type": "string",
+                        "description": "File permissions in octal format applied to every file (e.g., '644')",
+                        "default": "644"
+                    }
+                },
+                "required": ["files"]
+            }
+        }
+    })
+    @xml_schema(
+        tag_name="write-files",
+        mappings=[
+            {"param_name": "files", "node_type": "content", "path": "."},
+            {"param_name": "permissions", "node_type": "attribute", "path": ".", "required": False}
+        ],
+        example='''
+        <function_calls>
+        <invoke name="write_files">
+        <parameter name="files">{"src/__init__.py": "", "src/config.py": "DEBUG = False\\n"}</parameter>
+        </invoke>
+        </function_calls>
+        '''
+    )
+    async def write_files(self, files, permissions: str = "644") -> ToolResult:
+        try:
+            # Ensure sandbox is initialized
+            await self._ensure_sandbox()
+            
+            if isinstance(files, str):
+                files = json.loads(files)
+            if not isinstance(files, dict) or not files:
+                return self.fail_response("Provide the files as a non-empty JSON object of path to contents.")
+            
+            contents = {}
+            for path, file_contents in files.items():
+                rel_path = self.clean_path(path)
+                if not rel_path:
+                    return self.fail_response(f"Invalid file path: '{path}'")
+                contents[rel_path] = str(file_contents).encode()
+            
+            self._write_archive(contents, permissions)
+            return self.success_response(f"{len(contents)} file(s) written successfully: {', '.join(contents)}")
+        except json.JSONDecodeError as e:
+            return self.fail_response(f"Invalid files JSON: {str(e)}")
+        except Exception as e:
+            return self.fail_response(f"Error writing files: {str(e)}")
+
     # @openapi_schema({
     #     "type": "function",
     #     "function": {
@@ -1,4 +1,7 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+import asyncio
+import base64
+import shlex
 import time
 from uuid import uuid4
 from agentpress.tool import ToolResult, openapi_schema, xml_schema
@@ -13,6 +16,9 @@ class SandboxShellTool(SandboxToolsBase):
         super().__init__(project_id, thread_manager)
         self._sessions: Dict[str, str] = {}  # Maps session names to session IDs
         self.workspace_path = "/workspace"  # Ensure we're always operating in /workspace
+        self.command_log_dir = "/tmp/suna_commands"  # Output logs and exit code sentinels per session
+        self.max_output_bytes = 100_000
+        self._output_offsets: Dict[str, int] = {}  # Bytes of each session's log already returned
 
     async def _ensure_session(self, session_name: str = "default") -> str:
         """Ensure a session exists and return its ID."""
@@ -26,6 +32,35 @@ class SandboxShellTool(SandboxToolsBase):
                 raise RuntimeError(f"Failed to create session: {str(e)}")
         return self._sessions[session_name]
 
+    def _command_files(self, session_name: str) -> tuple:
+        """Return the (log file, exit code file, script file) paths used to track a session's command."""
+        base = f"{self.command_log_dir}/{session_name}"
+        return f"{base}.log", f"{base}.exit", f"{base}.sh"
+
+    async def _wait_for_exit_code(self, exit_file: str, timeout: int) -> Optional[int]:
+        """Wait for a command's exit code sentinel to appear.
+
+        The wait happens inside the sandbox, so each remote call returns as soon as
+        the command finishes instead of polling from here. Returns None on timeout.
+        """
+        deadline = time.time() + timeout
+        while True:
+            remaining = int(deadline - time.time())
+            if remaining <= 0:
+                return None
+            # Keep each remote wait below the utility command timeout
+            chunk = min(remaining, 25)
+            result = await self._execute_raw_command(
+                f"timeout {chunk} sh -c 'while [ ! -f {exit_file} ]; do sleep 0.2; done'; cat {exit_file} 2>/dev/null",
+                timeout=chunk + 10
+            )
+            lines = result.get("output", "").strip().splitlines()
+            if lines:
+                try:
+                    return int(lines[-1].strip())
+                except ValueError:
+                    pass
+
     async def _cleanup_session(self, session_name: str):
         """Clean up a session if it exists."""
         if session_name in self._sessions:
@@ -58,7 +93,7 @@ class SandboxShellTool(SandboxToolsBase):
                     },
                     "blocking": {
                         "type": "boolean",
-                        "description": "Whether to wait for the command to complete. Defaults to false for non-blocking execution.",
+                        "description": "Whether to wait for the command to complete and return its output and exit code. Defaults to false for non-blocking execution.",
                         "default": False
                     },
                     "timeout": {
@@ -129,57 +164,81 @@ class SandboxShellTool(SandboxToolsBase):
             if not session_name:
                 session_name = f"session_{str(uuid4())[:8]}"
             
-            # Check if tmux session already exists
-            check_session = await self._execute_raw_command(f"tmux has-session -t {session_name} 2>/dev/null || echo 'not_exists'")
-            session_exists = "not_exists" not in check_session.get("output", "")
+            log_file, exit_file, script_file = self._command_files(session_name)
             
-            if not session_exists:
-                # Create a new tmux session
-                await self._execute_raw_command(f"tmux new-session -d -s {session_name}")
+            # Create the tmux session unless it already exists
+            ensure_session = f"tmux has-session -t {session_name} 2>/dev/null || tmux new-session -d -s {session_name}"
                 
-            # Ensure we're in the correct directory and send command to tmux
-            full_command = f"cd {cwd} && {command}"
-            wrapped_command = full_command.replace('"', '\\"')  # Escape double quotes
+            # Ensure we're in the correct directory. The command is uploaded as a script file
+            # and run with bash, so it reaches the shell verbatim (no quoting for send-keys,
+            # no size limit from exec arguments), a trailing ';', '&' or '# comment' cannot
+            # swallow the exit code write, and 'exit' or 'set -e' end the script, not the session.
+            full_command = f"cd {cwd} && {command}\n"
+            staged_script = f"/tmp/suna_command_{uuid4().hex}.sh"
+            await asyncio.to_thread(self.sandbox.fs.upload_file, staged_script, full_command.encode())
+            # Renaming leaves a script that is still running from a previous command intact
+            install_script = f"mv {staged_script} {script_file}"
             
-            # Send command to tmux session
-            await self._execute_raw_command(f'tmux send-keys -t {session_name} "{wrapped_command}" Enter')
+            # Mirror the pane to a log file and write the exit code to a sentinel file once
+            # the command finishes, so completion is known instead of guessed and later
+            # checks can read only the new part of the output. The pane is piped rather
+            # than the command's output, so the command still writes to a terminal and
+            # keeps line buffering. The pipe is (re)opened as the line runs, replacing one
+            # left by an earlier command and keeping the typed command line out of the log.
+            tracked_command = (
+                f"tmux pipe-pane -t {session_name} 'cat >> {log_file}'; "
+                f'bash {script_file}; '
+                f'echo \\$? > {exit_file}.tmp && mv {exit_file}.tmp {exit_file}'
+            )
             
             if blocking:
-                # For blocking execution, wait and capture output
-                start_time = time.time()
-                while (time.time() - start_time) < timeout:
-                    # Wait a bit before checking
-                    time.sleep(2)
-                    
-                    # Check if session still exists (command might have exited)
-                    check_result = await self._execute_raw_command(f"tmux has-session -t {session_name} 2>/dev/null || echo 'ended'")
-                    if "ended" in check_result.get("output", ""):
-                        break
-                        
-                    # Get current output and check for common completion indicators
-                    output_result = await self._execute_raw_command(f"tmux capture-pane -t {session_name} -p -S - -E -")
-                    current_output = output_result.get("output", "")
-                    
-                    # Check for prompt indicators that suggest command completion
-                    last_lines = current_output.split('\n')[-3:]
-                    completion_indicators = ['$', '#', '>', 'Done', 'Completed', 'Finished', '✓']
-                    if any(indicator in line for indicator in completion_indicators for line in last_lines):
-                        break
+                await self._execute_batch([
+                    ensure_session,
+                    f"mkdir -p {self.command_log_dir} && rm -f {log_file} {exit_file}",
+                    install_script,
+                    f'tmux send-keys -t {session_name} "{tracked_command}" Enter'
+                ], stop_on_error=True)
+                self._output_offsets.pop(session_name, None)
+                
+                exit_code = await self._wait_for_exit_code(exit_file, timeout)
                 
-                # Capture final output
-                output_result = await self._execute_raw_command(f"tmux capture-pane -t {session_name} -p -S - -E -")
-                final_output = output_result.get("output", "")
+                if exit_code is None:
+                    # Capture the (size capped) output from the log
+                    output_result = await self._execute_raw_command(f"tail -c {self.max_output_bytes} {log_file} 2>/dev/null | tr -d '\\r'")
+                    final_output = output_result.get("output", "")
+
+                    return self.success_response({
+                        "output": final_output,
+                        "session_name": session_name,
+                        "cwd": cwd,
+                        "message": f"Command did not finish within {timeout} seconds and is still running in tmux session '{session_name}'. Use check_command_output to view results.",
+                        "completed": False
+                    })
                 
-                # Kill the session after capture
-                await self._execute_raw_command(f"tmux kill-session -t {session_name}")
+                # Capture the (size capped) output from the log and kill the session
+                results = await self._execute_batch([
+                    f"tail -c {self.max_output_bytes} {log_file} 2>/dev/null | tr -d '\\r'",
+                    f"tmux kill-session -t {session_name}"
+                ])
+                final_output = results[0]["output"] if results else ""
                 
                 return self.success_response({
                     "output": final_output,
                     "session_name": session_name,
                     "cwd": cwd,
+                    "exit_code": exit_code,
                     "completed": True
                 })
             else:
+                # Create the session and send the command in a single round trip.
+                # The log is appended to, so earlier output in a reused session keeps its offset.
+                await self._execute_batch([
+                    ensure_session,
+                    f"mkdir -p {self.command_log_dir} && rm -f {exit_file}",
+                    install_script,
+                    f'tmux send-keys -t {session_name} "{tracked_command}" Enter'
+                ], stop_on_error=True)
+                
                 # For non-blocking, just return immediately
                 return self.success_response({
                     "session_name": session_name,
@@ -197,8 +256,12 @@ class SandboxShellTool(SandboxToolsBase):
                     pass
             return self.fail_response(f"Error executing command: {str(e)}")
 
-    async def _execute_raw_command(self, command: str) -> Dict[str, Any]:
-        """Execute a raw command directly in the sandbox."""
+    async def _execute_raw_command(self, command: str, timeout: int = 30) -> Dict[str, Any]:
+        """Execute a raw command directly in the sandbox.
+
+        The SDK calls are synchronous, so they run in a worker thread to keep the
+        event loop free while the sandbox works.
+        """
         # Ensure session exists for raw commands
         session_id = await self._ensure_session("raw_commands")
         
@@ -210,27 +273,62 @@ class SandboxShellTool(SandboxToolsBase):
             cwd=self.workspace_path
         )
         
-        response = self.sandbox.process.execute_session_command(
+        response = await asyncio.to_thread(
+            self.sandbox.process.execute_session_command,
             session_id=session_id,
             req=req,
-            timeout=30  # Short timeout for utility commands
+            timeout=timeout  # Short timeout for utility commands
         )
         
-        logs = self.sandbox.process.get_session_command_logs(
-            session_id=session_id,
-            command_id=response.cmd_id
-        )
+        # Synchronous executions return their output directly, only fetch logs if it is missing
+        logs = getattr(response, "output", None)
+        if logs is None:
+            logs = await asyncio.to_thread(
+                self.sandbox.process.get_session_command_logs,
+                session_id=session_id,
+                command_id=response.cmd_id
+            )
         
         return {
             "output": logs,
             "exit_code": response.exit_code
         }
 
+    async def _execute_batch(self, steps: List[str], stop_on_error: bool = False, timeout: int = 30) -> List[Dict[str, Any]]:
+        """Execute several raw commands in the sandbox with a single remote call.
+
+        The steps are sent as one bash script. Each step's combined output and exit
+        code are emitted as a base64-encoded record line and parsed back into a list
+        of {"output", "exit_code"} dicts, one per step that ran. With stop_on_error,
+        execution stops after the first step that exits non-zero.
+        """
+        lines = []
+        for step in steps:
+            encoded_step = base64.b64encode(step.encode()).decode()
+            lines.append(f"out=$(echo {encoded_step} | base64 -d | bash 2>&1); code=$?")
+            lines.append('printf "__STEP__ %s %s\\n" "$code" "$(printf "%s" "$out" | base64 | tr -d "\\n")"')
+            if stop_on_error:
+                lines.append('[ "$code" -eq 0 ] || exit 0')
+        script = base64.b64encode("\n".join(lines).encode()).decode()
+        
+        result = await self._execute_raw_command(f"echo {script} | base64 -d | bash", timeout=timeout)
+        
+        results = []
+        for line in (result.get("output") or "").splitlines():
+            if not line.startswith("__STEP__ "):
+                continue
+            parts = line.split(" ", 2)
+            results.append({
+                "output": base64.b64decode(parts[2]).decode(errors="replace") if len(parts) > 2 else "",
+                "exit_code": int(parts[1])
+            })
+        return results
+
     @openapi_schema({
         "type": "function",
         "function": {
             "name": "check_command_output",
-            "description": "Check the output of a previously executed command in a tmux session. Use this to monitor the progress or results of non-blocking commands.",
+            "description": "Check the output of a previously executed command in a tmux session. Use this to monitor the progress or results of non-blocking commands. Only output produced since the previous check is returned; use from_start to read everything again, and grep/head_lines/tail_lines to narrow large outputs.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -238,6 +336,23 @@ class SandboxShellTool(SandboxToolsBase):
                         "type": "string",
                         "description": "The name of the tmux session to check."
                     },
+                    "grep": {
+                        "type": "string",
+                        "description": "Optional pattern; only output lines matching it are returned."
+                    },
+                    "head_lines": {
+                        "type": "integer",
+                        "description": "Optional number of lines to return from the start of the new output."
+                    },
+                    "tail_lines": {
+                        "type": "integer",
+                        "description": "Optional number of lines to return from the end of the new output."
+                    },
+                    "from_start": {
+                        "type": "boolean",
+                        "description": "Return output from the beginning instead of only what is new since the last check.",
+                        "default": False
+                    },
                     "kill_session": {
                         "type": "boolean",
                         "description": "Whether to terminate the tmux session after checking. Set to true when you're done with the command.",
@@ -252,6 +367,10 @@ class SandboxShellTool(SandboxToolsBase):
         tag_name="check-command-output",
         mappings=[
             {"param_name": "session_name", "node_type": "attribute", "path": ".", "required": True},
+            {"param_name": "grep", "node_type": "attribute", "path": ".", "required": False},
+            {"param_name": "head_lines", "node_type": "attribute", "path": ".", "required": False},
+            {"param_name": "tail_lines", "node_type": "attribute", "path": ".", "required": False},
+            {"param_name": "from_start", "node_type": "attribute", "path": ".", "required": False},
             {"param_name": "kill_session", "node_type": "attribute", "path": ".", "required": False}
         ],
         example='''
@@ -261,7 +380,16 @@ class SandboxShellTool(SandboxToolsBase):
         </invoke>
         </function_calls>
         
-        <!-- Example 2: Check final output and kill session -->
+        <!-- Example 2: Only the last errors of a long build log -->
+        <function_calls>
+        <invoke name="check_command_output">
+        <parameter name="session_name">build_process</parameter>
+        <parameter name="grep">error</parameter>
+        <parameter name="tail_lines">20</parameter>
+        </invoke>
+        </function_calls>
+
+        <!-- Example 3: Check final output and kill session -->
         <function_calls>
         <invoke name="check_command_output">
         <parameter name="session_name">build_process</parameter>
@@ -273,33 +401,80 @@ class SandboxShellTool(SandboxToolsBase):
     async def check_command_output(
         self,
         session_name: str,
-        kill_session: bool = False
+        kill_session: bool = False,
+        grep: Optional[str] = None,
+        head_lines: Optional[int] = None,
+        tail_lines: Optional[int] = None,
+        from_start: bool = False
     ) -> ToolResult:
         try:
             # Ensure sandbox is initialized
             await self._ensure_sandbox()
             
-            # Check if session exists
-            check_result = await self._execute_raw_command(f"tmux has-session -t {session_name} 2>/dev/null || echo 'not_exists'")
-            if "not_exists" in check_result.get("output", ""):
+            log_file, exit_file, _ = self._command_files(session_name)
+            offset = 0 if from_start else self._output_offsets.get(session_name, 0)
+            
+            filters = ""
+            if grep:
+                filters += f" | grep -e {shlex.quote(grep)}"
+            if head_lines:
+                filters += f" | head -n {int(head_lines)}"
+            if tail_lines:
+                filters += f" | tail -n {int(tail_lines)}"
+            filters += f" | tail -c {self.max_output_bytes} | tr -d '\\r'"
+            
+            # Print "<log size> <start offset>" followed by the new output. The offset resets if
+            # the log shrank, and sessions started without a log fall back to the tmux pane.
+            read_output = (
+                f"if [ -f {log_file} ]; then "
+                f"size=$(stat -c %s {log_file}); off={offset}; [ \"$size\" -lt \"$off\" ] && off=0; "
+                f"echo \"$size $off\"; tail -c +$((off + 1)) {log_file} | head -c $((size - off)){filters}; "
+                f"else echo '-1 0'; tmux capture-pane -t {session_name} -p -S - -E -{filters}; fi"
+            )
+            
+            # Check the session exists, read new output and exit code and optionally kill it in one round trip
+            steps = [
+                f"tmux has-session -t {session_name} 2>/dev/null",
+                read_output,
+                f"cat {exit_file} 2>/dev/null || true"
+            ]
+            if kill_session:
+                steps.append(f"tmux kill-session -t {session_name}")
+            results = await self._execute_batch(steps, stop_on_error=True)
+            
+            if not results or results[0]["exit_code"] != 0:
                 return self.fail_response(f"Tmux session '{session_name}' does not exist.")
             
-            # Get output from tmux pane
-            output_result = await self._execute_raw_command(f"tmux capture-pane -t {session_name} -p -S - -E -")
-            output = output_result.get("output", "")
+            header, _, output = (results[1]["output"] if len(results) > 1 else "").partition("\n")
+            try:
+                log_size, start_offset = (int(value) for value in header.split())
+            except ValueError:
+                log_size, start_offset = -1, 0
+            
+            response = {
+                "output": output,
+                "session_name": session_name
+            }
+            if log_size >= 0:
+                self._output_offsets[session_name] = log_size
+                response["new_output_bytes"] = log_size - start_offset
+                response["log_size"] = log_size
+            
+            exit_code_output = results[2]["output"].strip() if len(results) > 2 else ""
+            if exit_code_output.isdigit():
+                response["exit_code"] = int(exit_code_output)
             
             # Kill session if requested
             if kill_session:
-                await self._execute_raw_command(f"tmux kill-session -t {session_name}")
                 termination_status = "Session terminated."
+                self._output_offsets.pop(session_name, None)
+            elif "exit_code" in response:
+                termination_status = "Command finished, session still open."
             else:
                 termination_status = "Session still running."
+            response["status"] = termination_status
             
-            return self.success_response({
-                "output": output,
-                "session_name": session_name,
-                "status": termination_status
-            })
+            return self.success_response(response)
                 
         except Exception as e:
             return self.fail_response(f"Error checking command output: {str(e)}")
@@ -342,14 +517,14 @@ class SandboxShellTool(SandboxToolsBase):
             # Ensure sandbox is initialized
             await self._ensure_sandbox()
             
-            # Check if session exists
-            check_result = await self._execute_raw_command(f"tmux has-session -t {session_name} 2>/dev/null || echo 'not_exists'")
-            if "not_exists" in check_result.get("output", ""):
+            # Check the session exists and kill it in one round trip
+            results = await self._execute_batch([
+                f"tmux has-session -t {session_name} 2>/dev/null",
+                f"tmux kill-session -t {session_name}"
+            ], stop_on_error=True)
+            if not results or results[0]["exit_code"] != 0:
                 return self.fail_response(f"Tmux session '{session_name}' does not exist.")
             
-            # Kill the session
-            await self._execute_raw_command(f"tmux kill-session -t {session_name}")
-            
             return self.success_response({
                 "message": f"Tmux session '{session_name}' terminated successfully."
             })
@@ -1,6 +1,11 @@
 import os
+import asyncio
 import base64
+import hashlib
 import mimetypes
+import shlex
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, Tuple
 from io import BytesIO
 from PIL import Image
@@ -8,6 +13,8 @@ from PIL import Image
 from agentpress.tool import ToolResult, openapi_schema, xml_schema
 from sandbox.tool_base import SandboxToolsBase
 from agentpress.thread_manager import ThreadManager
+from utils.s3_upload_utils import upload_image_bytes, create_signed_image_url
+from utils.logger import logger
 import json
 
 # Add common image MIME types if mimetypes module is limited
@@ -27,6 +34,93 @@ DEFAULT_MAX_HEIGHT = 1080
 DEFAULT_JPEG_QUALITY = 85
 DEFAULT_PNG_COMPRESS_LEVEL = 6
 
+# Vision asset cache: storage references keyed by content hash and target size.
+# Sandbox images can be private, so they go to a private bucket and the model
+# only gets a short-lived signed URL, created each time the asset is used.
+VISION_ASSET_BUCKET = os.getenv("VISION_ASSET_BUCKET", "vision-assets")
+VISION_ASSET_URL_TTL = int(os.getenv("VISION_ASSET_URL_TTL", "3600"))
+VISION_ASSET_CACHE_SIZE = int(os.getenv("VISION_ASSET_CACHE_SIZE", "256"))
+VISION_COMPRESS_WORKERS = int(os.getenv("VISION_COMPRESS_WORKERS", "2"))
+
+_vision_asset_cache: "OrderedDict[str, dict]" = OrderedDict()
+_compression_executor: Optional[ProcessPoolExecutor] = None
+
+def get_compression_executor() -> ProcessPoolExecutor:
+    """Lazily create the process pool used for image compression."""
+    global _compression_executor
+    if _compression_executor is None:
+        _compression_executor = ProcessPoolExecutor(max_workers=VISION_COMPRESS_WORKERS)
+    return _compression_executor
+
+def compress_image_bytes(image_bytes: bytes, mime_type: str, file_path: str,
+                         max_width: int = DEFAULT_MAX_WIDTH, max_height: int = DEFAULT_MAX_HEIGHT) -> Tuple[bytes, str]:
+    """Compress an image to reduce its size while maintaining reasonable quality.
+    
+    Module-level so it can run in a worker process.
+    
+    Args:
+        image_bytes: Original image bytes
+        mime_type: MIME type of the image
+        file_path: Path to the image file (for logging)
+        max_width: Maximum output width
+        max_height: Maximum output height
+        
+    Returns:
+        Tuple of (compressed_bytes, new_mime_type)
+    """
+    try:
+        # Open image from bytes
+        img = Image.open(BytesIO(image_bytes))
+
+        # Convert RGBA to RGB if necessary (for JPEG)
+        if img.mode in ('RGBA', 'LA', 'P'):
+            # Create a white background
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            if img.mode == 'P':
+                img = img.convert('RGBA')
+            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+            img = background
+
+        # Calculate new dimensions while maintaining aspect ratio
+        width, height = img.size
+        if width > max_width or height > max_height:
+            ratio = min(max_width / width, max_height / height)
+            new_width = int(width * ratio)
+            new_height = int(height * ratio)
+            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            print(f"[SeeImage] Resized image from {width}x{height} to {new_width}x{new_height}")
+
+        # Save to bytes with compression
+        output = BytesIO()
+
+        # Determine output format based on original mime type
+        if mime_type == 'image/gif':
+            # Keep GIFs as GIFs to preserve animation
+            img.save(output, format='GIF', optimize=True)
+            output_mime = 'image/gif'
+        elif mime_type == 'image/png':
+            # Compress PNG
+            img.save(output, format='PNG', optimize=True, compress_level=DEFAULT_PNG_COMPRESS_LEVEL)
+            output_mime = 'image/png'
+        else:
+            # Convert everything else to JPEG for better compression
+            img.save(output, format='JPEG', quality=DEFAULT_JPEG_QUALITY, optimize=True)
+            output_mime = 'image/jpeg'
+
+        compressed_bytes = output.getvalue()
+
+        # Log compression results
+        original_size = len(image_bytes)
+        compressed_size = len(compressed_bytes)
+        compression_ratio = (1 - compressed_size / original_size) * 100
+        print(f"[SeeImage] Compressed '{file_path}' from {original_size / 1024:.1f}KB to {compressed_size / 1024:.1f}KB ({compression_ratio:.1f}% reduction)")
+
+        return compressed_bytes, output_mime
+
+    except Exception as e:
+        print(f"[SeeImage] Failed to compress image: {str(e)}. Using original.")
+        return image_bytes, mime_type
+
 class SandboxVisionTool(SandboxToolsBase):
     """Tool for allowing the agent to 'see' images within the sandbox."""
 
@@ -37,68 +131,20 @@ class SandboxVisionTool(SandboxToolsBase):
         self.thread_manager = thread_manager
 
     def compress_image(self, image_bytes: bytes, mime_type: str, file_path: str) -> Tuple[bytes, str]:
-        """Compress an image to reduce its size while maintaining reasonable quality.
-        
-        Args:
-            image_bytes: Original image bytes
-            mime_type: MIME type of the image
-            file_path: Path to the image file (for logging)
-            
-        Returns:
-            Tuple of (compressed_bytes, new_mime_type)
-        """
+        """Compress an image in-process. See compress_image_bytes."""
+        return compress_image_bytes(image_bytes, mime_type, file_path)
+
+    def _content_hash(self, full_path: str) -> Optional[str]:
+        """Hash the image inside the sandbox so cache hits never download the file."""
         try:
-            # Open image from bytes
-            img = Image.open(BytesIO(image_bytes))
-            
-            # Convert RGBA to RGB if necessary (for JPEG)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                # Create a white background
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                img = background
-            
-            # Calculate new dimensions while maintaining aspect ratio
-            width, height = img.size
-            if width > DEFAULT_MAX_WIDTH or height > DEFAULT_MAX_HEIGHT:
-                ratio = min(DEFAULT_MAX_WIDTH / width, DEFAULT_MAX_HEIGHT / height)
-                new_width = int(width * ratio)
-                new_height = int(height * ratio)
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                print(f"[SeeImage] Resized image from {width}x{height} to {new_width}x{new_height}")
-            
-            # Save to bytes with compression
-            output = BytesIO()
-            
-            # Determine output format based on original mime type
-            if mime_type == 'image/gif':
-                # Keep GIFs as GIFs to preserve animation
-                img.save(output, format='GIF', optimize=True)
-                output_mime = 'image/gif'
-            elif mime_type == 'image/png':
-                # Compress PNG
-                img.save(output, format='PNG', optimize=True, compress_level=DEFAULT_PNG_COMPRESS_LEVEL)
-                output_mime = 'image/png'
-            else:
-                # Convert everything else to JPEG for better compression
-                img.save(output, format='JPEG', quality=DEFAULT_JPEG_QUALITY, optimize=True)
-                output_mime = 'image/jpeg'
-            
-            compressed_bytes = output.getvalue()
-            
-            # Log compression results
-            original_size = len(image_bytes)
-            compressed_size = len(compressed_bytes)
-            compression_ratio = (1 - compressed_size / original_size) * 100
-            print(f"[SeeImage] Compressed '{file_path}' from {original_size / 1024:.1f}KB to {compressed_size / 1024:.1f}KB ({compression_ratio:.1f}% reduction)")
-            
-            return compressed_bytes, output_mime
-            
+            script = f"sha256sum {shlex.quote(full_path)}"
+            encoded = base64.b64encode(script.encode()).decode()
+            response = self.sandbox.process.exec(f"/bin/sh -c 'echo {encoded} | base64 -d | sh'", timeout=30)
+            if response.exit_code == 0 and response.result:
+                return response.result.split()[0]
         except Exception as e:
-            print(f"[SeeImage] Failed to compress image: {str(e)}. Using original.")
-            return image_bytes, mime_type
+            logger.warning(f"[SeeImage] Could not hash '{full_path}' in sandbox: {str(e)}")
+        return None
 
     @openapi_schema({
         "type": "function",
@@ -132,7 +178,7 @@ class SandboxVisionTool(SandboxToolsBase):
         '''
     )
     async def see_image(self, file_path: str) -> ToolResult:
-        """Reads an image file, compresses it, converts it to base64, and adds it as a temporary message."""
+        """Reads an image file, compresses it, stores it by content hash, and adds a reference to it as a temporary message."""
         try:
             # Ensure sandbox is initialized
             await self._ensure_sandbox()
@@ -153,12 +199,6 @@ class SandboxVisionTool(SandboxToolsBase):
             if file_info.size > MAX_IMAGE_SIZE:
                 return self.fail_response(f"Image file '{cleaned_path}' is too large ({file_info.size / (1024*1024):.2f}MB). Maximum size is {MAX_IMAGE_SIZE / (1024*1024)}MB.")
 
-            # Read image file content
-            try:
-                image_bytes = self.sandbox.fs.download_file(full_path)
-            except Exception as e:
-                return self.fail_response(f"Could not read image file: {cleaned_path}")
-
             # Determine MIME type
             mime_type, _ = mimetypes.guess_type(full_path)
             if not mime_type or not mime_type.startswith('image/'):
@@ -171,23 +211,70 @@ class SandboxVisionTool(SandboxToolsBase):
                 else:
                     return self.fail_response(f"Unsupported or unknown image format for file: '{cleaned_path}'. Supported: JPG, PNG, GIF, WEBP.")
 
-            # Compress the image
-            compressed_bytes, compressed_mime_type = self.compress_image(image_bytes, mime_type, cleaned_path)
-            
-            # Check if compressed image is still too large
-            if len(compressed_bytes) > MAX_COMPRESSED_SIZE:
-                return self.fail_response(f"Image file '{cleaned_path}' is still too large after compression ({len(compressed_bytes) / (1024*1024):.2f}MB). Maximum compressed size is {MAX_COMPRESSED_SIZE / (1024*1024)}MB.")
+            # Same content at the same target size always prepares to the same asset
+            content_hash = self._content_hash(full_path)
+            cache_key = f"{content_hash}:{DEFAULT_MAX_WIDTH}x{DEFAULT_MAX_HEIGHT}:{mime_type}" if content_hash else None
+            asset = _vision_asset_cache.get(cache_key) if cache_key else None
+
+            if asset:
+                try:
+                    asset = dict(asset, image_url=await create_signed_image_url(asset["object_name"], VISION_ASSET_BUCKET, VISION_ASSET_URL_TTL))
+                    _vision_asset_cache.move_to_end(cache_key)
+                    logger.debug(f"[SeeImage] Reusing prepared asset for '{cleaned_path}' ({content_hash[:12]})")
+                except Exception as e:
+                    # Object gone or storage unavailable, prepare the image again
+                    logger.warning(f"[SeeImage] Could not sign cached asset for '{cleaned_path}': {str(e)}")
+                    _vision_asset_cache.pop(cache_key, None)
+                    asset = None
+
+            if not asset:
+                # Read image file content
+                try:
+                    image_bytes = self.sandbox.fs.download_file(full_path)
+                except Exception as e:
+                    return self.fail_response(f"Could not read image file: {cleaned_path}")
+                if not content_hash:
+                    content_hash = hashlib.sha256(image_bytes).hexdigest()
+                    cache_key = f"{content_hash}:{DEFAULT_MAX_WIDTH}x{DEFAULT_MAX_HEIGHT}:{mime_type}"
+
+                # Compress the image off the event loop
+                loop = asyncio.get_running_loop()
+                try:
+                    compressed_bytes, compressed_mime_type = await loop.run_in_executor(
+                        get_compression_executor(), compress_image_bytes, image_bytes, mime_type, cleaned_path
+                    )
+                except Exception as e:
+                    logger.warning(f"[SeeImage] Compression worker failed, compressing in-process: {str(e)}")
+                    compressed_bytes, compressed_mime_type = self.compress_image(image_bytes, mime_type, cleaned_path)
+                
+                # Check if compressed image is still too large
+                if len(compressed_bytes) > MAX_COMPRESSED_SIZE:
+                    return self.fail_response(f"Image file '{cleaned_path}' is still too large after compression ({len(compressed_bytes) / (1024*1024):.2f}MB). Maximum compressed size is {MAX_COMPRESSED_SIZE / (1024*1024)}MB.")
 
-            # Convert to base64
-            base64_image = base64.b64encode(compressed_bytes).decode('utf-8')
+                # Store by content address so the message row only carries a reference
+                extension = mimetypes.guess_extension(compressed_mime_type) or '.img'
+                asset = {
+                    "mime_type": compressed_mime_type,
+                    "content_hash": content_hash,
+                    "compressed_size": len(compressed_bytes),
+                    "object_name": f"vision/{content_hash}_{DEFAULT_MAX_WIDTH}x{DEFAULT_MAX_HEIGHT}{extension}"
+                }
+                try:
+                    await upload_image_bytes(compressed_bytes, asset["object_name"], compressed_mime_type, VISION_ASSET_BUCKET)
+                    _vision_asset_cache[cache_key] = asset
+                    asset = dict(asset, image_url=await create_signed_image_url(asset["object_name"], VISION_ASSET_BUCKET, VISION_ASSET_URL_TTL))
+                    while len(_vision_asset_cache) > VISION_ASSET_CACHE_SIZE:
+                        _vision_asset_cache.popitem(last=False)
+                except Exception as e:
+                    # Fall back to inline base64 so the image still reaches the model
+                    logger.warning(f"[SeeImage] Failed to upload '{cleaned_path}', storing inline: {str(e)}")
+                    asset = dict(asset, base64=base64.b64encode(compressed_bytes).decode('utf-8'))
 
             # Prepare the temporary message content
             image_context_data = {
-                "mime_type": compressed_mime_type,
-                "base64": base64_image,
+                **asset,
                 "file_path": cleaned_path, # Include path for context
-                "original_size": file_info.size,
-                "compressed_size": len(compressed_bytes)
+                "original_size": file_info.size
             }
 
             # Add the temporary message using the thread_manager callback
@@ -200,7 +287,7 @@ class SandboxVisionTool(SandboxToolsBase):
             )
 
             # Inform the agent the image will be available next turn
-            return self.success_response(f"Successfully loaded and compressed the image '{cleaned_path}' (reduced from {file_info.size / 1024:.1f}KB to {len(compressed_bytes) / 1024:.1f}KB).")
+            return self.success_response(f"Successfully loaded and compressed the image '{cleaned_path}' (reduced from {file_info.size / 1024:.1f}KB to {asset['compressed_size'] / 1024:.1f}KB).")
 
         except Exception as e:
             return self.fail_response(f"An unexpected error occurred while trying to see the image: {str(e)}") 
\ No newline at end of file
@@ -204,9 +204,9 @@ class ThreadManager:
 
         return result
 
-    def add_tool(self, tool_class: Type[Tool], function_names: Optional[List[str]] = None, **kwargs):
-        """Add a tool to the ThreadManager."""
-        self.tool_registry.register_tool(tool_class, function_names, **kwargs)
+    def add_tool(self, tool_class: Type[Tool], function_names: Optional[List[str]] = None, lazy: bool = False, **kwargs):
+        """Add a tool to the ThreadManager. With lazy=True the tool is built on first use."""
+        self.tool_registry.register_tool(tool_class, function_names, lazy=lazy, **kwargs)
 
     async def add_message(
         self,
@@ -93,6 +93,9 @@ class ToolResult:
     success: bool
     output: str
 
+# Decorated method schemas per tool class, introspected once per process
+_class_schema_cache: Dict[type, Dict[str, List[ToolSchema]]] = {}
+
 class Tool(ABC):
     """Abstract base class for all tools.
     
@@ -101,13 +104,17 @@ class Tool(ABC):
     
     Attributes:
         _schemas (Dict[str, List[ToolSchema]]): Registered schemas for tool methods
+        dynamic_schemas (bool): True for tools whose schemas differ per instance
         
     Methods:
         get_schemas: Get all registered tool schemas
+        get_class_schemas: Get the decorated schemas shared by every instance of the class
         success_response: Create a successful result
         fail_response: Create a failed result
     """
     
+    dynamic_schemas: bool = False
+    
     def __init__(self):
         """Initialize tool with empty schema registry."""
         self._schemas: Dict[str, List[ToolSchema]] = {}
@@ -116,10 +123,27 @@ class Tool(ABC):
 
     def _register_schemas(self):
         """Register schemas from all decorated methods."""
-        for name, method in inspect.getmembers(self, predicate=inspect.ismethod):
-            if hasattr(method, 'tool_schemas'):
-                self._schemas[name] = method.tool_schemas
-                logger.debug(f"Registered schemas for method '{name}' in {self.__class__.__name__}")
+        self._schemas.update(self.get_class_schemas())
+
+    @classmethod
+    def get_class_schemas(cls) -> Dict[str, List[ToolSchema]]:
+        """Get schemas from the decorated methods of this class.
+        
+        Introspection happens once per class; later calls return the cached mapping,
+        which must be treated as read-only.
+        
+        Returns:
+            Dict mapping method names to their schema definitions
+        """
+        schemas = _class_schema_cache.get(cls)
+        if schemas is None:
+            schemas = {}
+            for name, function in inspect.getmembers(cls, predicate=inspect.isfunction):
+                if hasattr(function, 'tool_schemas'):
+                    schemas[name] = function.tool_schemas
+                    logger.debug(f"Registered schemas for method '{name}' in {cls.__name__}")
+            _class_schema_cache[cls] = schemas
+        return schemas
 
     def get_schemas(self) -> Dict[str, List[ToolSchema]]:
         """Get all registered tool schemas.
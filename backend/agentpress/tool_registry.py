@@ -1,8 +1,101 @@
-from typing import Dict, Type, Any, List, Optional, Callable
-from agentpress.tool import Tool, SchemaType
+import time
+from dataclasses import dataclass
+from typing import Dict, Type, Any, List, Optional, Callable, Tuple, FrozenSet
+from agentpress.tool import Tool, ToolSchema, SchemaType
 from utils.logger import logger
 
 
+@dataclass(frozen=True)
+class ToolCatalog:
+    """Precompiled, immutable schemas for a tool class and enabled-function set.
+    
+    Attributes:
+        tool_class (Type[Tool]): The tool class the catalog was compiled from
+        openapi (Tuple[Tuple[str, ToolSchema], ...]): (function name, schema) pairs
+        xml (Tuple[Tuple[str, str, ToolSchema], ...]): (tag name, function name, schema) triples
+    """
+    tool_class: Type[Tool]
+    openapi: Tuple[Tuple[str, ToolSchema], ...]
+    xml: Tuple[Tuple[str, str, ToolSchema], ...]
+
+# Catalogs keyed by (tool class, enabled function names), compiled once per process
+_catalog_cache: Dict[Tuple[Type[Tool], Optional[FrozenSet[str]]], ToolCatalog] = {}
+
+def compile_tool_catalog(tool_class: Type[Tool], function_names: Optional[List[str]] = None,
+                         schemas: Optional[Dict[str, List[ToolSchema]]] = None) -> ToolCatalog:
+    """Compile (or fetch from cache) the catalog for a tool class.
+    
+    Args:
+        tool_class: The tool class to compile
+        function_names: Optional list of specific functions to include
+        schemas: Instance schemas for tools with dynamic_schemas; these are never cached
+        
+    Returns:
+        ToolCatalog for the class and function set
+    """
+    key = (tool_class, frozenset(function_names) if function_names is not None else None)
+    if schemas is None:
+        catalog = _catalog_cache.get(key)
+        if catalog is not None:
+            return catalog
+        schemas = tool_class.get_class_schemas()
+    
+    openapi = []
+    xml = []
+    for func_name, schema_list in schemas.items():
+        if function_names is None or func_name in function_names:
+            for schema in schema_list:
+                if schema.schema_type == SchemaType.OPENAPI:
+                    openapi.append((func_name, schema))
+                if schema.schema_type == SchemaType.XML and schema.xml_schema:
+                    xml.append((schema.xml_schema.tag_name, func_name, schema))
+    catalog = ToolCatalog(tool_class=tool_class, openapi=tuple(openapi), xml=tuple(xml))
+    
+    if not tool_class.dynamic_schemas:
+        _catalog_cache[key] = catalog
+        logger.debug(f"Compiled tool catalog for {tool_class.__name__}: {len(openapi)} OpenAPI functions, {len(xml)} XML tags")
+    return catalog
+
+
+class LazyToolProxy:
+    """Stands in for a tool instance until one of its functions is first called.
+    
+    Schemas are registered from the precompiled catalog right away; the tool itself
+    (and any sandbox or HTTP clients its constructor creates) is only built on first use.
+    """
+    
+    def __init__(self, tool_class: Type[Tool], kwargs: Dict[str, Any], registry: "ToolRegistry"):
+        self._tool_class = tool_class
+        self._kwargs = kwargs
+        self._registry = registry
+        self._instance: Optional[Tool] = None
+    
+    @property
+    def is_resolved(self) -> bool:
+        return self._instance is not None
+    
+    def resolve(self) -> Tool:
+        """Build the tool instance if needed and return it."""
+        if self._instance is None:
+            self._instance = self._registry._construct_tool(self._tool_class, self._kwargs, lazy=True)
+        return self._instance
+    
+    def get_function(self, name: str) -> Callable:
+        """Get a tool function without constructing the tool until it is awaited."""
+        if self._instance is not None:
+            return getattr(self._instance, name)
+        
+        async def call(*args, **kwargs):
+            return await getattr(self.resolve(), name)(*args, **kwargs)
+        call.__name__ = name
+        return call
+    
+    def __getattr__(self, name: str):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+
 class ToolRegistry:
     """Registry for managing and accessing tools.
     
@@ -12,63 +105,106 @@ class ToolRegistry:
     Attributes:
         tools (Dict[str, Dict[str, Any]]): OpenAPI-style tools and schemas
         xml_tools (Dict[str, Dict[str, Any]]): XML-style tools and schemas
+        construction_times (Dict[str, float]): Milliseconds spent constructing each tool class
         
     Methods:
         register_tool: Register a tool with optional function filtering
         get_tool: Get a specific tool by name
         get_xml_tool: Get a tool by XML tag name
+        register_function: Register a single OpenAPI function on an existing instance
         get_openapi_schemas: Get OpenAPI schemas for function calling
         get_xml_examples: Get examples of XML tool usage
+        
+    Notes:
+        Register through the methods above rather than writing to `tools` or
+        `xml_tools` directly, so the cached schema lists are invalidated.
     """
     
     def __init__(self):
         """Initialize a new ToolRegistry instance."""
         self.tools = {}
         self.xml_tools = {}
+        self._openapi_schemas: Optional[List[Dict[str, Any]]] = None
+        self._xml_examples: Optional[Dict[str, str]] = None
+        self.construction_times: Dict[str, float] = {}
         logger.debug("Initialized new ToolRegistry instance")
+
+    def _invalidate_caches(self):
+        self._openapi_schemas = None
+        self._xml_examples = None
     
-    def register_tool(self, tool_class: Type[Tool], function_names: Optional[List[str]] = None, **kwargs):
+    def register_tool(self, tool_class: Type[Tool], function_names: Optional[List[str]] = None, lazy: bool = False, **kwargs):
         """Register a tool with optional function filtering.
         
         Args:
             tool_class: The tool class to register
             function_names: Optional list of specific functions to register
+            lazy: Defer constructing the tool until one of its functions is called
             **kwargs: Additional arguments passed to tool initialization
             
         Notes:
             - If function_names is None, all functions are registered
             - Handles both OpenAPI and XML schema registration
+            - Tools with dynamic_schemas are always constructed eagerly
         """
         logger.debug(f"Registering tool class: {tool_class.__name__}")
-        tool_instance = tool_class(**kwargs)
-        schemas = tool_instance.get_schemas()
+        if lazy and not tool_class.dynamic_schemas:
+            catalog = compile_tool_catalog(tool_class, function_names)
+            self.bind_catalog(catalog, LazyToolProxy(tool_class, kwargs, self))
+            return
         
-        logger.debug(f"Available schemas for {tool_class.__name__}: {list(schemas.keys())}")
-        
-        registered_openapi = 0
-        registered_xml = 0
+        tool_instance = self._construct_tool(tool_class, kwargs)
+        schemas = tool_instance.get_schemas() if tool_class.dynamic_schemas else None
+        catalog = compile_tool_catalog(tool_class, function_names, schemas)
+        self.bind_catalog(catalog, tool_instance)
+
+    def _construct_tool(self, tool_class: Type[Tool], kwargs: Dict[str, Any], lazy: bool = False) -> Tool:
+        """Instantiate a tool and record how long construction took."""
+        start = time.perf_counter()
+        tool_instance = tool_class(**kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.construction_times[tool_class.__name__] = elapsed_ms
+        if lazy:
+            logger.info(f"Constructed {tool_class.__name__} on first use in {elapsed_ms:.1f}ms")
+        else:
+            logger.debug(f"Constructed {tool_class.__name__} in {elapsed_ms:.1f}ms")
+        return tool_instance
+
+    def bind_catalog(self, catalog: ToolCatalog, tool_instance: Any):
+        """Bind a precompiled catalog to a tool instance.
         
-        for func_name, schema_list in schemas.items():
-            if function_names is None or func_name in function_names:
-                for schema in schema_list:
-                    if schema.schema_type == SchemaType.OPENAPI:
-                        self.tools[func_name] = {
-                            "instance": tool_instance,
-                            "schema": schema
-                        }
-                        registered_openapi += 1
-                        logger.debug(f"Registered OpenAPI function {func_name} from {tool_class.__name__}")
-                    
-                    if schema.schema_type == SchemaType.XML and schema.xml_schema:
-                        self.xml_tools[schema.xml_schema.tag_name] = {
-                            "instance": tool_instance,
-                            "method": func_name,
-                            "schema": schema
-                        }
-                        registered_xml += 1
-                        logger.debug(f"Registered XML tag {schema.xml_schema.tag_name} -> {func_name} from {tool_class.__name__}")
+        Args:
+            catalog: Compiled schemas for the tool
+            tool_instance: Object whose methods implement the catalog's functions
+        """
+        for func_name, schema in catalog.openapi:
+            self.tools[func_name] = {
+                "instance": tool_instance,
+                "schema": schema
+            }
+        for tag_name, func_name, schema in catalog.xml:
+            self.xml_tools[tag_name] = {
+                "instance": tool_instance,
+                "method": func_name,
+                "schema": schema
+            }
+        self._invalidate_caches()
+        logger.debug(f"Tool registration complete for {catalog.tool_class.__name__}: {len(catalog.openapi)} OpenAPI functions, {len(catalog.xml)} XML tags")
+
+    def register_function(self, func_name: str, tool_instance: Any, schema: ToolSchema):
+        """Register a single OpenAPI function, e.g. one added dynamically after initialization.
         
-        logger.debug(f"Tool registration complete for {tool_class.__name__}: {registered_openapi} OpenAPI functions, {registered_xml} XML tags")
+        Args:
+            func_name: Name of the function on the tool instance
+            tool_instance: Object implementing the function
+            schema: OpenAPI schema for the function
+        """
+        self.tools[func_name] = {
+            "instance": tool_instance,
+            "schema": schema
+        }
+        self._invalidate_caches()
+        logger.debug(f"Registered OpenAPI function {func_name} on {tool_instance.__class__.__name__}")
 
     def get_available_functions(self) -> Dict[str, Callable]:
         """Get all available tool functions.
@@ -80,21 +216,23 @@ class ToolRegistry:
         
         # Get OpenAPI tool functions
         for tool_name, tool_info in self.tools.items():
-            tool_instance = tool_info['instance']
             function_name = tool_name
-            function = getattr(tool_instance, function_name)
-            available_functions[function_name] = function
+            available_functions[function_name] = self._get_function(tool_info['instance'], function_name)
             
         # Get XML tool functions
         for tag_name, tool_info in self.xml_tools.items():
-            tool_instance = tool_info['instance']
             method_name = tool_info['method']
-            function = getattr(tool_instance, method_name)
-            available_functions[method_name] = function
+            available_functions[method_name] = self._get_function(tool_info['instance'], method_name)
             
         logger.debug(f"Retrieved {len(available_functions)} available functions")
         return available_functions
 
+    def _get_function(self, tool_instance: Any, name: str) -> Callable:
+        # Looking up functions must not force lazy tools to be constructed
+        if isinstance(tool_instance, LazyToolProxy):
+            return tool_instance.get_function(name)
+        return getattr(tool_instance, name)
+
     def get_tool(self, tool_name: str) -> Dict[str, Any]:
         """Get a specific tool by name.
         
@@ -127,26 +265,30 @@ class ToolRegistry:
         """Get OpenAPI schemas for function calling.
         
         Returns:
-            List of OpenAPI-compatible schema definitions
+            List of OpenAPI-compatible schema definitions. The list is cached and
+            reused across LLM calls until the next registration; do not mutate it.
         """
-        schemas = [
-            tool_info['schema'].schema 
-            for tool_info in self.tools.values()
-            if tool_info['schema'].schema_type == SchemaType.OPENAPI
-        ]
-        logger.debug(f"Retrieved {len(schemas)} OpenAPI schemas")
-        return schemas
+        if self._openapi_schemas is None:
+            self._openapi_schemas = [
+                tool_info['schema'].schema 
+                for tool_info in self.tools.values()
+                if tool_info['schema'].schema_type == SchemaType.OPENAPI
+            ]
+            logger.debug(f"Compiled {len(self._openapi_schemas)} OpenAPI schemas")
+        return self._openapi_schemas
 
     def get_xml_examples(self) -> Dict[str, str]:
         """Get all XML tag examples.
         
         Returns:
-            Dict mapping tag names to their example usage
+            Dict mapping tag names to their example usage (cached; do not mutate)
         """
-        examples = {}
-        for tool_info in self.xml_tools.values():
-            schema = tool_info['schema']
-            if schema.xml_schema and schema.xml_schema.example:
-                examples[schema.xml_schema.tag_name] = schema.xml_schema.example
-        logger.debug(f"Retrieved {len(examples)} XML examples")
-        return examples
+        if self._xml_examples is None:
+            examples = {}
+            for tool_info in self.xml_tools.values():
+                schema = tool_info['schema']
+                if schema.xml_schema and schema.xml_schema.example:
+                    examples[schema.xml_schema.tag_name] = schema.xml_schema.example
+            self._xml_examples = examples
+            logger.debug(f"Compiled {len(examples)} XML examples")
+        return self._xml_examples
@@ -1,11 +1,19 @@
 import os
+import asyncio
+import base64
+import hashlib
+import shlex
+import threading
+import time
 import urllib.parse
-from typing import Optional
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, APIRouter, Form, Depends, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
+from daytona_api_client.models.workspace_state import WorkspaceState
 from sandbox.sandbox import get_or_start_sandbox, delete_sandbox
 from utils.logger import logger
 from utils.auth_utils import get_optional_user_id
@@ -21,6 +29,86 @@ def initialize(_db: DBConnection):
     db = _db
     logger.info("Initialized sandbox API with database connection")
 
+# Files at or below this size are downloaded in one call and kept in the LRU cache
+FILE_CACHE_MAX_FILE_BYTES = int(os.getenv("SANDBOX_FILE_CACHE_MAX_FILE_BYTES", str(1024 * 1024)))
+FILE_CACHE_MAX_BYTES = int(os.getenv("SANDBOX_FILE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Larger files are streamed in chunks of this size, bounding memory per request
+FILE_STREAM_CHUNK_BYTES = int(os.getenv("SANDBOX_FILE_STREAM_CHUNK_BYTES", str(1024 * 1024)))
+
+class FileContentCache:
+    """Small in-process LRU of hot file contents keyed by (sandbox_id, path) and validated by ETag."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries: "OrderedDict[Tuple[str, str], Tuple[str, bytes]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, sandbox_id: str, path: str, etag: str) -> Optional[bytes]:
+        with self.lock:
+            entry = self.entries.get((sandbox_id, path))
+            if entry is None:
+                return None
+            if entry[0] != etag:
+                self._remove((sandbox_id, path))
+                return None
+            self.entries.move_to_end((sandbox_id, path))
+            return entry[1]
+
+    def put(self, sandbox_id: str, path: str, etag: str, content: bytes):
+        if len(content) > FILE_CACHE_MAX_FILE_BYTES:
+            return
+        with self.lock:
+            self._remove((sandbox_id, path))
+            self.entries[(sandbox_id, path)] = (etag, content)
+            self.total_bytes += len(content)
+            while self.total_bytes > self.max_bytes and self.entries:
+                self._remove(next(iter(self.entries)))
+
+    def invalidate(self, sandbox_id: str, path: Optional[str] = None):
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == sandbox_id and (path is None or key[1] == path)]:
+                self._remove(key)
+
+    def _remove(self, key: Tuple[str, str]):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= len(entry[1])
+
+file_cache = FileContentCache(FILE_CACHE_MAX_BYTES)
+
+# The file browser polls these routes, so access decisions and sandbox handles are cached briefly
+SANDBOX_ACCESS_CACHE_TTL = float(os.getenv("SANDBOX_ACCESS_CACHE_TTL", "30"))
+SANDBOX_HANDLE_CACHE_TTL = float(os.getenv("SANDBOX_HANDLE_CACHE_TTL", "60"))
+
+# (user_id, sandbox_id) -> (expires_at, project_data); only granted decisions are cached
+access_cache: Dict[Tuple[Optional[str], str], Tuple[float, dict]] = {}
+# sandbox_id -> (expires_at, sandbox); only started sandboxes are cached
+sandbox_handle_cache: Dict[str, Tuple[float, object]] = {}
+sandbox_handle_locks: Dict[str, asyncio.Lock] = {}
+
+def invalidate_sandbox_cache(sandbox_id: Optional[str] = None, project_id: Optional[str] = None):
+    """
+    Drop cached access decisions and sandbox handles.
+
+    Args:
+        sandbox_id: Invalidate entries for this sandbox
+        project_id: Invalidate entries for every sandbox owned by this project
+        
+    With no arguments everything is dropped.
+    """
+    if sandbox_id is None and project_id is None:
+        access_cache.clear()
+        sandbox_handle_cache.clear()
+        return
+    sandbox_ids = {sandbox_id} if sandbox_id else set()
+    if project_id:
+        sandbox_ids.update(key[1] for key, (_, project) in access_cache.items() if project.get('project_id') == project_id)
+    for key in [key for key in access_cache if key[1] in sandbox_ids]:
+        access_cache.pop(key, None)
+    for cached_id in sandbox_ids:
+        sandbox_handle_cache.pop(cached_id, None)
+
 class FileInfo(BaseModel):
     """Model for file information"""
     name: str
@@ -65,6 +153,64 @@ def normalize_path(path: str) -> str:
         logger.error(f"Error normalizing path '{path}': {str(e)}")
         return path  # Return original path if decoding fails
 
+def compute_etag(path: str, size: int, mod_time) -> str:
+    """ETag derived from path, size and modification time, so it never requires reading the file."""
+    digest = hashlib.sha1(f"{path}:{size}:{mod_time}".encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f"W/{etag}" in candidates
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into inclusive (start, end) offsets.
+
+    Returns None when the header is absent or uses multiple ranges (the full file is served then).
+    Raises HTTPException 416 when the range cannot be satisfied.
+    """
+    if not range_header or not range_header.startswith('bytes=') or ',' in range_header:
+        return None
+    start_str, _, end_str = range_header[len('bytes='):].strip().partition('-')
+    try:
+        if start_str == '':
+            # Suffix range: last N bytes
+            length = int(end_str)
+            if length <= 0:
+                raise ValueError
+            start, end = max(0, size - length), size - 1
+        else:
+            start = int(start_str)
+            end = int(end_str) if end_str else size - 1
+            end = min(end, size - 1)
+        if start > end or start >= size:
+            raise ValueError
+    except ValueError:
+        raise HTTPException(status_code=416, detail="Requested range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+def read_file_range(sandbox, path: str, start: int, length: int) -> bytes:
+    """Read `length` bytes at offset `start` inside the sandbox, without downloading the whole file."""
+    script = f"tail -c +{start + 1} {shlex.quote(path)} | head -c {length} | base64 -w0"
+    encoded = base64.b64encode(script.encode()).decode()
+    response = sandbox.process.exec(f"/bin/sh -c 'echo {encoded} | base64 -d | sh'", timeout=60)
+    if response.exit_code != 0:
+        raise RuntimeError(f"Failed to read range of {path}: {response.result}")
+    return base64.b64decode(response.result.strip())
+
+def iter_file_chunks(sandbox, path: str, start: int, end: int):
+    """Yield the inclusive byte range [start, end] of a sandbox file in bounded chunks."""
+    offset = start
+    while offset <= end:
+        length = min(FILE_STREAM_CHUNK_BYTES, end - offset + 1)
+        chunk = read_file_range(sandbox, path, offset, length)
+        if not chunk:
+            break
+        yield chunk
+        offset += len(chunk)
+
 async def verify_sandbox_access(client, sandbox_id: str, user_id: Optional[str] = None):
     """
     Verify that a user has access to a specific sandbox based on account membership.
@@ -80,6 +226,10 @@ async def verify_sandbox_access(client, sandbox_id: str, user_id: Optional[str]
     Raises:
         HTTPException: If the user doesn't have access to the sandbox or sandbox doesn't exist
     """
+    cached = access_cache.get((user_id, sandbox_id))
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
     # Find the project that owns this sandbox
     project_result = await client.table('projects').select('*').filter('sandbox->>id', 'eq', sandbox_id).execute()
     
@@ -89,6 +239,7 @@ async def verify_sandbox_access(client, sandbox_id: str, user_id: Optional[str]
     project_data = project_result.data[0]
 
     if project_data.get('is_public'):
+        access_cache[(user_id, sandbox_id)] = (time.monotonic() + SANDBOX_ACCESS_CACHE_TTL, project_data)
         return project_data
     
     # For private projects, we must have a user_id
@@ -101,17 +252,22 @@ async def verify_sandbox_access(client, sandbox_id: str, user_id: Optional[str]
     if account_id:
         account_user_result = await client.schema('basejump').from_('account_user').select('account_role').eq('user_id', user_id).eq('account_id', account_id).execute()
         if account_user_result.data and len(account_user_result.data) > 0:
+            access_cache[(user_id, sandbox_id)] = (time.monotonic() + SANDBOX_ACCESS_CACHE_TTL, project_data)
             return project_data
     
     raise HTTPException(status_code=403, detail="Not authorized to access this sandbox")
 
-async def get_sandbox_by_id_safely(client, sandbox_id: str):
+async def get_sandbox_by_id_safely(client, sandbox_id: str, verified: bool = False):
     """
     Safely retrieve a sandbox object by its ID, using the project that owns it.
     
+    Started sandboxes are cached for SANDBOX_HANDLE_CACHE_TTL seconds, and concurrent
+    requests for the same sandbox share a single lookup/start.
+    
     Args:
         client: The Supabase client
         sandbox_id: The sandbox ID to retrieve
+        verified: Skip the ownership query when verify_sandbox_access already found the project
     
     Returns:
         Sandbox: The sandbox object
@@ -119,26 +275,41 @@ async def get_sandbox_by_id_safely(client, sandbox_id: str):
     Raises:
         HTTPException: If the sandbox doesn't exist or can't be retrieved
     """
-    # Find the project that owns this sandbox
-    project_result = await client.table('projects').select('project_id').filter('sandbox->>id', 'eq', sandbox_id).execute()
-    
-    if not project_result.data or len(project_result.data) == 0:
-        logger.error(f"No project found for sandbox ID: {sandbox_id}")
-        raise HTTPException(status_code=404, detail="Sandbox not found - no project owns this sandbox ID")
-    
-    # project_id = project_result.data[0]['project_id']
-    # logger.debug(f"Found project {project_id} for sandbox {sandbox_id}")
-    
-    try:
-        # Get the sandbox
-        sandbox = await get_or_start_sandbox(sandbox_id)
-        # Extract just the sandbox object from the tuple (sandbox, sandbox_id, sandbox_pass)
-        # sandbox = sandbox_tuple[0]
+    cached = sandbox_handle_cache.get(sandbox_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    lock = sandbox_handle_locks.setdefault(sandbox_id, asyncio.Lock())
+    async with lock:
+        # Another request may have fetched the sandbox while we waited
+        cached = sandbox_handle_cache.get(sandbox_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        if not verified:
+            # Find the project that owns this sandbox
+            project_result = await client.table('projects').select('project_id').filter('sandbox->>id', 'eq', sandbox_id).execute()
             
-        return sandbox
-    except Exception as e:
-        logger.error(f"Error retrieving sandbox {sandbox_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve sandbox: {str(e)}")
+            if not project_result.data or len(project_result.data) == 0:
+                logger.error(f"No project found for sandbox ID: {sandbox_id}")
+                raise HTTPException(status_code=404, detail="Sandbox not found - no project owns this sandbox ID")
+        
+        try:
+            # Get the sandbox
+            sandbox = await get_or_start_sandbox(sandbox_id)
+            cache_sandbox_handle(sandbox_id, sandbox)
+            return sandbox
+        except Exception as e:
+            logger.error(f"Error retrieving sandbox {sandbox_id}: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to retrieve sandbox: {str(e)}")
+
+def cache_sandbox_handle(sandbox_id: str, sandbox):
+    """Cache a sandbox handle, but only while it is known to be running."""
+    state = getattr(getattr(sandbox, 'instance', None), 'state', None)
+    if state == WorkspaceState.STARTED:
+        sandbox_handle_cache[sandbox_id] = (time.monotonic() + SANDBOX_HANDLE_CACHE_TTL, sandbox)
+    else:
+        sandbox_handle_cache.pop(sandbox_id, None)
 
 @router.post("/sandboxes/{sandbox_id}/files")
 async def create_file(
@@ -160,18 +331,21 @@ async def create_file(
     
     try:
         # Get sandbox using the safer method
-        sandbox = await get_sandbox_by_id_safely(client, sandbox_id)
+        sandbox = await get_sandbox_by_id_safely(client, sandbox_id, verified=True)
         
         # Read file content directly from the uploaded file
         content = await file.read()
         
         # Create file using raw binary content
         sandbox.fs.upload_file(path, content)
+        file_cache.invalidate(sandbox_id, path)
         logger.info(f"File created at {path} in sandbox {sandbox_id}")
         
         return {"status": "success", "created": True, "path": path}
     except Exception as e:
         logger.error(f"Error creating file in sandbox {sandbox_id}: {str(e)}")
+        # The sandbox may have stopped; force a fresh lookup on the next request
+        sandbox_handle_cache.pop(sandbox_id, None)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/sandboxes/{sandbox_id}/files")
@@ -193,7 +367,7 @@ async def list_files(
     
     try:
         # Get sandbox using the safer method
-        sandbox = await get_sandbox_by_id_safely(client, sandbox_id)
+        sandbox = await get_sandbox_by_id_safely(client, sandbox_id, verified=True)
         
         # List files
         files = sandbox.fs.list_files(path)
@@ -217,6 +391,8 @@ async def list_files(
         return {"files": [file.dict() for file in result]}
     except Exception as e:
         logger.error(f"Error listing files in sandbox {sandbox_id}: {str(e)}")
+        # The sandbox may have stopped; force a fresh lookup on the next request
+        sandbox_handle_cache.pop(sandbox_id, None)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/sandboxes/{sandbox_id}/files/content")
@@ -242,37 +418,88 @@ async def read_file(
     
     try:
         # Get sandbox using the safer method
-        sandbox = await get_sandbox_by_id_safely(client, sandbox_id)
+        sandbox = await get_sandbox_by_id_safely(client, sandbox_id, verified=True)
         
-        # Read file directly - don't check existence first with a separate call
+        # Size and mtime drive the ETag, the cache decision and range handling
         try:
-            content = sandbox.fs.download_file(path)
-        except Exception as download_err:
-            logger.error(f"Error downloading file {path} from sandbox {sandbox_id}: {str(download_err)}")
+            file_info = sandbox.fs.get_file_info(path)
+        except Exception as info_err:
+            logger.error(f"Error getting file info for {path} in sandbox {sandbox_id}: {str(info_err)}")
             raise HTTPException(
                 status_code=404, 
-                detail=f"Failed to download file: {str(download_err)}"
+                detail=f"Failed to download file: {str(info_err)}"
             )
+        if file_info.is_dir:
+            raise HTTPException(status_code=400, detail=f"Path is a directory: {path}")
         
-        # Return a Response object with the content directly
+        size = file_info.size
+        etag = compute_etag(path, size, file_info.mod_time)
         filename = os.path.basename(path)
-        logger.info(f"Successfully read file {filename} from sandbox {sandbox_id}")
         
         # Ensure proper encoding by explicitly using UTF-8 for the filename in Content-Disposition header
         # This applies RFC 5987 encoding for the filename to support non-ASCII characters
         encoded_filename = filename.encode('utf-8').decode('latin-1')
         content_disposition = f"attachment; filename*=UTF-8''{encoded_filename}"
+        headers = {
+            "Content-Disposition": content_disposition,
+            "ETag": etag,
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "private, no-cache"
+        }
+        
+        if request is not None and etag_matches(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=headers)
+        
+        byte_range = parse_range_header(request.headers.get('range') if request is not None else None, size)
+        
+        if size <= FILE_CACHE_MAX_FILE_BYTES:
+            content = file_cache.get(sandbox_id, path, etag)
+            if content is None:
+                try:
+                    content = sandbox.fs.download_file(path)
+                except Exception as download_err:
+                    logger.error(f"Error downloading file {path} from sandbox {sandbox_id}: {str(download_err)}")
+                    raise HTTPException(
+                        status_code=404, 
+                        detail=f"Failed to download file: {str(download_err)}"
+                    )
+                file_cache.put(sandbox_id, path, etag, content)
+            else:
+                logger.debug(f"Serving {path} for sandbox {sandbox_id} from file cache")
+            
+            logger.info(f"Successfully read file {filename} from sandbox {sandbox_id}")
+            if byte_range:
+                start, end = byte_range
+                headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+                return Response(content=content[start:end + 1], status_code=206, media_type="application/octet-stream", headers=headers)
+            return Response(
+                content=content,
+                media_type="application/octet-stream",
+                headers=headers
+            )
+        
+        # Large file: stream bounded chunks straight from the sandbox
+        start, end = byte_range if byte_range else (0, size - 1)
+        headers["Content-Length"] = str(end - start + 1)
+        status_code = 200
+        if byte_range:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            status_code = 206
         
-        return Response(
-            content=content,
+        logger.info(f"Streaming file {filename} ({start}-{end}/{size}) from sandbox {sandbox_id}")
+        return StreamingResponse(
+            iter_file_chunks(sandbox, path, start, end),
+            status_code=status_code,
             media_type="application/octet-stream",
-            headers={"Content-Disposition": content_disposition}
+            headers=headers
         )
     except HTTPException:
         # Re-raise HTTP exceptions without wrapping
         raise
     except Exception as e:
         logger.error(f"Error reading file in sandbox {sandbox_id}: {str(e)}")
+        # The sandbox may have stopped; force a fresh lookup on the next request
+        sandbox_handle_cache.pop(sandbox_id, None)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/sandboxes/{sandbox_id}/files")
@@ -294,15 +521,18 @@ async def delete_file(
     
     try:
         # Get sandbox using the safer method
-        sandbox = await get_sandbox_by_id_safely(client, sandbox_id)
+        sandbox = await get_sandbox_by_id_safely(client, sandbox_id, verified=True)
         
         # Delete file
         sandbox.fs.delete_file(path)
+        file_cache.invalidate(sandbox_id, path)
         logger.info(f"File deleted at {path} in sandbox {sandbox_id}")
         
         return {"status": "success", "deleted": True, "path": path}
     except Exception as e:
         logger.error(f"Error deleting file in sandbox {sandbox_id}: {str(e)}")
+        # The sandbox may have stopped; force a fresh lookup on the next request
+        sandbox_handle_cache.pop(sandbox_id, None)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/sandboxes/{sandbox_id}")
@@ -321,6 +551,8 @@ async def delete_sandbox_route(
     try:
         # Delete the sandbox using the sandbox module function
         await delete_sandbox(sandbox_id)
+        file_cache.invalidate(sandbox_id)
+        invalidate_sandbox_cache(sandbox_id=sandbox_id)
         
         return {"status": "success", "deleted": True, "sandbox_id": sandbox_id}
     except Exception as e:
@@ -377,6 +609,7 @@ async def ensure_project_sandbox_active(
         # Get or start the sandbox
         logger.info(f"Ensuring sandbox is active for project {project_id}")
         sandbox = await get_or_start_sandbox(sandbox_id)
+        cache_sandbox_handle(sandbox_id, sandbox)
         
         logger.info(f"Successfully ensured sandbox {sandbox_id} is active for project {project_id}")
         
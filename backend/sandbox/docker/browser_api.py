@@ -10,8 +10,16 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import os
 import random
+import re
+import time
+from urllib.parse import urlparse
 from functools import cached_property
 import traceback
+import hashlib
+import threading
+from email.utils import parsedate_to_datetime
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import pytesseract
 from PIL import Image
 import io
@@ -75,6 +83,13 @@ class DoneAction(BaseModel):
     success: bool = True
     text: str = ""
 
+class BatchVisitAction(BaseModel):
+    urls: List[str]
+    include_text: bool = True
+    include_screenshot: bool = False
+    max_text_length: int = 20000
+    per_domain_limit: Optional[int] = None
+
 #######################################################
 # DOM Structure Models
 #######################################################
@@ -245,6 +260,10 @@ class DOMState:
     title: str = ""
     pixels_above: int = 0
     pixels_below: int = 0
+    snapshot_type: str = "full"  # "full" or "incremental"
+    changed_indexes: List[int] = field(default_factory=list)
+    removed_indexes: List[int] = field(default_factory=list)
+    viewport_indexes: List[int] = field(default_factory=list)
 
 #######################################################
 # Browser Action Result Model
@@ -264,6 +283,10 @@ class BrowserActionResult(BaseModel):
     pixels_below: int = 0
     content: Optional[str] = None
     ocr_text: Optional[str] = None  # Added field for OCR text
+    snapshot_type: Optional[str] = None  # "full" or "incremental" element listing
+    removed_element_indexes: Optional[List[int]] = None  # Indexes gone since the previous snapshot
+    wait_time_ms: int = 0  # Time spent waiting for the page to settle before capturing state
+    cache_stats: Optional[Dict[str, int]] = None  # Asset cache hits/misses/blocked/bytes saved during this action
     
     # Additional metadata
     element_count: int = 0  # Number of interactive elements found
@@ -274,8 +297,373 @@ class BrowserActionResult(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
+class BatchPageResult(BaseModel):
+    url: str
+    success: bool = True
+    error: str = ""
+    final_url: Optional[str] = None
+    title: Optional[str] = None
+    content: Optional[str] = None
+    screenshot_base64: Optional[str] = None
+    wait_time_ms: int = 0
+
+class BatchVisitResult(BaseModel):
+    success: bool = True
+    message: str = ""
+    error: str = ""
+    results: Dict[str, BatchPageResult] = {}
+
+#######################################################
+# OCR Worker
+#######################################################
+
+def run_ocr(image_bytes: bytes) -> str:
+    """Run Tesseract on an encoded image. Executed in a worker process."""
+    image = Image.open(io.BytesIO(image_bytes))
+    return pytesseract.image_to_string(image).strip()
+
+#######################################################
+# Asset Cache
+#######################################################
+
+class AssetCache:
+    """Persistent, size-bounded disk cache for static assets served through Playwright routing.
+
+    Requests for scripts, stylesheets and images are answered from disk when a
+    fresh copy exists, configured resource types and tracker hosts are blocked,
+    and everything else is passed through untouched. Routing a request bypasses
+    Chromium's own HTTP cache, which is why the cache lives here and survives
+    browser restarts.
+    """
+
+    CACHEABLE_RESOURCE_TYPES = {"script", "stylesheet", "image"}
+    TRACKER_URL_PATTERN = re.compile(
+        r"google-analytics|googletagmanager|doubleclick|googlesyndication|hotjar|"
+        r"segment\.(io|com)|facebook\.com/tr|connect\.facebook\.net|clarity\.ms|"
+        r"scorecardresearch|quantserve|adservice|criteo|taboola|outbrain",
+        re.IGNORECASE
+    )
+    # Headers that describe the wire encoding rather than the decoded body we store
+    DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+
+    def __init__(self):
+        self.cache_dir = os.getenv("BROWSER_ASSET_CACHE_DIR", os.path.join(os.getcwd(), "asset_cache"))
+        self.max_bytes = int(os.getenv("BROWSER_ASSET_CACHE_MB", "200")) * 1024 * 1024
+        # Upper bound on how long an entry is kept, whatever the response allows
+        self.max_ttl = int(os.getenv("BROWSER_ASSET_CACHE_TTL", "86400"))
+        self.blocked_resource_types = {
+            t.strip() for t in os.getenv("BROWSER_BLOCK_RESOURCE_TYPES", "font,media").split(",") if t.strip()
+        }
+        self.block_trackers = os.getenv("BROWSER_BLOCK_TRACKERS", "true").lower() == "true"
+        # key -> (size, last access); reads and writes run in asyncio.to_thread workers,
+        # so the index and byte count are only touched under the lock
+        self.lock = threading.Lock()
+        self.index: Dict[str, tuple] = {}
+        self.total_bytes = 0
+        self.stats = defaultdict(int)
+        self.totals = defaultdict(int)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.load_index()
+
+    def load_index(self):
+        """Rebuild the in-memory index from the files left by previous runs"""
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".body"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            with self.lock:
+                self.index[name[:-len(".body")]] = (stat.st_size, stat.st_mtime)
+                self.total_bytes += stat.st_size
+        self.evict()
+
+    def paths(self, key: str) -> tuple:
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.body", f"{base}.meta"
+
+    def read(self, url: str) -> Optional[tuple]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        with self.lock:
+            if key not in self.index:
+                return None
+        body_path, meta_path = self.paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta["expires"] < time.time():
+                self.remove(key)
+                return None
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError, KeyError):
+            self.remove(key)
+            return None
+        with self.lock:
+            if key in self.index:
+                self.index[key] = (len(body), time.time())
+        return meta, body
+
+    def write(self, url: str, status: int, headers: Dict[str, str], body: bytes, ttl: int):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        if len(body) > self.max_bytes // 10:
+            return
+        body_path, meta_path = self.paths(key)
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in self.DROPPED_HEADERS},
+            "expires": time.time() + ttl
+        }
+        try:
+            with open(body_path, "wb") as f:
+                f.write(body)
+            with open(meta_path, "w") as f:
+                json.dump(meta, f)
+        except OSError as e:
+            print(f"Error writing asset cache entry: {e}")
+            return
+        with self.lock:
+            previous_size, _ = self.index.get(key, (0, 0))
+            self.index[key] = (len(body), time.time())
+            self.total_bytes += len(body) - previous_size
+        self.evict()
+
+    def remove(self, key: str):
+        with self.lock:
+            size, _ = self.index.pop(key, (0, 0))
+            self.total_bytes -= size
+        for path in self.paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits its size budget"""
+        victims = []
+        with self.lock:
+            if self.total_bytes <= self.max_bytes:
+                return
+            remaining = self.total_bytes
+            for key, (size, _) in sorted(self.index.items(), key=lambda item: item[1][1]):
+                victims.append(key)
+                remaining -= size
+                if remaining <= self.max_bytes * 0.9:
+                    break
+        for key in victims:
+            self.remove(key)
+
+    def ttl_for(self, headers: Dict[str, str]) -> Optional[int]:
+        """TTL in seconds for a response, or None if it must not be cached
+
+        Only responses with an explicit lifetime (max-age, or Expires) are
+        cached; anything the server wants revalidated, or that varies on
+        request headers other than Accept-Encoding, is not.
+        """
+        cache_control = headers.get("cache-control", "").lower()
+        directives = {d.strip().split("=", 1)[0] for d in cache_control.split(",")}
+        if directives & {"no-store", "no-cache", "private", "must-revalidate", "proxy-revalidate"}:
+            return None
+
+        # Bodies are stored decoded, so only Accept-Encoding variants are interchangeable
+        vary = {v.strip().lower() for v in headers.get("vary", "").split(",") if v.strip()}
+        if vary - {"accept-encoding"}:
+            return None
+
+        match = re.search(r"(?:^|[,\s])max-age=(\d+)", cache_control)
+        if match:
+            ttl = int(match.group(1))
+            try:
+                ttl -= int(headers.get("age", "0"))
+            except ValueError:
+                pass
+        elif headers.get("expires"):
+            try:
+                expires = parsedate_to_datetime(headers["expires"]).timestamp()
+                date = parsedate_to_datetime(headers["date"]).timestamp() if headers.get("date") else time.time()
+            except (TypeError, ValueError):
+                # Invalid dates such as "0" mean already expired
+                return None
+            ttl = int(expires - date)
+        else:
+            return None
+
+        return min(ttl, self.max_ttl) if ttl > 0 else None
+
+    def take_stats(self) -> Dict[str, int]:
+        """Return the counters since the previous call and reset them"""
+        stats = dict(self.stats)
+        self.stats.clear()
+        return stats
+
+    def count(self, name: str, amount: int = 1):
+        self.stats[name] += amount
+        self.totals[name] += amount
+
+    async def handle_route(self, route):
+        """Playwright route handler: block, serve from cache, or fetch and store"""
+        request = route.request
+        resource_type = request.resource_type
+        try:
+            if resource_type in self.blocked_resource_types or (
+                self.block_trackers and self.TRACKER_URL_PATTERN.search(request.url)
+            ):
+                self.count("blocked")
+                await route.abort()
+                return
+
+            if request.method != "GET" or resource_type not in self.CACHEABLE_RESOURCE_TYPES:
+                await route.continue_()
+                return
+
+            cached = await asyncio.to_thread(self.read, request.url)
+            if cached is not None:
+                meta, body = cached
+                self.count("hits")
+                self.count("bytes_saved", len(body))
+                await route.fulfill(status=meta["status"], headers=meta["headers"], body=body)
+                return
+
+            self.count("misses")
+            response = await route.fetch()
+            body = await response.body()
+            ttl = self.ttl_for(response.headers) if response.status == 200 else None
+            if ttl:
+                await asyncio.to_thread(self.write, request.url, response.status, response.headers, body, ttl)
+            await route.fulfill(response=response, body=body)
+        except Exception as e:
+            print(f"Asset cache error for {request.url}: {e}")
+            try:
+                await route.continue_()
+            except Exception:
+                # The route was already handled or the page went away
+                pass
+
+#######################################################
+# Page Readiness Detection
+#######################################################
+
+class PageReadinessMonitor:
+    """Decides when a page has settled after an action.
+
+    A page is ready once its DOM has been quiet (no mutations) for a short window
+    and it has no in-flight requests that matter. Beacons, websockets, event
+    streams and requests that have been pending for a long time (long-polls) are
+    ignored. Each domain keeps a learned settle time that bounds how long we keep
+    waiting on the network, and every wait is capped by a strict upper bound.
+    """
+
+    IGNORED_RESOURCE_TYPES = {"websocket", "eventsource", "beacon", "ping", "manifest"}
+    IGNORED_URL_PATTERN = re.compile(
+        r"google-analytics|googletagmanager|doubleclick|/collect\b|beacon|analytics|"
+        r"hotjar|segment\.(io|com)|facebook\.com/tr|clarity\.ms|sentry|/socket\.io/|"
+        r"sockjs|long-?poll|/poll\b",
+        re.IGNORECASE
+    )
+
+    def __init__(self):
+        self.max_wait = float(os.getenv("BROWSER_READY_MAX_WAIT", "8"))
+        self.quiet_window = float(os.getenv("BROWSER_READY_QUIET_MS", "300")) / 1000
+        self.poll_interval = 0.1
+        self.long_request_threshold = 5.0
+        self.default_settle_time = 1.0
+        self.settle_times: Dict[str, float] = {}
+        self.inflight_requests: Dict[Any, tuple] = {}
+
+    def attach(self, context: BrowserContext):
+        """Start tracking requests for every page in the context"""
+        context.on("request", self.handle_request_started)
+        context.on("requestfinished", self.handle_request_done)
+        context.on("requestfailed", self.handle_request_done)
+
+    def handle_request_started(self, request):
+        if request.resource_type in self.IGNORED_RESOURCE_TYPES:
+            return
+        if self.IGNORED_URL_PATTERN.search(request.url):
+            return
+        try:
+            page = request.frame.page
+        except Exception:
+            # Service worker requests have no frame
+            return
+        self.inflight_requests[request] = (page, time.monotonic())
+
+    def handle_request_done(self, request):
+        self.inflight_requests.pop(request, None)
+
+    def forget_page(self, page: Page):
+        for request, (request_page, _) in list(self.inflight_requests.items()):
+            if request_page is page:
+                self.inflight_requests.pop(request, None)
+
+    def pending_requests(self, page: Page) -> int:
+        now = time.monotonic()
+        return sum(
+            1 for request_page, started in self.inflight_requests.values()
+            if request_page is page and now - started < self.long_request_threshold
+        )
+
+    def learned_settle_time(self, url: str) -> float:
+        return self.settle_times.get(urlparse(url).netloc, self.default_settle_time)
+
+    def record_settle_time(self, url: str, elapsed: float):
+        domain = urlparse(url).netloc
+        previous = self.settle_times.get(domain, elapsed)
+        self.settle_times[domain] = 0.7 * previous + 0.3 * elapsed
+
+    async def wait_until_ready(self, page: Page) -> float:
+        """Wait until the page is ready and return the seconds spent waiting"""
+        mutation_js = """
+        () => {
+            if (!window.__sunaMutationCounter) {
+                const counter = { count: 0 };
+                new MutationObserver((records) => { counter.count += records.length; })
+                    .observe(document.documentElement, { childList: true, subtree: true, attributes: true, characterData: true });
+                window.__sunaMutationCounter = counter;
+            }
+            return { count: window.__sunaMutationCounter.count, readyState: document.readyState };
+        }
+        """
+        start = time.monotonic()
+        deadline = start + self.max_wait
+        network_deadline = start + min(self.max_wait, max(1.0, self.learned_settle_time(page.url) * 2))
+        last_count = None
+        quiet_since = start
+        settled = False
+
+        while True:
+            now = time.monotonic()
+            try:
+                state = await page.evaluate(mutation_js)
+                if state['count'] != last_count or state['readyState'] == 'loading':
+                    last_count = state['count']
+                    quiet_since = now
+            except Exception:
+                # Execution context destroyed by a navigation, start over on the new document
+                last_count = None
+                quiet_since = now
+
+            dom_quiet = now - quiet_since >= self.quiet_window
+            network_quiet = now >= network_deadline or self.pending_requests(page) == 0
+            if dom_quiet and network_quiet:
+                settled = True
+                break
+            if now >= deadline:
+                break
+            await asyncio.sleep(min(self.poll_interval, max(0.0, deadline - now)))
+
+        elapsed = time.monotonic() - start
+        if settled:
+            self.record_settle_time(page.url, elapsed)
+        else:
+            print(f"Page not ready after {elapsed:.2f}s, proceeding anyway")
+        return elapsed
+
 #######################################################
-# Browser Automation Implementation 
+# Browser Automation Implementation
 #######################################################
 
 class BrowserAutomation:
@@ -290,6 +678,31 @@ class BrowserAutomation:
         self.screenshot_dir = os.path.join(os.getcwd(), "screenshots")
         os.makedirs(self.screenshot_dir, exist_ok=True)
         
+        # "incremental" keeps element indexes stable and only re-reports changed elements,
+        # "full" re-scans and re-indexes the whole page after every action
+        self.snapshot_mode = os.getenv("BROWSER_SNAPSHOT_MODE", "incremental")
+        self.snapshot_cache: Dict[Page, Dict[int, DOMElementNode]] = {}
+        self.readiness = PageReadinessMonitor()
+        
+        # OCR only runs when explicitly requested or when the page has too little DOM text
+        self.ocr_min_dom_text = int(os.getenv("BROWSER_OCR_MIN_DOM_TEXT", "200"))
+        self.ocr_workers = int(os.getenv("BROWSER_OCR_WORKERS", "1"))
+        self.ocr_executor: Optional[ProcessPoolExecutor] = None
+        self.ocr_cache: OrderedDict[str, str] = OrderedDict()
+        self.ocr_cache_size = 64
+        
+        # Background pages for batch visits live in their own context so they never
+        # show up as tabs or change the current page
+        self.batch_max_pages = int(os.getenv("BROWSER_BATCH_MAX_PAGES", "4"))
+        self.batch_per_domain_limit = int(os.getenv("BROWSER_BATCH_PER_DOMAIN", "2"))
+        self.batch_page_reuse_limit = int(os.getenv("BROWSER_BATCH_PAGE_REUSE", "10"))
+        self.batch_context: Optional[BrowserContext] = None
+        self.batch_pages: Optional[asyncio.Queue] = None
+        self.batch_page_uses: Dict[Page, int] = {}
+        self.batch_lock = asyncio.Lock()
+        
+        self.asset_cache = AssetCache() if os.getenv("BROWSER_ASSET_CACHE", "true").lower() == "true" else None
+        
         # Register routes
         self.router.on_startup.append(self.startup)
         self.router.on_shutdown.append(self.shutdown)
@@ -311,8 +724,12 @@ class BrowserAutomation:
         self.router.post("/automation/open_tab")(self.open_tab)
         self.router.post("/automation/close_tab")(self.close_tab)
         
+        # Batch browsing
+        self.router.post("/automation/batch_visit")(self.batch_visit)
+        
         # Content actions
         self.router.post("/automation/extract_content")(self.extract_content)
+        self.router.post("/automation/extract_ocr_text")(self.extract_ocr_text)
         self.router.post("/automation/save_pdf")(self.save_pdf)
         
         # Scroll actions
@@ -353,6 +770,10 @@ class BrowserAutomation:
                 self.browser_context = await self.browser.new_context(viewport={'width': 1024, 'height': 768})
                 print("Browser launched with minimal options")
 
+            if self.asset_cache:
+                await self.browser_context.route("**/*", self.asset_cache.handle_route)
+                print(f"Asset cache enabled at {self.asset_cache.cache_dir} ({len(self.asset_cache.index)} entries)")
+
             try:
                 await self.get_current_page()
                 print("Found existing page, using it")
@@ -368,6 +789,7 @@ class BrowserAutomation:
                 print("Navigated to google.com")
             
             try:
+                self.readiness.attach(self.browser_context)
                 self.browser_context.on("page", self.handle_page_created)
             except Exception as e:
                 print(f"Error setting up page event handler: {e}")
@@ -382,10 +804,20 @@ class BrowserAutomation:
             
     async def shutdown(self):
         """Clean up browser instance on shutdown"""
+        if self.asset_cache:
+            print(f"Asset cache totals for this run: {dict(self.asset_cache.totals)}")
+        if self.batch_context:
+            await self.batch_context.close()
+            self.batch_context = None
+            self.batch_pages = None
+            self.batch_page_uses.clear()
         if self.browser_context:
             await self.browser_context.close()
         if self.browser:
             await self.browser.close()
+        if self.ocr_executor:
+            self.ocr_executor.shutdown(wait=False, cancel_futures=True)
+            self.ocr_executor = None
 
     async def handle_page_created(self, page: Page):
         """Handle new page creation"""
@@ -399,7 +831,51 @@ class BrowserAutomation:
         if not self.pages:
             raise HTTPException(status_code=500, detail="No browser pages available")
         return self.pages[self.current_page_index]
-    
+
+    def create_element_node(self, el: Dict[str, Any], default_index: int) -> DOMElementNode:
+        """Build a DOMElementNode from an element description returned by the page scripts"""
+        # Create coordinate sets
+        page_coordinates = None
+        viewport_coordinates = None
+
+        if 'pageCoordinates' in el:
+            coords = el['pageCoordinates']
+            page_coordinates = CoordinateSet(
+                x=coords.get('x', 0),
+                y=coords.get('y', 0),
+                width=coords.get('width', 0),
+                height=coords.get('height', 0)
+            )
+
+        if 'viewportCoordinates' in el:
+            coords = el['viewportCoordinates']
+            viewport_coordinates = CoordinateSet(
+                x=coords.get('x', 0),
+                y=coords.get('y', 0),
+                width=coords.get('width', 0),
+                height=coords.get('height', 0)
+            )
+
+        # Create the element node
+        element_node = DOMElementNode(
+            is_visible=el.get('isVisible', True),
+            tag_name=el.get('tagName', 'div'),
+            attributes=el.get('attributes', {}),
+            is_interactive=el.get('isInteractive', True),
+            is_in_viewport=el.get('isInViewport', False),
+            highlight_index=el.get('index', default_index),
+            page_coordinates=page_coordinates,
+            viewport_coordinates=viewport_coordinates
+        )
+
+        # Add a text node if there's text content
+        if el.get('text'):
+            text_node = DOMTextNode(is_visible=True, text=el.get('text', ''))
+            text_node.parent = element_node
+            element_node.children.append(text_node)
+
+        return element_node
+
     async def get_selector_map(self) -> Dict[int, DOMElementNode]:
         """Get a map of selectable elements on the page"""
         page = await self.get_current_page()
@@ -482,47 +958,8 @@ class BrowserAutomation:
             
             # Create element nodes for each element
             for idx, el in enumerate(elements):
-                # Create coordinate sets
-                page_coordinates = None
-                viewport_coordinates = None
-                
-                if 'pageCoordinates' in el:
-                    coords = el['pageCoordinates']
-                    page_coordinates = CoordinateSet(
-                        x=coords.get('x', 0),
-                        y=coords.get('y', 0),
-                        width=coords.get('width', 0),
-                        height=coords.get('height', 0)
-                    )
-                
-                if 'viewportCoordinates' in el:
-                    coords = el['viewportCoordinates']
-                    viewport_coordinates = CoordinateSet(
-                        x=coords.get('x', 0),
-                        y=coords.get('y', 0),
-                        width=coords.get('width', 0),
-                        height=coords.get('height', 0)
-                    )
-                
-                # Create the element node
-                element_node = DOMElementNode(
-                    is_visible=el.get('isVisible', True),
-                    tag_name=el.get('tagName', 'div'),
-                    attributes=el.get('attributes', {}),
-                    is_interactive=el.get('isInteractive', True),
-                    is_in_viewport=el.get('isInViewport', False),
-                    highlight_index=el.get('index', idx + 1),
-                    page_coordinates=page_coordinates,
-                    viewport_coordinates=viewport_coordinates
-                )
-                
-                # Add a text node if there's text content
-                if el.get('text'):
-                    text_node = DOMTextNode(is_visible=True, text=el.get('text', ''))
-                    text_node.parent = element_node
-                    element_node.children.append(text_node)
-                
-                selector_map[el.get('index', idx + 1)] = element_node
+                element_node = self.create_element_node(el, idx + 1)
+                selector_map[element_node.highlight_index] = element_node
                 root.children.append(element_node)
                 element_node.parent = root
                 
@@ -543,12 +980,343 @@ class BrowserAutomation:
             selector_map[1] = dummy
         
         return selector_map
-    
+
+    async def get_incremental_selector_map(self, page: Page) -> Optional[Dict[str, Any]]:
+        """Get the selector map using the MutationObserver-backed element tracker.
+
+        The tracker lives in the page and assigns each interactive element a stable
+        index for the lifetime of the document. After the first (full) snapshot only
+        added subtrees, mutated elements and viewport membership are re-examined, and
+        the Python-side node cache for the page is patched instead of rebuilt.
+
+        Returns None if the tracker cannot be used, so the caller can fall back to a
+        full snapshot.
+        """
+        snapshot_js = """
+        (forceFull) => {
+            const SELECTOR = 'a, button, input, select, textarea, [role="button"], [role="link"], [role="checkbox"], [role="radio"], [tabindex]:not([tabindex="-1"])';
+            const VISIBILITY_ATTRIBUTES = ['style', 'class', 'hidden'];
+
+            function getAttributes(el) {
+                const attributes = {};
+                for (const attr of el.attributes) {
+                    attributes[attr.name] = attr.value;
+                }
+                return attributes;
+            }
+
+            function isVisible(el) {
+                const rect = el.getBoundingClientRect();
+                if (rect.width <= 0 || rect.height <= 0) {
+                    return false;
+                }
+                const style = window.getComputedStyle(el);
+                return style.display !== 'none' &&
+                       style.visibility !== 'hidden' &&
+                       style.opacity !== '0';
+            }
+
+            function isInViewport(rect) {
+                return rect.top >= 0 &&
+                       rect.left >= 0 &&
+                       rect.bottom <= window.innerHeight &&
+                       rect.right <= window.innerWidth;
+            }
+
+            function describe(el, index) {
+                const rect = el.getBoundingClientRect();
+                return {
+                    index: index,
+                    tagName: el.tagName.toLowerCase(),
+                    text: el.innerText || el.value || '',
+                    attributes: getAttributes(el),
+                    isVisible: true,
+                    isInteractive: true,
+                    pageCoordinates: {
+                        x: rect.left + window.scrollX,
+                        y: rect.top + window.scrollY,
+                        width: rect.width,
+                        height: rect.height
+                    },
+                    viewportCoordinates: {
+                        x: rect.left,
+                        y: rect.top,
+                        width: rect.width,
+                        height: rect.height
+                    },
+                    isInViewport: isInViewport(rect)
+                };
+            }
+
+            let tracker = window.__sunaDomTracker;
+            let fresh = false;
+            if (!tracker) {
+                fresh = true;
+                tracker = {
+                    nextIndex: 1,
+                    indexOf: new WeakMap(),
+                    byIndex: new Map(),
+                    dirty: new Set(),
+                    addedRoots: new Set(),
+                    rescan: true
+                };
+
+                const markDirty = (node) => {
+                    const el = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+                    if (!el) {
+                        return;
+                    }
+                    const owner = el.closest(SELECTOR);
+                    if (owner && tracker.indexOf.has(owner)) {
+                        tracker.dirty.add(tracker.indexOf.get(owner));
+                    }
+                };
+
+                tracker.observer = new MutationObserver((records) => {
+                    for (const record of records) {
+                        if (record.type === 'childList') {
+                            for (const node of record.addedNodes) {
+                                if (node.nodeType === Node.ELEMENT_NODE) {
+                                    tracker.addedRoots.add(node);
+                                }
+                            }
+                            markDirty(record.target);
+                        } else if (record.type === 'attributes' &&
+                                   VISIBILITY_ATTRIBUTES.includes(record.attributeName) &&
+                                   !tracker.indexOf.has(record.target)) {
+                            // Visibility of a container changed, re-examine its subtree
+                            tracker.addedRoots.add(record.target);
+                        } else {
+                            markDirty(record.target);
+                        }
+                    }
+                    // Past this point a full rescan is cheaper than walking each root
+                    if (tracker.addedRoots.size > 500) {
+                        tracker.rescan = true;
+                        tracker.addedRoots.clear();
+                    }
+                });
+                tracker.observer.observe(document.documentElement, {
+                    childList: true,
+                    subtree: true,
+                    attributes: true,
+                    characterData: true
+                });
+                window.__sunaDomTracker = tracker;
+            }
+
+            const changed = new Set();
+            const removed = [];
+
+            function track(el) {
+                let index = tracker.indexOf.get(el);
+                if (index === undefined) {
+                    index = tracker.nextIndex++;
+                    tracker.indexOf.set(el, index);
+                }
+                if (!tracker.byIndex.has(index)) {
+                    tracker.byIndex.set(index, el);
+                    changed.add(index);
+                }
+                return index;
+            }
+
+            function untrack(index) {
+                if (tracker.byIndex.delete(index)) {
+                    removed.push(index);
+                }
+            }
+
+            function visit(el) {
+                if (isVisible(el)) {
+                    track(el);
+                } else if (tracker.indexOf.has(el)) {
+                    untrack(tracker.indexOf.get(el));
+                }
+            }
+
+            const full = Boolean(forceFull) || tracker.rescan;
+            if (full) {
+                const visible = new Set();
+                for (const el of document.querySelectorAll(SELECTOR)) {
+                    if (isVisible(el)) {
+                        visible.add(track(el));
+                    }
+                }
+                for (const index of Array.from(tracker.byIndex.keys())) {
+                    if (!visible.has(index)) {
+                        untrack(index);
+                    }
+                }
+            } else {
+                for (const root of tracker.addedRoots) {
+                    if (!root.isConnected) {
+                        continue;
+                    }
+                    if (root.matches(SELECTOR)) {
+                        visit(root);
+                    }
+                    for (const el of root.querySelectorAll(SELECTOR)) {
+                        visit(el);
+                    }
+                }
+                for (const [index, el] of Array.from(tracker.byIndex)) {
+                    if (!el.isConnected) {
+                        untrack(index);
+                    }
+                }
+                for (const index of tracker.dirty) {
+                    const el = tracker.byIndex.get(index);
+                    if (!el) {
+                        continue;
+                    }
+                    if (isVisible(el)) {
+                        changed.add(index);
+                    } else {
+                        untrack(index);
+                    }
+                }
+            }
+            tracker.addedRoots.clear();
+            tracker.dirty.clear();
+            tracker.rescan = false;
+
+            const viewport = [];
+            for (const [index, el] of tracker.byIndex) {
+                if (isInViewport(el.getBoundingClientRect())) {
+                    viewport.push(index);
+                }
+            }
+
+            const wanted = full ? Array.from(tracker.byIndex.keys()) : Array.from(new Set([...changed, ...viewport]));
+            return {
+                full: full,
+                fresh: fresh,
+                elements: wanted.map(index => describe(tracker.byIndex.get(index), index)),
+                changed: Array.from(changed),
+                removed: removed,
+                viewport: viewport
+            };
+        }
+        """
+
+        try:
+            cached = self.snapshot_cache.get(page)
+            snapshot = await page.evaluate(snapshot_js, cached is None)
+
+            if snapshot['full'] or cached is None:
+                cached = {}
+                self.snapshot_cache[page] = cached
+
+            for index in snapshot['removed']:
+                cached.pop(index, None)
+
+            for el in snapshot['elements']:
+                element_node = self.create_element_node(el, el['index'])
+                cached[element_node.highlight_index] = element_node
+
+            viewport = set(snapshot['viewport'])
+            for index, element_node in cached.items():
+                element_node.is_in_viewport = index in viewport
+
+            print(f"Incremental snapshot: {len(cached)} elements, {len(snapshot['changed'])} changed, "
+                  f"{len(snapshot['removed'])} removed, full={snapshot['full']}")
+
+            return {
+                'selector_map': dict(cached),
+                'snapshot_type': "full" if snapshot['full'] else "incremental",
+                'changed_indexes': sorted(snapshot['changed']),
+                'removed_indexes': sorted(snapshot['removed']),
+                'viewport_indexes': sorted(viewport)
+            }
+        except Exception as e:
+            print(f"Incremental snapshot failed, falling back to full snapshot: {e}")
+            self.snapshot_cache.pop(page, None)
+            return None
+
+    async def get_element_handle(self, page: Page, index: int):
+        """Resolve a highlight index to a live element handle"""
+        # Incremental snapshots hand out stable indexes, look them up in the page tracker first
+        if self.snapshot_mode == "incremental":
+            try:
+                tracked_handle = await page.evaluate_handle(
+                    "(index) => (window.__sunaDomTracker && window.__sunaDomTracker.byIndex.get(index)) || null",
+                    index
+                )
+                if await tracked_handle.evaluate("node => node !== null"):
+                    return tracked_handle
+            except Exception as e:
+                print(f"Error resolving tracked element {index}: {e}")
+        
+        # Construct a more reliable selector using JavaScript evaluation
+        # Find the element based on its properties captured in selector_map
+        js_selector_script = """
+        (targetElementInfo) => {
+            const interactiveElements = Array.from(document.querySelectorAll(
+                'a, button, input, select, textarea, [role="button"], [role="link"], [role="checkbox"], [role="radio"], [tabindex]:not([tabindex="-1"])'
+            ));
+            
+            const visibleElements = interactiveElements.filter(el => {
+                const style = window.getComputedStyle(el);
+                const rect = el.getBoundingClientRect();
+                return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0' && rect.width > 0 && rect.height > 0;
+            });
+
+            if (targetElementInfo.index > 0 && targetElementInfo.index <= visibleElements.length) {
+                // Return the element at the specified index (1-based)
+                return visibleElements[targetElementInfo.index - 1];
+            }
+            return null; // Element not found at the expected index
+        }
+        """
+        
+        element_info = {'index': index} # Pass the target index to the script
+        return await page.evaluate_handle(js_selector_script, element_info)
+
+    async def get_known_selector_map(self, page: Page) -> Dict[int, DOMElementNode]:
+        """Selector map of the state last reported for a page, without taking a new snapshot
+
+        An incremental snapshot consumes the tracker's pending changes, so actions
+        resolve indexes from the page's node cache and leave snapshots to state
+        reporting. Without a cache (full mode, or no state reported yet) the full
+        selector map is built, which does not touch the tracker.
+        """
+        if self.snapshot_mode == "incremental":
+            cached = self.snapshot_cache.get(page)
+            if cached is not None:
+                return cached
+        return await self.get_selector_map()
+
+    async def resolve_element(self, page: Page, index: int):
+        """Return (element_node, handle) for an index of the last reported state, or (None, None)
+
+        Uses the same selector map and tracker lookup as click_element, so
+        stable incremental indexes resolve to the element the agent saw.
+        """
+        selector_map = await self.get_known_selector_map(page)
+        if index not in selector_map:
+            return None, None
+        
+        handle = await self.get_element_handle(page, index)
+        if not await handle.evaluate("node => node !== null"):
+            return selector_map[index], None
+        return selector_map[index], handle
+
     async def get_current_dom_state(self) -> DOMState:
         """Get the current DOM state including element tree and selector map"""
         try:
             page = await self.get_current_page()
-            selector_map = await self.get_selector_map()
+            
+            snapshot = None
+            if self.snapshot_mode == "incremental":
+                snapshot = await self.get_incremental_selector_map(page)
+            
+            if snapshot is None:
+                snapshot = {
+                    'selector_map': await self.get_selector_map(),
+                    'snapshot_type': "full"
+                }
+            selector_map = snapshot['selector_map']
             
             # Create a root element
             root = DOMElementNode(
@@ -559,10 +1327,10 @@ class BrowserAutomation:
             )
             
             # Add all elements from selector map as children of root
-            for element in selector_map.values():
-                if element.parent is None:
-                    element.parent = root
-                    root.children.append(element)
+            for index in sorted(selector_map):
+                element = selector_map[index]
+                element.parent = root
+                root.children.append(element)
             
             # Get basic page info
             url = page.url
@@ -605,7 +1373,11 @@ class BrowserAutomation:
                 url=url,
                 title=title,
                 pixels_above=pixels_above,
-                pixels_below=pixels_below
+                pixels_below=pixels_below,
+                snapshot_type=snapshot['snapshot_type'],
+                changed_indexes=snapshot.get('changed_indexes', []),
+                removed_indexes=snapshot.get('removed_indexes', []),
+                viewport_indexes=snapshot.get('viewport_indexes', [])
             )
         except Exception as e:
             print(f"Error getting DOM state: {e}")
@@ -638,15 +1410,7 @@ class BrowserAutomation:
         try:
             page = await self.get_current_page()
             
-            # Wait for network to be idle and DOM to be stable
-            try:
-                await page.wait_for_load_state("networkidle", timeout=60000)  # Increased timeout to 60s
-            except Exception as e:
-                print(f"Warning: Network idle timeout, proceeding anyway: {e}")
-            
-            # Wait for any animations to complete
-            # await page.wait_for_timeout(1000)  # Wait 1 second for animations
-            
+            # Readiness is handled by the caller (see PageReadinessMonitor)
             # Take screenshot with increased timeout and better options
             screenshot_bytes = await page.screenshot(
                 type='jpeg',
@@ -679,20 +1443,32 @@ class BrowserAutomation:
             return ""
     
     async def extract_ocr_text_from_screenshot(self, screenshot_base64: str) -> str:
-        """Extract text from screenshot using OCR"""
+        """Extract text from screenshot using OCR
+        
+        Tesseract runs in a process pool so it does not block the event loop, and
+        results are cached by screenshot hash.
+        """
         if not screenshot_base64:
             return ""
             
         try:
             # Decode base64 to image
             image_bytes = base64.b64decode(screenshot_base64)
-            image = Image.open(io.BytesIO(image_bytes))
+            cache_key = hashlib.sha256(image_bytes).hexdigest()
+            
+            if cache_key in self.ocr_cache:
+                self.ocr_cache.move_to_end(cache_key)
+                return self.ocr_cache[cache_key]
+            
+            if self.ocr_executor is None:
+                self.ocr_executor = ProcessPoolExecutor(max_workers=self.ocr_workers)
             
-            # Extract text using pytesseract
-            ocr_text = pytesseract.image_to_string(image)
+            loop = asyncio.get_running_loop()
+            ocr_text = await loop.run_in_executor(self.ocr_executor, run_ocr, image_bytes)
             
-            # Clean up the text
-            ocr_text = ocr_text.strip()
+            self.ocr_cache[cache_key] = ocr_text
+            while len(self.ocr_cache) > self.ocr_cache_size:
+                self.ocr_cache.popitem(last=False)
             
             return ocr_text
         except Exception as e:
@@ -705,28 +1481,39 @@ class BrowserAutomation:
         Returns a tuple of (dom_state, screenshot, elements, metadata)
         """
         try:
-            # Wait a moment for any potential async processes to settle
-            await asyncio.sleep(0.5)
+            # Wait for the DOM and relevant network activity to settle
+            page = await self.get_current_page()
+            wait_time = await self.readiness.wait_until_ready(page)
             
             # Get updated state
             dom_state = await self.get_current_dom_state()
             screenshot = await self.take_screenshot()
             
             # Format elements for output
-            elements = dom_state.element_tree.clickable_elements_to_string(
-                include_attributes=self.include_attributes
-            )
+            if dom_state.snapshot_type == "incremental":
+                elements = self.format_incremental_elements(dom_state)
+                reported_indexes = sorted(set(dom_state.changed_indexes) | set(dom_state.viewport_indexes))
+            else:
+                elements = dom_state.element_tree.clickable_elements_to_string(
+                    include_attributes=self.include_attributes
+                )
+                reported_indexes = sorted(dom_state.selector_map)
             
             # Collect additional metadata
-            page = await self.get_current_page()
             metadata = {}
+            metadata['wait_time_ms'] = int(wait_time * 1000)
+            if self.asset_cache:
+                metadata['cache_stats'] = self.asset_cache.take_stats()
             
             # Get element count
             metadata['element_count'] = len(dom_state.selector_map)
             
             # Create simplified interactive elements list
             interactive_elements = []
-            for idx, element in dom_state.selector_map.items():
+            for idx in reported_indexes:
+                element = dom_state.selector_map.get(idx)
+                if element is None:
+                    continue
                 element_info = {
                     'index': idx,
                     'tag_name': element.tag_name,
@@ -742,6 +1529,8 @@ class BrowserAutomation:
                 interactive_elements.append(element_info)
             
             metadata['interactive_elements'] = interactive_elements
+            metadata['snapshot_type'] = dom_state.snapshot_type
+            metadata['removed_element_indexes'] = dom_state.removed_indexes
             
             # Get viewport dimensions - Fix syntax error in JavaScript
             try:
@@ -760,11 +1549,17 @@ class BrowserAutomation:
                 metadata['viewport_width'] = 0
                 metadata['viewport_height'] = 0
             
-            # Extract OCR text from screenshot if available
-            ocr_text = ""
+            # Fall back to OCR only when the DOM exposes too little text (canvas, images, PDFs)
             if screenshot:
-                ocr_text = await self.extract_ocr_text_from_screenshot(screenshot)
-                metadata['ocr_text'] = ocr_text
+                try:
+                    dom_text_length = await page.evaluate(
+                        "() => ((document.body && document.body.innerText) || '').trim().length"
+                    )
+                except Exception as e:
+                    print(f"Error measuring DOM text: {e}")
+                    dom_text_length = 0
+                if dom_text_length < self.ocr_min_dom_text:
+                    metadata['ocr_text'] = await self.extract_ocr_text_from_screenshot(screenshot)
             
             print(f"Got updated state after {action_name}: {len(dom_state.selector_map)} elements")
             return dom_state, screenshot, elements, metadata
@@ -774,6 +1569,31 @@ class BrowserAutomation:
             # Return empty values in case of error
             return None, "", "", {}
 
+    def format_incremental_elements(self, dom_state: DOMState) -> str:
+        """Format an incremental snapshot as changed elements plus a viewport summary"""
+        def render(indexes: List[int]) -> str:
+            root = DOMElementNode(is_visible=True, tag_name="body", is_top_element=True)
+            root.children = [dom_state.selector_map[i] for i in indexes if i in dom_state.selector_map]
+            return root.clickable_elements_to_string(include_attributes=self.include_attributes)
+        
+        sections = []
+        if dom_state.changed_indexes:
+            sections.append("Changed or new elements:\n" + render(dom_state.changed_indexes))
+        else:
+            sections.append("No element changes since the last action")
+        
+        if dom_state.removed_indexes:
+            sections.append(f"Removed elements: {', '.join(str(i) for i in dom_state.removed_indexes)}")
+        
+        sections.append("Elements in viewport:\n" + render(dom_state.viewport_indexes))
+        
+        reported = set(dom_state.changed_indexes) | set(dom_state.viewport_indexes)
+        unchanged = len(set(dom_state.selector_map) - reported)
+        if unchanged:
+            sections.append(f"{unchanged} other elements are unchanged and outside the viewport; their indexes remain valid")
+        
+        return '\n\n'.join(sections)
+
     def build_action_result(self, success: bool, message: str, dom_state, screenshot: str, 
                               elements: str, metadata: dict, error: str = "", content: str = None,
                               fallback_url: str = None) -> BrowserActionResult:
@@ -797,7 +1617,11 @@ class BrowserAutomation:
             element_count=metadata.get('element_count', 0),
             interactive_elements=metadata.get('interactive_elements', []),
             viewport_width=metadata.get('viewport_width', 0),
-            viewport_height=metadata.get('viewport_height', 0)
+            viewport_height=metadata.get('viewport_height', 0),
+            snapshot_type=metadata.get('snapshot_type'),
+            removed_element_indexes=metadata.get('removed_element_indexes'),
+            wait_time_ms=metadata.get('wait_time_ms', 0),
+            cache_stats=metadata.get('cache_stats')
         )
 
     # Basic Navigation Actions
@@ -807,7 +1631,6 @@ class BrowserAutomation:
         try:
             page = await self.get_current_page()
             await page.goto(action.url, wait_until="domcontentloaded")
-            await page.wait_for_load_state("networkidle", timeout=10000)
             
             # Get updated state after action
             dom_state, screenshot, elements, metadata = await self.get_updated_browser_state(f"navigate_to({action.url})")
@@ -974,11 +1797,7 @@ class BrowserAutomation:
             # Perform the click at the specified coordinates
             await page.mouse.click(action.x, action.y)
             
-            # Give time for any navigation or DOM updates to occur
-            await page.wait_for_load_state("networkidle", timeout=5000)
-            
-            await asyncio.sleep(1)
-            # Get updated state after action
+            # Get updated state after action (waits for navigation or DOM updates to settle)
             dom_state, screenshot, elements, metadata = await self.get_updated_browser_state(f"click_coordinates({action.x}, {action.y})")
             
             return self.build_action_result(
@@ -997,7 +1816,6 @@ class BrowserAutomation:
             
             # Try to get state even after error
             try:
-                await asyncio.sleep(1)
                 dom_state, screenshot, elements, metadata = await self.get_updated_browser_state("click_coordinates_error_recovery")
                 return self.build_action_result(
                     False,
@@ -1026,9 +1844,8 @@ class BrowserAutomation:
         try:
             page = await self.get_current_page()
             
-            # Get the current state and selector map *before* the click
-            initial_dom_state = await self.get_current_dom_state()
-            selector_map = initial_dom_state.selector_map
+            # Resolve the index against the state the agent was shown *before* the click
+            selector_map = await self.get_known_selector_map(page)
             
             if action.index not in selector_map:
                 # Get updated state even if element not found initially
@@ -1046,31 +1863,7 @@ class BrowserAutomation:
             element_to_click = selector_map[action.index]
             print(f"Attempting to click element: {element_to_click}")
 
-            # Construct a more reliable selector using JavaScript evaluation
-            # Find the element based on its properties captured in selector_map
-            js_selector_script = """
-            (targetElementInfo) => {
-                const interactiveElements = Array.from(document.querySelectorAll(
-                    'a, button, input, select, textarea, [role="button"], [role="link"], [role="checkbox"], [role="radio"], [tabindex]:not([tabindex="-1"])'
-                ));
-                
-                const visibleElements = interactiveElements.filter(el => {
-                    const style = window.getComputedStyle(el);
-                    const rect = el.getBoundingClientRect();
-                    return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0' && rect.width > 0 && rect.height > 0;
-                });
-
-                if (targetElementInfo.index > 0 && targetElementInfo.index <= visibleElements.length) {
-                    // Return the element at the specified index (1-based)
-                    return visibleElements[targetElementInfo.index - 1];
-                }
-                return null; // Element not found at the expected index
-            }
-            """
-            
-            element_info = {'index': action.index} # Pass the target index to the script
-            
-            target_element_handle = await page.evaluate_handle(js_selector_script, element_info)
+            target_element_handle = await self.get_element_handle(page, action.index)
 
             click_success = False
             error_message = ""
@@ -1092,14 +1885,7 @@ class BrowserAutomation:
                  print(error_message)
 
 
-            # Wait for potential page changes/network activity
-            try:
-                await page.wait_for_load_state("networkidle", timeout=5000)
-            except Exception as wait_error:
-                print(f"Timeout or error waiting for network idle after click: {wait_error}")
-            await asyncio.sleep(1)
-
-            # Get updated state after action
+            # Get updated state after action (waits for page changes/network activity to settle)
             dom_state, screenshot, elements, metadata = await self.get_updated_browser_state(f"click_element({action.index})")
 
             return self.build_action_result(
@@ -1152,9 +1938,9 @@ class BrowserAutomation:
         """Input text into an element"""
         try:
             page = await self.get_current_page()
-            selector_map = await self.get_selector_map()
+            element, handle = await self.resolve_element(page, action.index)
             
-            if action.index not in selector_map:
+            if handle is None:
                 return self.build_action_result(
                     False,
                     f"Element with index {action.index} not found",
@@ -1165,24 +1951,9 @@ class BrowserAutomation:
                     error=f"Element with index {action.index} not found"
                 )
             
-            # In a real implementation, we would use the selector map to get the element's
-            # properties and use them to find and type into the element
-            element = selector_map[action.index]
-            
-            # Use CSS selector or XPath to locate and type into the element
             await page.wait_for_timeout(500)  # Small delay before typing
+            await handle.fill(action.text, timeout=5000)
             
-            # Demo implementation - would use proper selectors in production
-            if element.attributes.get("id"):
-                await page.fill(f"#{element.attributes['id']}", action.text)
-            elif element.attributes.get("class"):
-                class_selector = f".{element.attributes['class'].replace(' ', '.')}"
-                await page.fill(class_selector, action.text)
-            else:
-                # Fallback to xpath
-                await page.fill(f"//{element.tag_name}[{action.index}]", action.text)
-            
-            await asyncio.sleep(1)
             # Get updated state after action
             dom_state, screenshot, elements, metadata = await self.get_updated_browser_state(f"input_text({action.index}, '{action.text}')")
             
@@ -1214,7 +1985,6 @@ class BrowserAutomation:
             page = await self.get_current_page()
             await page.keyboard.press(action.keys)
             
-            await asyncio.sleep(1)
             # Get updated state after action
             dom_state, screenshot, elements, metadata = await self.get_updated_browser_state(f"send_keys({action.keys})")
             
@@ -1295,7 +2065,6 @@ class BrowserAutomation:
             
             # Navigate to the URL
             await new_page.goto(action.url, wait_until="domcontentloaded")
-            await new_page.wait_for_load_state("networkidle", timeout=10000)
             print(f"Navigated to URL in new tab: {action.url}")
             
             # Add to page list and make it current
@@ -1340,6 +2109,8 @@ class BrowserAutomation:
                 url = page.url
                 await page.close()
                 self.pages.pop(action.page_id)
+                self.snapshot_cache.pop(page, None)
+                self.readiness.forget_page(page)
                 
                 # Adjust current index if needed
                 if self.current_page_index >= len(self.pages):
@@ -1383,6 +2154,100 @@ class BrowserAutomation:
                 content=None
             )
     
+    # Batch Browsing
+    
+    async def get_batch_page_pool(self) -> asyncio.Queue:
+        """Get the pool of background page slots, creating the batch context on first use"""
+        async with self.batch_lock:
+            if self.batch_pages is None:
+                self.batch_context = await self.browser.new_context(viewport={'width': 1024, 'height': 768})
+                self.readiness.attach(self.batch_context)
+                if self.asset_cache:
+                    await self.batch_context.route("**/*", self.asset_cache.handle_route)
+                self.batch_pages = asyncio.Queue()
+                # Empty slots are filled with a page on first use
+                for _ in range(self.batch_max_pages):
+                    self.batch_pages.put_nowait(None)
+            return self.batch_pages
+    
+    async def release_batch_page(self, pool: asyncio.Queue, page: Optional[Page]):
+        """Return a page to the pool, recycling it once it has been reused enough"""
+        if page is None or page.is_closed():
+            pool.put_nowait(None)
+            return
+        
+        uses = self.batch_page_uses.get(page, 0) + 1
+        try:
+            if uses >= self.batch_page_reuse_limit:
+                self.batch_page_uses.pop(page, None)
+                self.readiness.forget_page(page)
+                await page.close()
+                pool.put_nowait(None)
+                return
+            self.batch_page_uses[page] = uses
+            # Drop the previous document so idle pages do not hold on to memory
+            await page.goto("about:blank")
+            pool.put_nowait(page)
+        except Exception as e:
+            print(f"Error recycling batch page: {e}")
+            self.batch_page_uses.pop(page, None)
+            pool.put_nowait(None)
+    
+    async def visit_batch_url(self, url: str, action: BatchVisitAction, pool: asyncio.Queue,
+                              domain_limits: Dict[str, asyncio.Semaphore]) -> BatchPageResult:
+        """Visit a single URL of a batch on a pooled background page"""
+        async with domain_limits[urlparse(url).netloc]:
+            page = await pool.get()
+            try:
+                if page is None or page.is_closed():
+                    page = await self.batch_context.new_page()
+                
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                wait_time = await self.readiness.wait_until_ready(page)
+                
+                result = BatchPageResult(
+                    url=url,
+                    final_url=page.url,
+                    title=await page.title(),
+                    wait_time_ms=int(wait_time * 1000)
+                )
+                if action.include_text:
+                    text = await page.evaluate("() => ((document.body && document.body.innerText) || '').trim()")
+                    result.content = text[:action.max_text_length]
+                if action.include_screenshot:
+                    screenshot_bytes = await page.screenshot(type='jpeg', quality=60, full_page=False)
+                    result.screenshot_base64 = base64.b64encode(screenshot_bytes).decode('utf-8')
+                return result
+            except Exception as e:
+                print(f"Error visiting {url} in batch: {e}")
+                return BatchPageResult(url=url, success=False, error=str(e))
+            finally:
+                await self.release_batch_page(pool, page)
+    
+    async def batch_visit(self, action: BatchVisitAction = Body(...)):
+        """Visit a batch of URLs concurrently and return their content keyed by URL"""
+        try:
+            pool = await self.get_batch_page_pool()
+            per_domain_limit = action.per_domain_limit or self.batch_per_domain_limit
+            domain_limits = defaultdict(lambda: asyncio.Semaphore(per_domain_limit))
+            
+            urls = list(dict.fromkeys(action.urls))
+            results = await asyncio.gather(*(
+                self.visit_batch_url(url, action, pool, domain_limits) for url in urls
+            ))
+            
+            succeeded = sum(1 for result in results if result.success)
+            print(f"Batch visit completed: {succeeded}/{len(urls)} URLs succeeded")
+            return BatchVisitResult(
+                success=succeeded > 0 or not urls,
+                message=f"Visited {succeeded} of {len(urls)} URLs",
+                results={result.url: result for result in results}
+            )
+        except Exception as e:
+            print(f"Batch visit error: {e}")
+            traceback.print_exc()
+            return BatchVisitResult(success=False, message=str(e), error=str(e))
+    
     # Content Actions
     
     async def extract_content(self, goal: str = Body(...)):
@@ -1432,6 +2297,37 @@ class BrowserAutomation:
                 content=None
             )
     
+    async def extract_ocr_text(self, _: NoParamsAction = Body(...)):
+        """Extract text from the current viewport using OCR"""
+        try:
+            dom_state, screenshot, elements, metadata = await self.get_updated_browser_state("extract_ocr_text")
+            
+            # get_updated_browser_state only runs OCR for text-poor pages
+            if 'ocr_text' not in metadata:
+                metadata['ocr_text'] = await self.extract_ocr_text_from_screenshot(screenshot)
+            
+            return self.build_action_result(
+                True,
+                "Extracted text from screenshot using OCR",
+                dom_state,
+                screenshot,
+                elements,
+                metadata,
+                error="",
+                content=metadata['ocr_text']
+            )
+        except Exception as e:
+            return self.build_action_result(
+                False,
+                str(e),
+                None,
+                "",
+                "",
+                {},
+                error=str(e),
+                content=None
+            )
+    
     async def save_pdf(self):
         """Save the current page as a PDF"""
         try:
@@ -1481,8 +2377,6 @@ class BrowserAutomation:
                 await page.evaluate("window.scrollBy(0, window.innerHeight);")
                 amount_str = "one page"
             
-            await page.wait_for_timeout(500)  # Wait for scroll to complete
-            
             # Get updated state after action
             dom_state, screenshot, elements, metadata = await self.get_updated_browser_state(f"scroll_down({amount_str})")
             
@@ -1519,8 +2413,6 @@ class BrowserAutomation:
                 await page.evaluate("window.scrollBy(0, -window.innerHeight);")
                 amount_str = "one page"
             
-            await page.wait_for_timeout(500)  # Wait for scroll to complete
-            
             # Get updated state after action
             dom_state, screenshot, elements, metadata = await self.get_updated_browser_state(f"scroll_up({amount_str})")
             
@@ -1600,9 +2492,9 @@ class BrowserAutomation:
         """Get all options from a dropdown"""
         try:
             page = await self.get_current_page()
-            selector_map = await self.get_selector_map()
+            element, handle = await self.resolve_element(page, index)
             
-            if index not in selector_map:
+            if handle is None:
                 return self.build_action_result(
                     False,
                     f"Element with index {index} not found",
@@ -1613,26 +2505,24 @@ class BrowserAutomation:
                     error=f"Element with index {index} not found"
                 )
             
-            element = selector_map[index]
             options = []
             
             # Try to get the options - in a real implementation, we would use appropriate selectors
             try:
                 if element.tag_name.lower() == 'select':
                     # For <select> elements, get options using JavaScript
-                    options_js = f"""
-                    Array.from(document.querySelectorAll('select')[{index-1}].options)
+                    options = await handle.evaluate("""
+                    select => Array.from(select.options)
                         .map((option, index) => ({
                             index: index,
                             text: option.text,
                             value: option.value
-                        }));
-                    """
-                    options = await page.evaluate(options_js)
+                        }))
+                    """)
                 else:
                     # For other dropdown types, try to get options using a more generic approach
                     # Example for custom dropdowns - would need refinement in real implementation
-                    await page.click(f"#{element.attributes.get('id')}") if element.attributes.get('id') else None
+                    await handle.click(timeout=5000)
                     await page.wait_for_timeout(500)
                     
                     options_js = """
@@ -1689,9 +2579,9 @@ class BrowserAutomation:
         """Select an option from a dropdown by text"""
         try:
             page = await self.get_current_page()
-            selector_map = await self.get_selector_map()
+            element, handle = await self.resolve_element(page, index)
             
-            if index not in selector_map:
+            if handle is None:
                 return self.build_action_result(
                     False,
                     f"Element with index {index} not found",
@@ -1702,23 +2592,14 @@ class BrowserAutomation:
                     error=f"Element with index {index} not found"
                 )
             
-            element = selector_map[index]
-            
             # Try to select the option - implementation varies by dropdown type
             if element.tag_name.lower() == 'select':
                 # For standard <select> elements
-                selector = f"select option:has-text('{option_text}')"
-                await page.select_option(
-                    f"#{element.attributes.get('id')}" if element.attributes.get('id') else f"//select[{index}]", 
-                    label=option_text
-                )
+                await handle.select_option(label=option_text, timeout=5000)
             else:
                 # For custom dropdowns
                 # First click to open the dropdown
-                if element.attributes.get('id'):
-                    await page.click(f"#{element.attributes.get('id')}")
-                else:
-                    await page.click(f"//{element.tag_name}[{index}]")
+                await handle.click(timeout=5000)
                 
                 await page.wait_for_timeout(500)
                 
@@ -0,0 +1,5 @@
+-- Private bucket for images prepared by the see_image tool.
+-- Objects are only handed out as short-lived signed URLs.
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('vision-assets', 'vision-assets', false)
+ON CONFLICT (id) DO NOTHING; -- Avoid error if bucket already exists
@@ -48,4 +48,59 @@ async def upload_base64_image(base64_data: str, bucket_name: str = "browser-scre
         
     except Exception as e:
         logger.error(f"Error uploading base64 image: {e}")
-        raise RuntimeError(f"Failed to upload image: {str(e)}") 
\ No newline at end of file
+        raise RuntimeError(f"Failed to upload image: {str(e)}")
+
+async def upload_image_bytes(image_data: bytes, filename: str, content_type: str = "image/png", bucket_name: str = "vision-assets") -> str:
+    """Upload raw image bytes under a caller-chosen name and return the object name.
+    
+    Existing objects are overwritten, so content-addressed filenames can be uploaded idempotently.
+    The bucket is expected to be private: callers hand the image out with create_signed_image_url.
+    
+    Args:
+        image_data (bytes): Encoded image data
+        filename (str): Object name within the bucket
+        content_type (str): MIME type of the image
+        bucket_name (str): Name of the storage bucket to upload to
+        
+    Returns:
+        str: Object name of the uploaded image
+    """
+    try:
+        db = DBConnection()
+        client = await db.client
+        await client.storage.from_(bucket_name).upload(
+            filename,
+            image_data,
+            {"content-type": content_type, "upsert": "true"}
+        )
+        
+        logger.debug(f"Successfully uploaded image {filename} to {bucket_name}")
+        return filename
+        
+    except Exception as e:
+        logger.error(f"Error uploading image {filename}: {e}")
+        raise RuntimeError(f"Failed to upload image: {str(e)}")
+
+async def create_signed_image_url(filename: str, bucket_name: str, expires_in: int = 3600) -> str:
+    """Return a URL for a stored image in a private bucket that expires after `expires_in` seconds.
+    
+    Args:
+        filename (str): Object name within the bucket
+        bucket_name (str): Name of the storage bucket
+        expires_in (int): Lifetime of the URL in seconds
+        
+    Returns:
+        str: Signed URL of the image
+    """
+    try:
+        db = DBConnection()
+        client = await db.client
+        response = await client.storage.from_(bucket_name).create_signed_url(filename, expires_in)
+        signed_url = response.get("signedURL") or response.get("signedUrl")
+        if not signed_url:
+            raise RuntimeError(f"no signed URL in response: {response}")
+        return signed_url
+        
+    except Exception as e:
+        logger.error(f"Error signing image URL {filename}: {e}")
+        raise RuntimeError(f"Failed to sign image URL: {str(e)}")
@@ -358,6 +358,8 @@ const TOOL_DISPLAY_NAMES = new Map([
   ['browser_navigate_to', 'Navigating to Page'],
   ['browser_scroll_down', 'Scrolling Down'],
   ['browser_scroll_to_text', 'Scrolling to Text'],
+  ['browser_extract_ocr_text', 'Reading Page Text'],
+  ['browser_visit_urls', 'Visiting Pages'],
   ['browser_scroll_up', 'Scrolling Up'],
   ['browser_select_dropdown_option', 'Selecting Option'],
   ['browser_click_coordinates', 'Clicking Coordinates'],
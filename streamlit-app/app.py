@@ -4,10 +4,21 @@ import json
 import re
 from datetime import datetime
 from urllib.parse import quote_plus, urljoin, urlparse
-from bs4 import BeautifulSoup
 import time
+import io
 import pandas as pd
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+
+from bulk_jobs import get_bulk_runner
+from scout_cache import get_page_cache, get_search_cache
+from scout_http import get_rate_limiter
+from page_extractor import detect_site_type
+from parse_pool import get_parse_pool, parse_page
+from player_store import consolidate_fields, get_player_store
+from scoring import make_weights, recommend_profiles
+from text_patterns import extract_fields, extract_player_names, standardize_market_value
 
 # Configure page
 st.set_page_config(
@@ -23,45 +34,79 @@ if "GOOGLE_CSE_API_KEY" in st.secrets:
 else:
     st.error("❌ API Key not found in secrets")
 
+def get_app_page_cache():
+    """Shared scraped-page cache configured from secrets"""
+    
+    return get_page_cache(max_entries=int(st.secrets.get("PAGE_CACHE_MAX_ENTRIES", 2000)))
+
+def get_app_parse_pool():
+    """Shared parse process pool, or None when parsing runs in-process"""
+    
+    if st.secrets.get("PARSE_BACKEND", "thread") != "process":
+        return None
+    
+    return get_parse_pool(
+        workers=int(st.secrets.get("PARSE_POOL_SIZE", 0)) or None,
+        cpu_budget=float(st.secrets.get("PARSE_CPU_BUDGET", 5.0))
+    )
+
+def get_app_player_store():
+    """Shared local player store configured from secrets"""
+    
+    return get_player_store(ttl=int(st.secrets.get("PLAYER_STORE_TTL", 7 * 24 * 3600)))
+
+def get_app_search_cache():
+    """Shared CSE response cache configured from secrets"""
+    
+    return get_search_cache(
+        ttl=int(st.secrets.get("SEARCH_CACHE_TTL", 6 * 3600)),
+        stale_ttl=int(st.secrets.get("SEARCH_CACHE_STALE_TTL", 24 * 3600)),
+        max_entries=int(st.secrets.get("SEARCH_CACHE_MAX_ENTRIES", 5000))
+    )
+
 class EnhancedGoogleCSE:
     """Enhanced Google CSE with advanced scraping and search strategies"""
     
+    # Bump when extraction changes so cached pages are re-parsed from stored HTML
+    EXTRACTOR_VERSION = 2
+    
     def __init__(self):
         self.api_key = st.secrets.get("GOOGLE_CSE_API_KEY", "")
         self.cse_id = "c12f53951c8884cfd"
         
+        # Worker pool for concurrent CSE queries and page fetches
+        self.max_workers = int(st.secrets.get("SCOUT_MAX_WORKERS", 8))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self.rate_limiter = get_rate_limiter()
+        self.quota_exceeded_at = 0
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Persistent CSE response cache (shared across reruns)
+        self.search_cache = get_app_search_cache()
+        
+        # Scraped page cache; TTLs (seconds) by URL fragment, first match wins
+        self.page_cache = get_app_page_cache()
+        self.page_cache_ttls = [
+            ('transfermarkt', 24 * 3600),
+            ('fbref', 12 * 3600),
+            ('sofascore', 6 * 3600),
+            ('nextgen', 12 * 3600),
+            ('primavera', 6 * 3600),
+            ('youth', 6 * 3600),
+            ('tuttomercatoweb', 2 * 3600),
+            ('calciomercato', 2 * 3600),
+        ]
+        self.page_cache_default_ttl = int(st.secrets.get("PAGE_CACHE_TTL", 3 * 3600))
         
-        # Enhanced patterns for youth and unknown players
-        self.extraction_patterns = {
-            'transfermarkt': {
-                'age': [r'Age:\s*(\d{1,2})', r'(\d{1,2})\s*years old', r'Born:.*\((\d{1,2})\)'],
-                'position': [r'Position:\s*([^,\n]+)', r'Main position:\s*([^,\n]+)'],
-                'market_value': [r'Market value:\s*€([\d.]+)m', r'€([\d.]+)\s*million', r'Value:\s*€([\d.]+)'],
-                'goals': [r'Goals:\s*(\d+)', r'(\d+)\s*goals?', r'Scored:\s*(\d+)'],
-                'assists': [r'Assists:\s*(\d+)', r'(\d+)\s*assists?'],
-                'club': [r'Club:\s*([^,\n]+)', r'Current club:\s*([^,\n]+)', r'Team:\s*([^,\n]+)'],
-                'league': [r'League:\s*([^,\n]+)', r'Competition:\s*([^,\n]+)']
-            },
-            'youth': {
-                'age': [r'U(\d{2})', r'Under[- ]?(\d{2})', r'(\d{1,2})\s*(?:years old|age|anni)'],
-                'team': [r'Academy:\s*([^,\n]+)', r'Youth team:\s*([^,\n]+)', r'Primavera\s*([^,\n]+)'],
-                'goals': [r'(\d+)\s*goals?\s*(?:this season|in \d+ matches)', r'Scored:\s*(\d+)'],
-                'appearances': [r'(\d+)\s*appearances', r'(\d+)\s*matches', r'(\d+)\s*games'],
-                'position': [r'Position:\s*([^,\n]+)', r'Plays as:\s*([^,\n]+)']
-            },
-            'generic': {
-                'age': [r'(\d{1,2})\s*(?:years old|age|anni)', r'Age:?\s*(\d{1,2})', r'nato\s*(?:nel\s*)?\d{4}\s*\((\d{1,2})', r'born\s*\d{4}\s*\((\d{1,2})'],
-                'goals': [r'(\d+)\s*(?:goals?|gol)', r'Goals:?\s*(\d+)', r'scored\s*(\d+)', r'(\d+)\s*reti'],
-                'assists': [r'(\d+)\s*assists?', r'Assists:?\s*(\d+)', r'(\d+)\s*assist'],
-                'market_value': [r'€([\d.]+)(?:\s*(?:million|m|mil))?', r'worth\s*€([\d.]+)', r'valore\s*€([\d.]+)'],
-                'position': [r'Position:?\s*([^,\n]+)', r'plays as\s*([^,\n]+)', r'ruolo:?\s*([^,\n]+)'],
-                'club': [r'(?:club|team|squadra):?\s*([A-Z][^,\n]+)', r'plays for\s*([A-Z][^,\n]+)', r'gioca\s*(?:per|nel)?\s*([A-Z][^,\n]+)']
-            }
-        }
+        # Optional process pool for HTML parsing and extraction
+        self.parse_pool = get_app_parse_pool()
         
         # Youth and lower league specific sites
         self.specialized_sites = {
@@ -71,26 +116,24 @@ class EnhancedGoogleCSE:
             'video': ['wyscout.com', 'instatscout.com']
         }
     
-    def search_and_scrape(self, query: str, max_results: int = 10, deep_scrape: bool = True, search_type: str = 'general'):
-        """Enhanced search with multiple strategies for finding unknown players"""
+    def search_and_scrape(self, query: str, max_results: int = 10, deep_scrape: bool = True, search_type: str = 'general', on_result=None):
+        """Enhanced search with multiple strategies for finding unknown players
         
-        all_results = []
-        
-        # Strategy 1: Direct search
-        direct_results = self._google_cse_search(query, max_results // 2)
-        all_results.extend(direct_results)
+        CSE queries and page fetches run concurrently; `on_result` is called in
+        the calling thread as each search result or scraped page arrives.
+        """
         
-        # Strategy 2: Context-enhanced search for youth/unknown players
+        # Strategy 1 + 2: Direct search and context-enhanced searches for youth/unknown players
+        searches = [(query, max_results // 2)]
         if search_type in ['youth', 'unknown']:
             context_queries = self._generate_context_queries(query, search_type)
-            for context_query in context_queries[:2]:  # Limit to avoid quota
-                context_results = self._google_cse_search(context_query, 3)
-                all_results.extend(context_results)
-                time.sleep(0.3)
+            searches.extend((context_query, 3) for context_query in context_queries[:2])  # Limit to avoid quota
+        
+        all_results = self._run_searches(searches, on_result)
         
         # Strategy 3: Site-specific search
         if len(all_results) < max_results // 2:
-            site_results = self._site_specific_search(query, search_type)
+            site_results = self._site_specific_search(query, search_type, on_result)
             all_results.extend(site_results)
         
         # Remove duplicates
@@ -98,26 +141,49 @@ class EnhancedGoogleCSE:
         
         # Deep scraping if enabled
         if deep_scrape and unique_results:
-            enhanced_results = []
-            for idx, result in enumerate(unique_results[:5]):
+            futures = {
+                self.executor.submit(self._scrape_page_content, result): result
+                for result in unique_results[:5]
+            }
+            for future in as_completed(futures):
+                result = futures[future]
                 try:
-                    scraped_data = self._scrape_page_content(result)
+                    scraped_data = future.result()
                     result.update(scraped_data)
-                    enhanced_results.append(result)
                     
                     # Extract player names from content
                     if scraped_data.get('extracted_names'):
                         result['potential_matches'] = scraped_data['extracted_names']
-                    
-                    time.sleep(0.5)
                 except Exception as e:
-                    enhanced_results.append(result)
-            
-            enhanced_results.extend(unique_results[5:])
-            return enhanced_results[:max_results]
+                    pass
+                
+                if on_result:
+                    on_result(result)
         
         return unique_results[:max_results]
     
+    def _run_searches(self, searches: list, on_result=None) -> list:
+        """Run (query, max_results) CSE searches concurrently, keeping their order"""
+        
+        futures = {
+            self.executor.submit(self._google_cse_search, search_query, num): idx
+            for idx, (search_query, num) in enumerate(searches)
+        }
+        batches = [[] for _ in searches]
+        
+        for future in as_completed(futures):
+            try:
+                batch = future.result()
+            except Exception as e:
+                batch = []
+            batches[futures[future]] = batch
+            
+            if on_result:
+                for result in batch:
+                    on_result(result)
+        
+        return [result for batch in batches for result in batch]
+    
     def _generate_context_queries(self, base_query: str, search_type: str) -> list:
         """Generate context-enhanced queries for better results"""
         
@@ -151,7 +217,7 @@ class EnhancedGoogleCSE:
             
         return queries
     
-    def _site_specific_search(self, query: str, search_type: str) -> list:
+    def _site_specific_search(self, query: str, search_type: str, on_result=None) -> list:
         """Search specific sites based on query type"""
         
         results = []
@@ -166,10 +232,8 @@ class EnhancedGoogleCSE:
             sites = self.specialized_sites['stats']
         
         # Search each site
-        for site in sites[:2]:  # Limit to avoid quota
-            site_query = f"{query} site:{site}"
-            site_results = self._google_cse_search(site_query, 2)
-            results.extend(site_results)
+        site_searches = [(f"{query} site:{site}", 2) for site in sites[:2]]  # Limit to avoid quota
+        results.extend(self._run_searches(site_searches, on_result))
         
         return results
     
@@ -179,34 +243,64 @@ class EnhancedGoogleCSE:
         if not self.api_key:
             return []
         
+        # Optimize query
+        optimized_query = self._optimize_query(query)
+        num = min(max_results, 10)
+        
+        # Serve from cache; stale entries are refreshed in the background
+        cached, state = self.search_cache.get(optimized_query, num)
+        if state == 'stale':
+            self.search_cache.refresh_async(
+                optimized_query, num,
+                lambda: self._fetch_cse_response(optimized_query, num)[1]
+            )
+        if cached is not None:
+            return self._mark_cached(self._parse_search_results(cached), state)
+        
         try:
-            url = "https://www.googleapis.com/customsearch/v1"
-            
-            # Optimize query
-            optimized_query = self._optimize_query(query)
+            status_code, data = self._fetch_cse_response(optimized_query, num)
             
-            params = {
-                'key': self.api_key,
-                'cx': self.cse_id,
-                'q': optimized_query,
-                'num': min(max_results, 10),
-                'fields': 'items(title,snippet,link,pagemap)'
-            }
-            
-            response = self.session.get(url, params=params, timeout=15)
-            
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
+                self.search_cache.put(optimized_query, num, data)
                 return self._parse_search_results(data)
-            elif response.status_code == 429:
-                st.warning("⚠️ Search quota exceeded. Using cached data...")
-                return self._get_cached_results(query)
+            elif status_code == 429:
+                # Runs on worker threads; the warning is shown by comprehensive_scout
+                self.quota_exceeded_at = time.time()
+                return self._get_cached_results(optimized_query, num)
             else:
                 return []
                 
         except Exception as e:
             return []
     
+    def _fetch_cse_response(self, optimized_query: str, num: int):
+        """Call the CSE API; returns (status_code, data) with data only set on success"""
+        
+        url = "https://www.googleapis.com/customsearch/v1"
+        
+        params = {
+            'key': self.api_key,
+            'cx': self.cse_id,
+            'q': optimized_query,
+            'num': num,
+            'fields': 'items(title,snippet,link,pagemap)'
+        }
+        
+        self.rate_limiter.acquire(url)
+        response = self.session.get(url, params=params, timeout=15)
+        
+        if response.status_code == 200:
+            return response.status_code, response.json()
+        return response.status_code, None
+    
+    def _mark_cached(self, results: list, state: str) -> list:
+        """Flag results served from the search cache"""
+        
+        for result in results:
+            result['cached'] = True
+            result['cache_state'] = state
+        return results
+    
     def _scrape_page_content(self, result: dict) -> dict:
         """Enhanced scraping with name extraction"""
         
@@ -215,37 +309,46 @@ class EnhancedGoogleCSE:
             return {}
         
         try:
-            response = self.session.get(url, timeout=10)
-            if response.status_code != 200:
-                return {}
+            cached = self.page_cache.get(url)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            site_type = self._detect_site_type(url)
+            # Fresh cache entry: skip both the fetch and the parse
+            if cached and time.time() - cached['fetched_at'] < self._page_cache_ttl(url):
+                self.page_cache.record('hits')
+                return self._cached_page_result(url, cached)
             
-            # Extract structured data
-            extracted_data = self._extract_structured_data(soup, site_type)
+            # Conditional GET when we have validators
+            headers = {}
+            if cached:
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
             
-            # Extract page text
-            page_text = soup.get_text()
+            self.rate_limiter.acquire(url)
+            response = self.session.get(url, timeout=10, headers=headers)
             
-            # Extract names (for youth/unknown players)
-            extracted_names = self._extract_player_names(page_text)
-            if extracted_names:
-                extracted_data['extracted_names'] = extracted_names
+            if response.status_code == 304 and cached:
+                self.page_cache.record('revalidated')
+                page_result = self._cached_page_result(url, cached)
+                if cached['extractor_version'] == self.EXTRACTOR_VERSION:
+                    self.page_cache.touch(url)
+                return page_result
             
-            # Extract stats from text
-            text_data = self._extract_from_text(page_text, site_type)
-            extracted_data.update(text_data)
-            
-            # Extract from tables
-            table_data = self._extract_from_tables(soup)
-            extracted_data.update(table_data)
+            if response.status_code != 200:
+                return {}
             
-            return {
-                'scraped_data': extracted_data,
-                'scraping_success': True,
-                'page_size': len(page_text)
-            }
+            self.page_cache.record('misses')
+            page_result = self._parse_page(response.content, url)
+            if page_result.get('scraping_success'):
+                self.page_cache.put(
+                    url,
+                    response.content,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    page_result,
+                    self.EXTRACTOR_VERSION
+                )
+            return page_result
             
         except Exception as e:
             return {
@@ -253,69 +356,39 @@ class EnhancedGoogleCSE:
                 'scraping_error': str(e)
             }
     
-    def _extract_player_names(self, text: str) -> list:
-        """Extract potential player names from text"""
-        
-        names = []
+    def _page_cache_ttl(self, url: str) -> int:
+        """TTL for a cached page based on its site"""
         
-        # Pattern for Italian/Latin names
-        name_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})\b'
-        
-        # Common contexts where names appear
-        contexts = [
-            r'(?:scorer|marcatore|goalscorer):\s*' + name_pattern,
-            r'(?:player|giocatore|calciatore)\s+' + name_pattern,
-            name_pattern + r'\s*\(\d{1,2}\)',  # Name (age)
-            name_pattern + r'\s*-\s*\d+\s*goals?'  # Name - X goals
-        ]
-        
-        for context in contexts:
-            matches = re.findall(context, text, re.MULTILINE)
-            names.extend(matches)
+        url_lower = url.lower()
+        for fragment, ttl in self.page_cache_ttls:
+            if fragment in url_lower:
+                return ttl
+        return self.page_cache_default_ttl
+    
+    def _cached_page_result(self, url: str, cached: dict) -> dict:
+        """Result for a cached page, re-extracted from stored HTML if the extractor changed"""
         
-        # Clean and deduplicate
-        cleaned_names = []
-        for name in names:
-            if isinstance(name, tuple):
-                name = name[0]
-            name = name.strip()
-            # Filter out common false positives
-            if (len(name.split()) >= 2 and 
-                not any(word in name.lower() for word in ['the', 'and', 'for', 'with'])):
-                cleaned_names.append(name)
+        if cached['extractor_version'] == self.EXTRACTOR_VERSION:
+            return cached['result']
         
-        return list(set(cleaned_names))[:5]  # Return top 5 unique names
+        page_result = self._parse_page(cached['html'], url)
+        self.page_cache.touch(url, page_result, self.EXTRACTOR_VERSION)
+        return page_result
     
-    def _extract_from_tables(self, soup: BeautifulSoup) -> dict:
-        """Extract data from HTML tables"""
+    def _parse_page(self, html: bytes, url: str) -> dict:
+        """Parse a fetched page and extract player data
         
-        data = {}
-        tables = soup.find_all('table')
+        Runs in a worker process when the process backend is enabled.
+        """
         
-        for table in tables:
-            # Look for stats tables
-            headers = [th.get_text().strip().lower() for th in table.find_all('th')]
-            
-            if any(stat in headers for stat in ['goals', 'assists', 'gol', 'reti']):
-                rows = table.find_all('tr')[1:]  # Skip header
-                for row in rows[:5]:  # Limit to first 5 rows
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        # Try to extract player stats
-                        for i, header in enumerate(headers):
-                            if i < len(cells):
-                                if 'goal' in header or 'gol' in header:
-                                    try:
-                                        data['table_goals'] = int(cells[i].get_text().strip())
-                                    except:
-                                        pass
-                                elif 'assist' in header:
-                                    try:
-                                        data['table_assists'] = int(cells[i].get_text().strip())
-                                    except:
-                                        pass
+        if self.parse_pool:
+            return self.parse_pool.parse(html, url)
+        return parse_page(html, url)
+    
+    def _extract_player_names(self, text: str) -> list:
+        """Extract potential player names from text"""
         
-        return data
+        return extract_player_names(text)
     
     def _optimize_query(self, query: str) -> str:
         """Optimize query for better results"""
@@ -338,17 +411,13 @@ class EnhancedGoogleCSE:
         
         return query
     
-    def _get_cached_results(self, query: str) -> list:
-        """Return cached/example results when API quota is exceeded"""
+    def _get_cached_results(self, optimized_query: str, num: int) -> list:
+        """Return real cached results (even expired ones) when API quota is exceeded"""
         
-        # This would ideally load from a cache, but for now return examples
-        return [{
-            'title': f'Cached Result: {query}',
-            'snippet': 'API quota exceeded. Showing cached example data.',
-            'url': '',
-            'source': 'Cache',
-            'cached': True
-        }]
+        cached = self.search_cache.get_any(optimized_query, num)
+        if cached is None:
+            return []
+        return self._mark_cached(self._parse_search_results(cached), 'expired')
     
     def _deduplicate_results(self, results: list) -> list:
         """Remove duplicate results"""
@@ -368,163 +437,17 @@ class EnhancedGoogleCSE:
     def _detect_site_type(self, url: str) -> str:
         """Detect website type for targeted extraction"""
         
-        url_lower = url.lower()
-        
-        if 'transfermarkt' in url_lower:
-            return 'transfermarkt'
-        elif 'whoscored' in url_lower:
-            return 'whoscored'
-        elif any(site in url_lower for site in ['nextgen', 'youth', 'primavera', 'giovanili']):
-            return 'youth'
-        elif 'tuttomercatoweb' in url_lower or 'calciomercato' in url_lower:
-            return 'italian'
-        else:
-            return 'generic'
-    
-    def _extract_structured_data(self, soup: BeautifulSoup, site_type: str) -> dict:
-        """Extract structured data based on site type"""
-        
-        data = {}
-        
-        # Try to extract JSON-LD data first
-        json_scripts = soup.find_all('script', {'type': 'application/ld+json'})
-        for script in json_scripts:
-            try:
-                json_data = json.loads(script.string)
-                if isinstance(json_data, dict):
-                    if json_data.get('@type') in ['Person', 'SportsTeam']:
-                        data.update(self._parse_json_ld(json_data))
-            except:
-                continue
-        
-        # Site-specific extraction
-        if site_type == 'transfermarkt':
-            data.update(self._extract_transfermarkt_data(soup))
-        elif site_type == 'youth':
-            data.update(self._extract_youth_data(soup))
-        
-        return data
-    
-    def _extract_transfermarkt_data(self, soup: BeautifulSoup) -> dict:
-        """Extract data from Transfermarkt pages"""
-        
-        data = {}
-        
-        # Market value
-        value_elem = soup.find('div', {'class': 'dataMarktwert'})
-        if value_elem:
-            value_text = value_elem.get_text()
-            match = re.search(r'€([\d.,]+)(?:m|Mio)', value_text)
-            if match:
-                data['market_value'] = f"€{match.group(1)}M"
-        
-        # Player data table
-        info_table = soup.find('table', {'class': 'auflistung'})
-        if info_table:
-            rows = info_table.find_all('tr')
-            for row in rows:
-                label = row.find('th')
-                value = row.find('td')
-                if label and value:
-                    label_text = label.get_text().strip().lower()
-                    value_text = value.get_text().strip()
-                    
-                    if 'age' in label_text or 'alter' in label_text:
-                        age_match = re.search(r'(\d+)', value_text)
-                        if age_match:
-                            data['age'] = int(age_match.group(1))
-                    elif 'position' in label_text:
-                        data['position'] = value_text
-        
-        return data
-    
-    def _extract_youth_data(self, soup: BeautifulSoup) -> dict:
-        """Extract data from youth football sites"""
-        
-        data = {}
-        
-        # Look for common youth data patterns
-        # Age categories
-        for elem in soup.find_all(text=re.compile(r'U\d{2}|Under[- ]?\d{2}')):
-            match = re.search(r'U(\d{2})|Under[- ]?(\d{2})', elem)
-            if match:
-                age = match.group(1) or match.group(2)
-                data['youth_category'] = f"U{age}"
-                data['estimated_age'] = int(age) - 1  # Approximate age
-        
-        return data
-    
-    def _parse_json_ld(self, json_data: dict) -> dict:
-        """Parse JSON-LD structured data"""
-        
-        data = {}
-        
-        if json_data.get('name'):
-            data['structured_name'] = json_data['name']
-        if json_data.get('birthDate'):
-            # Calculate age from birthdate
-            try:
-                birth_year = int(json_data['birthDate'][:4])
-                data['age'] = datetime.now().year - birth_year
-            except:
-                pass
-        
-        return data
+        return detect_site_type(url)
     
     def _extract_from_text(self, text: str, site_type: str) -> dict:
-        """Extract data using regex patterns"""
+        """Extract data using precompiled regex patterns"""
         
-        data = {}
-        
-        # Choose appropriate patterns
-        if site_type == 'youth':
-            patterns = self.extraction_patterns['youth']
-        elif site_type in ['transfermarkt', 'whoscored']:
-            patterns = self.extraction_patterns.get(site_type, self.extraction_patterns['generic'])
-        else:
-            patterns = self.extraction_patterns['generic']
-        
-        # Apply patterns
-        for field, pattern_list in patterns.items():
-            for pattern in pattern_list:
-                match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-                if match:
-                    value = match.group(1).strip()
-                    
-                    # Process based on field type
-                    if field in ['age', 'goals', 'assists', 'appearances']:
-                        try:
-                            data[field] = int(value)
-                            break
-                        except:
-                            continue
-                    elif field == 'market_value':
-                        # Standardize market value format
-                        data[field] = self._standardize_market_value(value)
-                        break
-                    else:
-                        if 2 < len(value) < 50:  # Reasonable length
-                            data[field] = value
-                            break
-        
-        return data
+        return extract_fields(text, site_type)
     
     def _standardize_market_value(self, value: str) -> str:
         """Standardize market value format"""
         
-        # Extract numeric value
-        match = re.search(r'([\d.,]+)', value)
-        if match:
-            num = match.group(1).replace(',', '.')
-            try:
-                num_float = float(num)
-                if num_float < 100:  # Assume millions
-                    return f"€{num}M"
-                else:  # Assume thousands
-                    return f"€{num_float/1000:.1f}M"
-            except:
-                return f"€{value}"
-        return f"€{value}"
+        return standardize_market_value(value)
     
     def _parse_search_results(self, data: dict) -> list:
         """Parse Google CSE response"""
@@ -617,26 +540,150 @@ class EnhancedGoogleCSE:
 class AdvancedFootballScout:
     """Advanced scouting engine with enhanced search strategies"""
     
+    # Query analysis vocabularies
+    YOUTH_TERMS = ['u17', 'u19', 'u20', 'under', 'youth', 'primavera', 'giovanili']
+    POSITION_TERMS = ['trequartista', 'centrocampista', 'attaccante', 'difensore', 'portiere', 'midfielder', 'forward', 'defender', 'goalkeeper']
+    NATIONALITY_TERMS = ['argentino', 'brasiliano', 'italiano', 'spagnolo', 'francese']
+    LEAGUE_TERMS = ['serie', 'premier', 'bundesliga', 'liga', 'ligue']
+    
+    POSITIONS = {
+        'trequartista': 'Attacking Midfielder',
+        'centrocampista': 'Midfielder',
+        'attaccante': 'Forward',
+        'difensore': 'Defender',
+        'portiere': 'Goalkeeper',
+        'midfielder': 'Midfielder',
+        'forward': 'Forward',
+        'striker': 'Forward',
+        'winger': 'Winger',
+        'ala': 'Winger',
+        'terzino': 'Fullback',
+        'mediano': 'Defensive Midfielder',
+        'regista': 'Deep-lying Playmaker'
+    }
+    
+    NATIONALITIES = {
+        'argentino': 'Argentina',
+        'brasiliano': 'Brazil',
+        'italiano': 'Italy',
+        'spagnolo': 'Spain',
+        'francese': 'France',
+        'tedesco': 'Germany',
+        'inglese': 'England',
+        'portoghese': 'Portugal'
+    }
+    
+    LEAGUES = {
+        'serie a': 'Serie A',
+        'serie b': 'Serie B',
+        'serie c': 'Serie C',
+        'primavera': 'Primavera',
+        'premier': 'Premier League',
+        'bundesliga': 'Bundesliga',
+        'la liga': 'La Liga',
+        'ligue 1': 'Ligue 1'
+    }
+    
+    ATTRIBUTE_MAP = {
+        'veloce': 'fast',
+        'tecnico': 'technical',
+        'sinistro': 'left-footed',
+        'destro': 'right-footed',
+        'forte': 'strong',
+        'rapido': 'quick',
+        'alto': 'tall',
+        'giovane': 'young'
+    }
+    
+    YEAR_RE = re.compile(r'20\d{2}')
+    NON_NAME_TERMS = ['serie', 'premier', 'league', 'united', 'real', 'milan']
+    
     def __init__(self):
         self.search_engine = EnhancedGoogleCSE()
+        self.player_store = get_app_player_store()
+        
+        # Recommendation model weights, overridable with a [SCORING_WEIGHTS] table
+        self.scoring_weights = make_weights(st.secrets.get("SCORING_WEIGHTS"))
     
-    def comprehensive_scout(self, query: str, search_mode: str = "auto", enable_deep_scraping: bool = True) -> dict:
+    def comprehensive_scout(self, query: str, search_mode: str = "auto", enable_deep_scraping: bool = True, use_player_store: bool = True) -> dict:
         """Comprehensive scouting with intelligent search strategies"""
         
         # Progress tracking
         progress = st.progress(0)
         status = st.empty()
+        live_feed = st.empty()
+        arrived = []
+        started_at = time.time()
+        
+        def show_step(text, percent):
+            status.text(text)
+            progress.progress(percent)
+        
+        def show_result(result):
+            # Stream results into the UI as they arrive
+            arrived.append(result)
+            live_feed.markdown("\n".join(
+                f"- {'📄' if r.get('scraping_success') else '🔗'} **{r.get('source', 'Unknown')}** — {r.get('title', '')[:80]}"
+                for r in arrived[-8:]
+            ))
+        
+        report = self.scout(
+            query,
+            search_mode=search_mode,
+            enable_deep_scraping=enable_deep_scraping,
+            use_player_store=use_player_store,
+            on_step=show_step,
+            on_result=show_result
+        )
+        
+        if not report['metadata'].get('answered_from_store'):
+            if self.search_engine.quota_exceeded_at >= started_at:
+                st.warning("⚠️ Search quota exceeded. Using cached data...")
+            
+            time.sleep(0.5)
+        
+        # Clean up
+        progress.empty()
+        status.empty()
+        live_feed.empty()
+        
+        return report
+    
+    def scout(self, query: str, search_mode: str = "auto", enable_deep_scraping: bool = True, use_player_store: bool = True, on_step=None, on_result=None) -> dict:
+        """Run the scouting pipeline without any UI (interactive searches and bulk jobs)
+        
+        `on_step(text, percent)` reports progress; `on_result(result)` receives
+        search results as they arrive.
+        """
+        
+        step = on_step or (lambda text, percent: None)
         
         # Step 1: Query analysis
-        status.text("🔍 Analyzing search query...")
-        progress.progress(10)
+        step("🔍 Analyzing search query...", 10)
         
         query_analysis = self._analyze_query(query)
         search_type = self._determine_search_type(query, query_analysis, search_mode)
         
+        # Known players are answered from the local store until they go stale
+        if use_player_store and query_analysis['indicators']['is_specific_name']:
+            stored_profiles, store_state = self.player_store.lookup(self._query_player_name(query))
+            
+            if store_state == 'fresh':
+                step("📚 Player found in local store...", 90)
+                
+                report = self._generate_enhanced_report(
+                    query,
+                    query_analysis,
+                    stored_profiles,
+                    self._stored_source_results(stored_profiles),
+                    search_type
+                )
+                report['metadata']['answered_from_store'] = True
+                
+                return report
+        
         # Step 2: Multi-strategy search
-        status.text("🌐 Executing multi-strategy search...")
-        progress.progress(30)
+        step("🌐 Executing multi-strategy search...", 30)
         
         all_results = []
         
@@ -645,14 +692,14 @@ class AdvancedFootballScout:
             query, 
             max_results=10, 
             deep_scrape=enable_deep_scraping,
-            search_type=search_type
+            search_type=search_type,
+            on_result=on_result
         )
         all_results.extend(primary_results)
         
         # If few results, try alternative strategies
         if len(primary_results) < 5:
-            status.text("🎯 Expanding search with alternative strategies...")
-            progress.progress(50)
+            step("🎯 Expanding search with alternative strategies...", 50)
             
             # Try broader searches
             if search_type == 'youth':
@@ -663,8 +710,7 @@ class AdvancedFootballScout:
                 all_results.extend(alt_results)
         
         # Step 3: Data consolidation
-        status.text("📊 Consolidating and analyzing data...")
-        progress.progress(70)
+        step("📊 Consolidating and analyzing data...", 70)
         
         # Remove duplicates
         unique_results = self._deduplicate_comprehensive(all_results)
@@ -673,8 +719,7 @@ class AdvancedFootballScout:
         player_profiles = self._extract_player_profiles(unique_results, query)
         
         # Step 4: Generate report
-        status.text("📋 Generating comprehensive report...")
-        progress.progress(90)
+        step("📋 Generating comprehensive report...", 90)
         
         report = self._generate_enhanced_report(
             query, 
@@ -684,13 +729,7 @@ class AdvancedFootballScout:
             search_type
         )
         
-        progress.progress(100)
-        status.text("✅ Advanced scouting analysis completed!")
-        
-        # Clean up
-        time.sleep(0.5)
-        progress.empty()
-        status.empty()
+        step("✅ Advanced scouting analysis completed!", 100)
         
         return report
     
@@ -701,17 +740,17 @@ class AdvancedFootballScout:
         
         # Extract components
         indicators = {
-            'youth': any(term in query_lower for term in ['u17', 'u19', 'u20', 'under', 'youth', 'primavera', 'giovanili']),
+            'youth': any(term in query_lower for term in self.YOUTH_TERMS),
             'position': {
-                'found': any(term in query_lower for term in ['trequartista', 'centrocampista', 'attaccante', 'difensore', 'portiere', 'midfielder', 'forward', 'defender', 'goalkeeper']),
+                'found': any(term in query_lower for term in self.POSITION_TERMS),
                 'type': self._extract_position(query_lower)
             },
             'nationality': {
-                'found': any(term in query_lower for term in ['argentino', 'brasiliano', 'italiano', 'spagnolo', 'francese']),
+                'found': any(term in query_lower for term in self.NATIONALITY_TERMS),
                 'type': self._extract_nationality(query_lower)
             },
             'league': {
-                'found': any(term in query_lower for term in ['serie', 'premier', 'bundesliga', 'liga', 'ligue']),
+                'found': any(term in query_lower for term in self.LEAGUE_TERMS),
                 'type': self._extract_league(query_lower)
             },
             'attributes': self._extract_attributes(query_lower),
@@ -732,23 +771,7 @@ class AdvancedFootballScout:
     def _extract_position(self, query: str) -> str:
         """Extract position from query"""
         
-        positions = {
-            'trequartista': 'Attacking Midfielder',
-            'centrocampista': 'Midfielder',
-            'attaccante': 'Forward',
-            'difensore': 'Defender',
-            'portiere': 'Goalkeeper',
-            'midfielder': 'Midfielder',
-            'forward': 'Forward',
-            'striker': 'Forward',
-            'winger': 'Winger',
-            'ala': 'Winger',
-            'terzino': 'Fullback',
-            'mediano': 'Defensive Midfielder',
-            'regista': 'Deep-lying Playmaker'
-        }
-        
-        for term, position in positions.items():
+        for term, position in self.POSITIONS.items():
             if term in query:
                 return position
         return ''
@@ -756,18 +779,7 @@ class AdvancedFootballScout:
     def _extract_nationality(self, query: str) -> str:
         """Extract nationality from query"""
         
-        nationalities = {
-            'argentino': 'Argentina',
-            'brasiliano': 'Brazil',
-            'italiano': 'Italy',
-            'spagnolo': 'Spain',
-            'francese': 'France',
-            'tedesco': 'Germany',
-            'inglese': 'England',
-            'portoghese': 'Portugal'
-        }
-        
-        for term, nation in nationalities.items():
+        for term, nation in self.NATIONALITIES.items():
             if term in query:
                 return nation
         return ''
@@ -775,18 +787,7 @@ class AdvancedFootballScout:
     def _extract_league(self, query: str) -> str:
         """Extract league from query"""
         
-        leagues = {
-            'serie a': 'Serie A',
-            'serie b': 'Serie B',
-            'serie c': 'Serie C',
-            'primavera': 'Primavera',
-            'premier': 'Premier League',
-            'bundesliga': 'Bundesliga',
-            'la liga': 'La Liga',
-            'ligue 1': 'Ligue 1'
-        }
-        
-        for term, league in leagues.items():
+        for term, league in self.LEAGUES.items():
             if term in query:
                 return league
         return ''
@@ -796,23 +797,17 @@ class AdvancedFootballScout:
         
         attributes = []
         
-        attribute_map = {
-            'veloce': 'fast',
-            'tecnico': 'technical',
-            'sinistro': 'left-footed',
-            'destro': 'right-footed',
-            'forte': 'strong',
-            'rapido': 'quick',
-            'alto': 'tall',
-            'giovane': 'young'
-        }
-        
-        for ita, eng in attribute_map.items():
+        for ita, eng in self.ATTRIBUTE_MAP.items():
             if ita in query:
                 attributes.append(eng)
         
         return attributes
     
+    def _query_player_name(self, query: str) -> str:
+        """Capitalized, non-football words of the query (the likely player name)"""
+        
+        return ' '.join(w for w in query.split() if w[0].isupper() and w.lower() not in self.NON_NAME_TERMS)
+    
     def _is_specific_name(self, query: str) -> bool:
         """Check if query contains a specific player name"""
         
@@ -822,8 +817,7 @@ class AdvancedFootballScout:
         # Likely a name if 2+ capitalized words
         if len(capitalized_words) >= 2:
             # Filter out common football terms
-            non_terms = [w for w in capitalized_words if w.lower() not in 
-                        ['serie', 'premier', 'league', 'united', 'real', 'milan']]
+            non_terms = [w for w in capitalized_words if w.lower() not in self.NON_NAME_TERMS]
             return len(non_terms) >= 2
         
         return False
@@ -831,7 +825,7 @@ class AdvancedFootballScout:
     def _extract_year(self, query: str) -> int:
         """Extract year from query"""
         
-        year_match = re.search(r'20\d{2}', query)
+        year_match = self.YEAR_RE.search(query)
         if year_match:
             return int(year_match.group())
         return 0
@@ -877,22 +871,21 @@ class AdvancedFootballScout:
             f"{query} campionato primavera"
         ]
         
-        for t_query in tournament_queries[:2]:
-            results.extend(self.search_engine.search_and_scrape(t_query, 3, deep_scrape=False))
-            time.sleep(0.3)
+        alt_queries = tournament_queries[:2]
         
         # Strategy 2: Search by team if league is mentioned
         if analysis['indicators']['league']['found']:
             league = analysis['indicators']['league']['type']
-            team_query = f"{league} youth academy {query}"
-            results.extend(self.search_engine.search_and_scrape(team_query, 3, deep_scrape=False))
+            alt_queries.append(f"{league} youth academy {query}")
+        
+        results.extend(self._run_alternative_searches([(q, 3) for q in alt_queries]))
         
         return results
     
     def _unknown_player_search(self, query: str, analysis: dict) -> list:
         """Search strategies for unknown players"""
         
-        results = []
+        alt_searches = []
         
         # Extract key terms
         position = analysis['indicators']['position']['type']
@@ -902,15 +895,29 @@ class AdvancedFootballScout:
         if position and nationality:
             # Search by position and nationality
             context_query = f"{nationality} {position} football players statistics"
-            results.extend(self.search_engine.search_and_scrape(context_query, 5, deep_scrape=False))
+            alt_searches.append((context_query, 5))
         
         # Search recent match reports
         if analysis['indicators']['year_mentioned']:
             year = analysis['indicators']['year_mentioned']
             match_query = f"{query} match report {year} goals"
-            results.extend(self.search_engine.search_and_scrape(match_query, 3, deep_scrape=False))
+            alt_searches.append((match_query, 3))
         
-        return results
+        return self._run_alternative_searches(alt_searches)
+    
+    def _run_alternative_searches(self, searches: list) -> list:
+        """Run shallow (query, max_results) searches in parallel, keeping their order"""
+        
+        if not searches:
+            return []
+        
+        # Separate pool: search_and_scrape itself waits on the engine's pool
+        with ThreadPoolExecutor(max_workers=len(searches)) as pool:
+            batches = pool.map(
+                lambda search: self.search_engine.search_and_scrape(search[0], search[1], deep_scrape=False),
+                searches
+            )
+            return [result for batch in batches for result in batch]
     
     def _deduplicate_comprehensive(self, results: list) -> list:
         """Advanced deduplication"""
@@ -960,7 +967,8 @@ class AdvancedFootballScout:
                         profile['data_points'].append({
                             'field': field,
                             'value': result[field],
-                            'source': result.get('source', '')
+                            'source': result.get('source', ''),
+                            'url': result.get('url')
                         })
                 
                 # Add extracted names
@@ -976,6 +984,11 @@ class AdvancedFootballScout:
         # Convert to list and consolidate
         for key, profile in profile_map.items():
             consolidated = self._consolidate_profile(profile)
+            
+            # Merge named players with what earlier searches learned about them
+            if consolidated['name'] != 'Unknown Player':
+                consolidated = self.player_store.upsert(consolidated, profile['data_points'])
+            
             consolidated['search_key'] = key
             profiles.append(consolidated)
         
@@ -1020,36 +1033,34 @@ class AdvancedFootballScout:
         else:
             consolidated['name'] = 'Unknown Player'
         
-        # Aggregate data points
-        field_values = defaultdict(list)
-        for dp in profile_data['data_points']:
-            field_values[dp['field']].append({
-                'value': dp['value'],
-                'source': dp['source']
-            })
-        
-        # Select best value for each field
-        for field, values in field_values.items():
-            if field in ['goals', 'assists', 'age']:
-                # For numeric fields, take the maximum from reliable sources
-                numeric_values = []
-                for v in values:
-                    try:
-                        numeric_values.append(int(v['value']))
-                    except:
-                        pass
-                if numeric_values:
-                    consolidated[field] = max(numeric_values)
-            else:
-                # For text fields, take the most common
-                value_counts = defaultdict(int)
-                for v in values:
-                    value_counts[v['value']] += 1
-                if value_counts:
-                    consolidated[field] = max(value_counts.items(), key=lambda x: x[1])[0]
+        # Select best value for each field (numeric: maximum, text: most common)
+        consolidated.update(consolidate_fields(profile_data['data_points']))
         
         return consolidated
     
+    def _stored_source_results(self, profiles: list) -> list:
+        """Source entries for a report answered from the player store"""
+        
+        results = {}
+        for profile in profiles:
+            for fact in profile.get('provenance', []):
+                key = (fact['source'], fact['url'])
+                if key not in results:
+                    results[key] = {
+                        'title': f"{profile['name']} (stored profile)",
+                        'url': fact['url'],
+                        'source': fact['source'],
+                        'snippet': [],
+                        'from_store': True
+                    }
+                observed = datetime.fromtimestamp(fact['observed_at']).strftime("%Y-%m-%d")
+                results[key]['snippet'].append(f"{fact['field']}: {fact['value']} ({observed})")
+        
+        for result in results.values():
+            result['snippet'] = ' · '.join(result['snippet'])
+        
+        return list(results.values())
+    
     def _generate_enhanced_report(self, query: str, analysis: dict, profiles: list, raw_results: list, search_type: str) -> dict:
         """Generate comprehensive scouting report"""
         
@@ -1057,10 +1068,9 @@ class AdvancedFootballScout:
         scraped_count = len([r for r in raw_results if r.get('scraping_success')])
         data_quality = min(100, (scraped_count * 15) + (len(raw_results) * 5) + (len(profiles) * 10))
         
-        # Generate recommendations for each profile
+        # Generate recommendations for all profiles in one batch
         recommendations = []
-        for profile in profiles:
-            rec = self._generate_recommendation(profile)
+        for profile, rec in zip(profiles, recommend_profiles(profiles, self.scoring_weights)):
             recommendations.append({
                 'player': profile.get('name', 'Unknown'),
                 'decision': rec['decision'],
@@ -1098,57 +1108,6 @@ class AdvancedFootballScout:
         
         return report
     
-    def _generate_recommendation(self, profile: dict) -> dict:
-        """Generate recommendation for a player profile"""
-        
-        # Base scoring
-        goals = profile.get('goals', 0)
-        assists = profile.get('assists', 0)
-        age = profile.get('age', 25)
-        confidence = profile.get('confidence', 0)
-        
-        # Calculate performance score
-        total_contributions = goals + assists
-        
-        # Age factor
-        if age <= 20:
-            age_factor = 1.3
-        elif age <= 25:
-            age_factor = 1.1
-        else:
-            age_factor = 0.9
-        
-        # Adjusted score
-        performance_score = total_contributions * age_factor
-        
-        # Confidence adjustment
-        confidence_factor = confidence / 100
-        final_score = performance_score * (0.7 + 0.3 * confidence_factor)
-        
-        # Generate recommendation
-        if final_score >= 20 and confidence >= 60:
-            decision = "STRONG BUY"
-            reasoning = f"Excellent output ({total_contributions} contributions) with good data confidence"
-        elif final_score >= 15 and confidence >= 50:
-            decision = "BUY"
-            reasoning = f"Strong performance ({total_contributions} contributions) justifies acquisition"
-        elif final_score >= 10 or confidence >= 40:
-            decision = "MONITOR"
-            reasoning = f"Promising profile ({total_contributions} contributions) worth tracking"
-        elif confidence >= 30:
-            decision = "SCOUT FURTHER"
-            reasoning = "Interesting profile but needs more detailed analysis"
-        else:
-            decision = "INSUFFICIENT DATA"
-            reasoning = "Limited information available for proper assessment"
-        
-        return {
-            'decision': decision,
-            'reasoning': reasoning,
-            'confidence': round(confidence_factor * 100, 1),
-            'performance_score': round(final_score, 1)
-        }
-    
     def _get_search_strategies(self, search_type: str) -> list:
         """Get list of search strategies used"""
         
@@ -1183,6 +1142,50 @@ class AdvancedFootballScout:
         else:
             return "Limited"
 
+@st.cache_resource(show_spinner=False)
+def get_scout_engine() -> AdvancedFootballScout:
+    """Scout engine shared by every session (HTTP session, worker pools and caches)"""
+    
+    return AdvancedFootballScout()
+
+def get_app_bulk_runner():
+    """Shared background runner for bulk shortlist jobs configured from secrets"""
+    
+    return get_bulk_runner(
+        scout_fn=get_scout_engine().scout,
+        max_workers=int(st.secrets.get("BULK_MAX_WORKERS", 2)),
+        auto_resume=bool(st.secrets.get("BULK_AUTO_RESUME", True))
+    )
+
+def normalize_query(query: str) -> str:
+    """Report cache key for a query: case and whitespace insensitive"""
+    
+    return ' '.join(query.lower().split())
+
+@st.cache_data(ttl=int(st.secrets.get("REPORT_CACHE_TTL", 3600)), max_entries=500, show_spinner=False)
+def run_scout_report(normalized_query: str, search_mode: str, enable_deep_scraping: bool, use_player_store: bool, _query: str) -> dict:
+    """Scouting report cached per (normalized query, mode, deep scraping flag, store use)"""
+    
+    return get_scout_engine().comprehensive_scout(
+        _query,
+        search_mode=search_mode,
+        enable_deep_scraping=enable_deep_scraping,
+        use_player_store=use_player_store
+    )
+
+def load_report(uploaded_file) -> dict:
+    """Load a report previously exported as JSON; None if it is not a scout report"""
+    
+    try:
+        report = json.load(uploaded_file)
+    except ValueError:
+        return None
+    
+    required = ['metadata', 'player_profiles', 'recommendations', 'search_summary', 'raw_results']
+    if not isinstance(report, dict) or any(key not in report for key in required):
+        return None
+    return report
+
 def format_enhanced_report(report: dict) -> str:
     """Format report in markdown with better structure"""
     
@@ -1283,6 +1286,298 @@ def display_player_card(profile: dict, recommendation: dict):
     </div>
     """, unsafe_allow_html=True)
 
+def display_report(report: dict, export_format: str):
+    """Display a scouting report with metrics, recommendations and exports"""
+    
+    query = report['metadata']['query']
+    
+    # Display results
+    st.success(f"✅ Analysis completed for: **{query}**")
+    
+    if report['metadata'].get('answered_from_store'):
+        st.info("📚 Answered from the local player store. Untick *Use Local Player Store* to refresh from the web.")
+    
+    # Metrics row
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            "Data Quality",
+            f"{report['metadata']['data_quality_score']}/100"
+        )
+    
+    with col2:
+        st.metric(
+            "Profiles Found",
+            report['search_summary']['profiles_found']
+        )
+    
+    with col3:
+        st.metric(
+            "Sources Analyzed",
+            report['metadata']['total_sources']
+        )
+    
+    with col4:
+        st.metric(
+            "Data Coverage",
+            report['search_summary']['data_coverage']
+        )
+    
+    # Player recommendations
+    if report['recommendations']:
+        st.markdown("### 🎯 Player Recommendations")
+        
+        for rec in report['recommendations']:
+            display_player_card(rec['profile'], rec)
+    else:
+        st.warning("""
+        ⚠️ No specific player profiles found. This could mean:
+        - The player is very unknown or plays in lower leagues
+        - Try adding more context (team, league, nationality)
+        - The search terms might be too generic
+        """)
+        
+        # Show what was searched
+        st.markdown("### 🔍 Search Strategies Used")
+        for strategy in report['search_summary']['search_strategies_used']:
+            st.write(f"- {strategy}")
+    
+    # Advanced details
+    with st.expander("📊 Detailed Search Analysis"):
+        # Query analysis
+        analysis = report['metadata']['query_analysis']
+        
+        st.markdown("#### Query Understanding")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Indicators Found:**")
+            indicators = analysis['indicators']
+            if indicators['youth']:
+                st.write("- 🎓 Youth player search")
+            if indicators['position']['found']:
+                st.write(f"- 📍 Position: {indicators['position']['type']}")
+            if indicators['nationality']['found']:
+                st.write(f"- 🌍 Nationality: {indicators['nationality']['type']}")
+            if indicators['league']['found']:
+                st.write(f"- 🏆 League: {indicators['league']['type']}")
+        
+        with col2:
+            st.write("**Search Analysis:**")
+            st.write(f"- Difficulty: {analysis['search_difficulty'].title()}")
+            st.write(f"- Query Type: {analysis['query_type'].replace('_', ' ').title()}")
+            if indicators['attributes']:
+                st.write(f"- Attributes: {', '.join(indicators['attributes'])}")
+    
+    # Raw results sample
+    with st.expander("🔗 Source Documents"):
+        for i, result in enumerate(report['raw_results'][:5], 1):
+            st.markdown(f"""
+            **{i}. {result.get('source', 'Unknown')}**  
+            {result.get('title', 'No title')}  
+            *{result.get('snippet', 'No snippet available')}*
+            """)
+            if result.get('url'):
+                st.markdown(f"[View Source]({result['url']})")
+            st.markdown("---")
+    
+    # Export section
+    st.markdown("### 📤 Export Report")
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename_base = f"apes_scout_{query.replace(' ', '_')}_{timestamp}"
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if export_format in ["Markdown", "Both"]:
+            md_report = format_enhanced_report(report)
+            st.download_button(
+                "📝 Download Markdown Report",
+                md_report,
+                f"{filename_base}.md",
+                "text/markdown"
+            )
+    
+    with col2:
+        if export_format in ["JSON", "Both"]:
+            json_report = json.dumps(report, indent=2, ensure_ascii=False)
+            st.download_button(
+                "📊 Download JSON Data",
+                json_report,
+                f"{filename_base}.json",
+                "application/json"
+            )
+    
+
+def read_shortlist(uploaded_file):
+    """Read an uploaded shortlist CSV as strings; None if it cannot be parsed"""
+    
+    try:
+        shortlist = pd.read_csv(uploaded_file, dtype=str, skip_blank_lines=True)
+    except (ValueError, pd.errors.ParserError):
+        return None
+    
+    if shortlist.empty or not len(shortlist.columns):
+        return None
+    return shortlist
+
+def shortlist_queries(shortlist: pd.DataFrame, column: str, limit: int) -> list:
+    """Non-empty queries from a shortlist column, deduplicated like the report cache"""
+    
+    queries = {}
+    for value in shortlist[column].dropna():
+        query = ' '.join(value.split())
+        if query:
+            queries.setdefault(normalize_query(query), query)
+    
+    return list(queries.values())[:limit]
+
+def display_bulk_scouting(search_mode: str, enable_deep_scraping: bool, use_player_store: bool):
+    """Bulk shortlist mode: enqueue a CSV of queries and follow the background batches"""
+    
+    runner = get_app_bulk_runner()
+    queue = runner.queue
+    
+    # Picks up work left by a restart or by workers that already finished
+    runner.start()
+    
+    st.markdown("### 📋 Bulk Shortlist Scouting")
+    st.caption(
+        "Upload a CSV with one player name or search per row. Jobs run in the background with the "
+        "sidebar settings, share the search rate limits, save every finished row and resume after a restart. "
+        "Players found are added to the local player store."
+    )
+    
+    uploaded_shortlist = st.file_uploader("Shortlist CSV", type=["csv"], key="bulk_shortlist")
+    
+    if uploaded_shortlist is not None:
+        shortlist = read_shortlist(uploaded_shortlist)
+        
+        if shortlist is None:
+            st.error("❌ Could not read the CSV file")
+        else:
+            columns = list(shortlist.columns)
+            preferred = [c for c in columns if c.strip().lower() in ('query', 'name', 'player', 'search')]
+            column = st.selectbox(
+                "Query column",
+                columns,
+                index=columns.index(preferred[0]) if preferred else 0
+            )
+            
+            max_rows = int(st.secrets.get("BULK_MAX_ROWS", 500))
+            queries = shortlist_queries(shortlist, column, max_rows)
+            st.write(f"**{len(queries)}** unique queries" + (f" (limited to {max_rows})" if len(queries) == max_rows else ""))
+            
+            if queries and st.button("📥 Enqueue Shortlist", type="primary"):
+                queue.create_batch(
+                    uploaded_shortlist.name,
+                    queries,
+                    {
+                        'search_mode': search_mode,
+                        'enable_deep_scraping': enable_deep_scraping,
+                        'use_player_store': use_player_store
+                    }
+                )
+                runner.start()
+                st.success(f"✅ {len(queries)} jobs queued")
+    
+    batches = queue.batches()
+    if not batches:
+        return
+    
+    st.markdown("---")
+    col1, col2 = st.columns([4, 1])
+    col1.markdown(f"#### Batches ({runner.active_workers()} active workers)")
+    col2.button("🔄 Refresh", key="bulk_refresh", use_container_width=True)
+    
+    for batch in batches:
+        finished = batch['done'] + batch['failed']
+        unfinished = finished < batch['total']
+        created = datetime.fromtimestamp(batch['created_at']).strftime("%Y-%m-%d %H:%M")
+        state = "⏸️ paused" if batch['paused'] and unfinished else ("⏳ running" if unfinished else "✅ finished")
+        
+        with st.expander(f"{batch['name']} — {created} — {finished}/{batch['total']} {state}", expanded=unfinished):
+            st.progress(finished / batch['total'] if batch['total'] else 1.0)
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Pending", batch['pending'])
+            col2.metric("Running", batch['running'])
+            col3.metric("Done", batch['done'])
+            col4.metric("Failed", batch['failed'])
+            
+            if unfinished:
+                if batch['paused']:
+                    if st.button("▶️ Resume", key=f"bulk_resume_{batch['id']}"):
+                        runner.resume(batch['id'])
+                        st.rerun()
+                elif st.button("⏸️ Pause", key=f"bulk_pause_{batch['id']}"):
+                    runner.pause(batch['id'])
+                    st.rerun()
+            
+            results = queue.results_frame(batch['id'])
+            st.dataframe(results, hide_index=True, use_container_width=True)
+            
+            filename_base = f"apes_shortlist_{batch['id']}"
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.download_button(
+                    "📄 Download CSV",
+                    results.to_csv(index=False),
+                    f"{filename_base}.csv",
+                    "text/csv",
+                    key=f"bulk_csv_{batch['id']}"
+                )
+            
+            with col2:
+                try:
+                    parquet = io.BytesIO()
+                    results.to_parquet(parquet, index=False)
+                    st.download_button(
+                        "🧱 Download Parquet",
+                        parquet.getvalue(),
+                        f"{filename_base}.parquet",
+                        "application/octet-stream",
+                        key=f"bulk_parquet_{batch['id']}"
+                    )
+                except ImportError:
+                    st.caption("Parquet export needs pyarrow")
+
+def display_cache_stats(container):
+    """Show search and page cache counters in the sidebar"""
+    
+    cache = get_app_search_cache()
+    stats = cache.stats
+    
+    with container.container():
+        st.markdown("### 🗄️ Search Cache")
+        col1, col2 = st.columns(2)
+        col1.metric("Hits", stats['hits'])
+        col2.metric("Misses", stats['misses'])
+        col1.metric("Stale Served", stats['stale'])
+        col2.metric("Quota Fallbacks", stats['fallbacks'])
+        st.caption(f"{cache.size()} cached queries")
+        
+        page_cache = get_app_page_cache()
+        page_stats = page_cache.stats
+        st.markdown("### 📄 Page Cache")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Hits", page_stats['hits'])
+        col2.metric("Revalidated", page_stats['revalidated'])
+        col3.metric("Fetched", page_stats['misses'])
+        st.caption(f"{page_cache.size()} cached pages")
+        
+        player_store = get_app_player_store()
+        store_stats = player_store.stats
+        st.markdown("### 📚 Player Store")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Answered", store_stats['hits'])
+        col2.metric("Stale", store_stats['stale'])
+        col3.metric("Updated", store_stats['upserts'])
+        st.caption(f"{player_store.size()} known players")
+
 def main():
     st.title("🦍⚽ APES Football Scout v4.0")
     st.markdown("### AI-Powered Scout Specialized in Finding Unknown Talents")
@@ -1324,11 +1619,34 @@ def main():
         help="Extract more data by analyzing page content (slower but more accurate)"
     )
     
+    use_player_store = st.sidebar.checkbox(
+        "Use Local Player Store",
+        value=True,
+        help="Answer known players from profiles stored by earlier searches; stale profiles are refreshed from the web"
+    )
+    
     export_format = st.sidebar.selectbox(
         "Export Format",
         ["Markdown", "JSON", "Both"]
     )
     
+    # Reload a previously exported JSON report without re-running the search
+    uploaded_report = st.sidebar.file_uploader(
+        "📂 Load Saved Report",
+        type=["json"],
+        help="Open a report exported as JSON"
+    )
+    
+    if uploaded_report is not None:
+        upload_id = (uploaded_report.name, uploaded_report.size)
+        if st.session_state.get('loaded_report_id') != upload_id:
+            st.session_state.loaded_report_id = upload_id
+            report = load_report(uploaded_report)
+            if report:
+                st.session_state.current_report = report
+            else:
+                st.sidebar.error("❌ Not a valid APES scout report")
+    
     # Feature showcase
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 🚀 Enhanced Features")
@@ -1339,8 +1657,14 @@ def main():
     - 📊 Player name extraction from articles
     - 🧠 Context-aware search expansion
     - 💎 Profile consolidation from multiple sources
+    - 📚 Local player store remembers known players
+    - 📋 Bulk shortlist scouting from CSV
     """)
     
+    # Cache statistics (filled in after the search runs)
+    st.sidebar.markdown("---")
+    cache_stats_box = st.sidebar.empty()
+    
     # Search examples
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 💡 Search Examples")
@@ -1378,199 +1702,94 @@ def main():
     # Main search interface
     st.markdown("---")
     
-    col1, col2 = st.columns([4, 1])
+    search_tab, bulk_tab = st.tabs(["🔍 Search", "📋 Bulk Shortlist"])
     
-    with col1:
-        default_value = st.session_state.selected_example if st.session_state.selected_example else ""
-        
-        query = st.text_input(
-            "🔍 Search Query",
-            value=default_value,
-            placeholder="Enter player name or search criteria...",
-            help="Be specific: include position, age category, nationality, or league"
-        )
+    with bulk_tab:
+        display_bulk_scouting(search_type_map[search_mode], enable_deep_scraping, use_player_store)
     
-    with col2:
-        st.markdown("<br>", unsafe_allow_html=True)
-        search_button = st.button(
-            "🚀 Scout",
-            type="primary",
-            use_container_width=True
-        )
-    
-    # Search execution
-    if search_button and query:
-        st.markdown("---")
-        
-        # Initialize scout
-        scout = AdvancedFootballScout()
+    with search_tab:
+        col1, col2 = st.columns([4, 1])
         
-        # Show search configuration
-        st.info(f"""
-        🔍 **Search Configuration**  
-        Mode: {search_mode} | Deep Scraping: {'Enabled' if enable_deep_scraping else 'Disabled'}
-        """)
+        with col1:
+            default_value = st.session_state.selected_example if st.session_state.selected_example else ""
+            
+            query = st.text_input(
+                "🔍 Search Query",
+                value=default_value,
+                placeholder="Enter player name or search criteria...",
+                help="Be specific: include position, age category, nationality, or league"
+            )
         
-        # Execute search
-        with st.container():
-            report = scout.comprehensive_scout(
-                query,
-                search_mode=search_type_map[search_mode],
-                enable_deep_scraping=enable_deep_scraping
+        with col2:
+            st.markdown("<br>", unsafe_allow_html=True)
+            search_button = st.button(
+                "🚀 Scout",
+                type="primary",
+                use_container_width=True
             )
+        
+        # Search execution
+        if search_button and query:
+            st.markdown("---")
             
-            # Display results
-            st.success(f"✅ Analysis completed for: **{query}**")
+            # Show search configuration
+            st.info(f"""
+            🔍 **Search Configuration**  
+            Mode: {search_mode} | Deep Scraping: {'Enabled' if enable_deep_scraping else 'Disabled'}
+            """)
             
-            # Metrics row
-            col1, col2, col3, col4 = st.columns(4)
+            # Execute search (cached per normalized query, mode and deep scraping flag)
+            with st.container():
+                st.session_state.current_report = run_scout_report(
+                    normalize_query(query),
+                    search_type_map[search_mode],
+                    enable_deep_scraping,
+                    use_player_store,
+                    query
+                )
+        
+        elif search_button and not query:
+            st.warning("⚠️ Please enter a search query")
+        
+        # Current report (searched or reloaded) survives reruns such as downloads
+        if st.session_state.get('current_report'):
+            display_report(st.session_state.current_report, export_format)
+        
+        # Help section
+        else:
+            st.markdown("---")
+            st.markdown("### 📚 How to Find Unknown Players")
+            
+            col1, col2, col3 = st.columns(3)
             
             with col1:
-                st.metric(
-                    "Data Quality",
-                    f"{report['metadata']['data_quality_score']}/100"
-                )
+                st.markdown("""
+                **🎯 Be Specific**
+                - Include position + nationality
+                - Add age category (U19, Primavera)
+                - Mention league or level
+                - Include year for recent stats
+                """)
             
             with col2:
-                st.metric(
-                    "Profiles Found",
-                    report['search_summary']['profiles_found']
-                )
+                st.markdown("""
+                **🔍 Search Tips**
+                - Use Italian terms for Italian leagues
+                - Combine multiple attributes
+                - Try team + position combos
+                - Add "goals" or "assists" for stats
+                """)
             
             with col3:
-                st.metric(
-                    "Sources Analyzed",
-                    report['metadata']['total_sources']
-                )
-            
-            with col4:
-                st.metric(
-                    "Data Coverage",
-                    report['search_summary']['data_coverage']
-                )
-            
-            # Player recommendations
-            if report['recommendations']:
-                st.markdown("### 🎯 Player Recommendations")
-                
-                for rec in report['recommendations']:
-                    display_player_card(rec['profile'], rec)
-            else:
-                st.warning("""
-                ⚠️ No specific player profiles found. This could mean:
-                - The player is very unknown or plays in lower leagues
-                - Try adding more context (team, league, nationality)
-                - The search terms might be too generic
+                st.markdown("""
+                **📊 Best Practices**
+                - Enable deep scraping for unknowns
+                - Try multiple search variations
+                - Check youth tournaments
+                - Look for match reports
                 """)
-                
-                # Show what was searched
-                st.markdown("### 🔍 Search Strategies Used")
-                for strategy in report['search_summary']['search_strategies_used']:
-                    st.write(f"- {strategy}")
-            
-            # Advanced details
-            with st.expander("📊 Detailed Search Analysis"):
-                # Query analysis
-                analysis = report['metadata']['query_analysis']
-                
-                st.markdown("#### Query Understanding")
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.write("**Indicators Found:**")
-                    indicators = analysis['indicators']
-                    if indicators['youth']:
-                        st.write("- 🎓 Youth player search")
-                    if indicators['position']['found']:
-                        st.write(f"- 📍 Position: {indicators['position']['type']}")
-                    if indicators['nationality']['found']:
-                        st.write(f"- 🌍 Nationality: {indicators['nationality']['type']}")
-                    if indicators['league']['found']:
-                        st.write(f"- 🏆 League: {indicators['league']['type']}")
-                
-                with col2:
-                    st.write("**Search Analysis:**")
-                    st.write(f"- Difficulty: {analysis['search_difficulty'].title()}")
-                    st.write(f"- Query Type: {analysis['query_type'].replace('_', ' ').title()}")
-                    if indicators['attributes']:
-                        st.write(f"- Attributes: {', '.join(indicators['attributes'])}")
-            
-            # Raw results sample
-            with st.expander("🔗 Source Documents"):
-                for i, result in enumerate(report['raw_results'][:5], 1):
-                    st.markdown(f"""
-                    **{i}. {result.get('source', 'Unknown')}**  
-                    {result.get('title', 'No title')}  
-                    *{result.get('snippet', 'No snippet available')}*
-                    """)
-                    if result.get('url'):
-                        st.markdown(f"[View Source]({result['url']})")
-                    st.markdown("---")
-            
-            # Export section
-            st.markdown("### 📤 Export Report")
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename_base = f"apes_scout_{query.replace(' ', '_')}_{timestamp}"
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                if export_format in ["Markdown", "Both"]:
-                    md_report = format_enhanced_report(report)
-                    st.download_button(
-                        "📝 Download Markdown Report",
-                        md_report,
-                        f"{filename_base}.md",
-                        "text/markdown"
-                    )
-            
-            with col2:
-                if export_format in ["JSON", "Both"]:
-                    json_report = json.dumps(report, indent=2, ensure_ascii=False)
-                    st.download_button(
-                        "📊 Download JSON Data",
-                        json_report,
-                        f"{filename_base}.json",
-                        "application/json"
-                    )
-    
-    elif search_button and not query:
-        st.warning("⚠️ Please enter a search query")
     
-    # Help section
-    if not search_button:
-        st.markdown("---")
-        st.markdown("### 📚 How to Find Unknown Players")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("""
-            **🎯 Be Specific**
-            - Include position + nationality
-            - Add age category (U19, Primavera)
-            - Mention league or level
-            - Include year for recent stats
-            """)
-        
-        with col2:
-            st.markdown("""
-            **🔍 Search Tips**
-            - Use Italian terms for Italian leagues
-            - Combine multiple attributes
-            - Try team + position combos
-            - Add "goals" or "assists" for stats
-            """)
-        
-        with col3:
-            st.markdown("""
-            **📊 Best Practices**
-            - Enable deep scraping for unknowns
-            - Try multiple search variations
-            - Check youth tournaments
-            - Look for match reports
-            """)
+    display_cache_stats(cache_stats_box)
     
     # Footer
     st.markdown("---")
@@ -0,0 +1,102 @@
+"""Benchmark DOM extraction: BeautifulSoup (html.parser) vs single-pass lxml
+
+Reports CPU time per page for both parsers and flags pages where their
+extracted data differs.
+
+    python benchmarks/bench_extraction.py
+    python benchmarks/bench_extraction.py --repeat 50
+    python benchmarks/bench_extraction.py --page-cache .scout_cache/page_cache.sqlite3
+
+--page-cache benchmarks the real pages stored by the app's page cache
+instead of the bundled corpus.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from page_extractor import HAS_LXML, detect_site_type, extract_page  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+
+def load_corpus(corpus_dir: str) -> list:
+    """[(name, url, html_bytes)] from a corpus directory with an index.json"""
+
+    with open(os.path.join(corpus_dir, 'index.json'), encoding='utf-8') as f:
+        index = json.load(f)
+
+    pages = []
+    for filename, meta in index.items():
+        with open(os.path.join(corpus_dir, filename), 'rb') as f:
+            pages.append((filename, meta['url'], f.read()))
+    return pages
+
+
+def load_page_cache(path: str) -> list:
+    """[(name, url, html_bytes)] from the app's page cache database"""
+
+    conn = sqlite3.connect(path)
+    rows = conn.execute('SELECT url, html FROM page_cache ORDER BY url').fetchall()
+    conn.close()
+    return [(url.split('//', 1)[-1][:50], url, zlib.decompress(html)) for url, html in rows]
+
+
+def cpu_time_per_call(func, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=CORPUS_DIR, help='corpus directory with index.json')
+    parser.add_argument('--page-cache', help='benchmark pages stored in a page_cache.sqlite3')
+    parser.add_argument('--repeat', type=int, default=20, help='runs per page and parser')
+    args = parser.parse_args()
+
+    if not HAS_LXML:
+        sys.exit('lxml is not installed; nothing to compare against')
+
+    pages = load_page_cache(args.page_cache) if args.page_cache else load_corpus(args.corpus)
+
+    print(f"{'page':<50} {'KB':>7} {'bs4 ms':>9} {'lxml ms':>9} {'speedup':>8}  same")
+    totals = {'bs4': 0.0, 'lxml': 0.0}
+
+    for name, url, html in pages:
+        site_type = detect_site_type(url)
+        timings = {}
+        outputs = {}
+
+        for parser_name in ('bs4', 'lxml'):
+            outputs[parser_name] = extract_page(html, site_type, parser_name)
+            timings[parser_name] = cpu_time_per_call(
+                lambda: extract_page(html, site_type, parser_name), args.repeat
+            )
+            totals[parser_name] += timings[parser_name]
+
+        before, after = outputs['bs4'], outputs['lxml']
+        same = (
+            before['structured_data'] == after['structured_data']
+            and before['table_data'] == after['table_data']
+            and before['text'].split() == after['text'].split()
+        )
+
+        print(f"{name:<50} {len(html) / 1024:>7.1f} {timings['bs4'] * 1000:>9.3f} "
+              f"{timings['lxml'] * 1000:>9.3f} {timings['bs4'] / timings['lxml']:>7.1f}x  {'yes' if same else 'NO'}")
+
+    count = len(pages) or 1
+    print(f"\n{'mean CPU per page':<50} {'':>7} {totals['bs4'] / count * 1000:>9.3f} "
+          f"{totals['lxml'] / count * 1000:>9.3f} {totals['bs4'] / max(totals['lxml'], 1e-9):>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
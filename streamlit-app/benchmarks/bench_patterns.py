@@ -0,0 +1,164 @@
+"""Benchmark regex extraction: per-pattern re.search loop vs the precompiled scanner
+
+Runs over the Italian and English fixture corpus (page text extracted from
+corpus/*.html plus the search snippets in corpus/snippets.json), checks that
+both implementations extract the same fields and names, and reports CPU
+time per text.
+
+    python benchmarks/bench_patterns.py
+    python benchmarks/bench_patterns.py --repeat 200
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from page_extractor import detect_site_type, extract_page  # noqa: E402
+from text_patterns import (  # noqa: E402
+    EXTRACTION_PATTERNS, NAME_CONTEXTS, NAME_STOPWORDS, extract_fields, extract_player_names
+)
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+
+def legacy_extract_fields(text: str, site_type: str) -> dict:
+    """The original EnhancedGoogleCSE._extract_from_text loop"""
+
+    data = {}
+
+    if site_type == 'youth':
+        patterns = EXTRACTION_PATTERNS['youth']
+    elif site_type in ['transfermarkt', 'whoscored']:
+        patterns = EXTRACTION_PATTERNS.get(site_type, EXTRACTION_PATTERNS['generic'])
+    else:
+        patterns = EXTRACTION_PATTERNS['generic']
+
+    for field, pattern_list in patterns.items():
+        for pattern in pattern_list:
+            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+            if match:
+                value = match.group(1).strip()
+
+                if field in ['age', 'goals', 'assists', 'appearances']:
+                    try:
+                        data[field] = int(value)
+                        break
+                    except:
+                        continue
+                elif field == 'market_value':
+                    data[field] = legacy_market_value(value)
+                    break
+                else:
+                    if 2 < len(value) < 50:
+                        data[field] = value
+                        break
+
+    return data
+
+
+def legacy_market_value(value: str) -> str:
+    match = re.search(r'([\d.,]+)', value)
+    if match:
+        num = match.group(1).replace(',', '.')
+        try:
+            num_float = float(num)
+            if num_float < 100:
+                return f"€{num}M"
+            else:
+                return f"€{num_float/1000:.1f}M"
+        except:
+            return f"€{value}"
+    return f"€{value}"
+
+
+def legacy_extract_player_names(text: str) -> set:
+    """The original EnhancedGoogleCSE._extract_player_names, before truncation"""
+
+    names = []
+    for context in NAME_CONTEXTS:
+        names.extend(re.findall(context, text, re.MULTILINE))
+
+    cleaned_names = []
+    for name in names:
+        name = name.strip()
+        if (len(name.split()) >= 2 and
+                not any(word in name.lower() for word in NAME_STOPWORDS)):
+            cleaned_names.append(name)
+
+    return set(cleaned_names)
+
+
+def load_texts(corpus_dir: str) -> list:
+    """[(name, language, site_type, text)] for corpus pages and snippets"""
+
+    with open(os.path.join(corpus_dir, 'index.json'), encoding='utf-8') as f:
+        index = json.load(f)
+
+    texts = []
+    for filename, meta in index.items():
+        with open(os.path.join(corpus_dir, filename), 'rb') as f:
+            site_type = detect_site_type(meta['url'])
+            page = extract_page(f.read(), site_type)
+            texts.append((filename, meta['language'], site_type, page['text']))
+
+    with open(os.path.join(corpus_dir, 'snippets.json'), encoding='utf-8') as f:
+        for i, snippet in enumerate(json.load(f)):
+            texts.append((f"snippet {i + 1}", snippet['language'], 'generic', snippet['text']))
+
+    return texts
+
+
+def cpu_time_per_call(func, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=CORPUS_DIR, help='corpus directory')
+    parser.add_argument('--repeat', type=int, default=100, help='runs per text')
+    args = parser.parse_args()
+
+    texts = load_texts(args.corpus)
+    mismatches = 0
+    totals = {'before': 0.0, 'after': 0.0}
+
+    print(f"{'text':<32} {'lang':<4} {'site':<13} {'chars':>6} {'before us':>10} {'after us':>9} {'speedup':>8}  same")
+
+    for name, language, site_type, text in texts:
+        same = (
+            legacy_extract_fields(text, site_type) == extract_fields(text, site_type)
+            and legacy_extract_player_names(text) == set(extract_player_names(text, limit=None))
+        )
+        mismatches += not same
+
+        before = cpu_time_per_call(lambda: (
+            legacy_extract_fields(text, site_type), legacy_extract_player_names(text)
+        ), args.repeat)
+        after = cpu_time_per_call(lambda: (
+            extract_fields(text, site_type), extract_player_names(text)
+        ), args.repeat)
+        totals['before'] += before
+        totals['after'] += after
+
+        print(f"{name:<32} {language:<4} {site_type:<13} {len(text):>6} {before * 1e6:>10.1f} "
+              f"{after * 1e6:>9.1f} {before / after:>7.1f}x  {'yes' if same else 'NO'}")
+
+    count = len(texts) or 1
+    print(f"\n{'mean CPU per text':<58} {totals['before'] / count * 1e6:>10.1f} "
+          f"{totals['after'] / count * 1e6:>9.1f} {totals['before'] / max(totals['after'], 1e-9):>7.1f}x")
+
+    if mismatches:
+        sys.exit(f"{mismatches} text(s) extracted differently")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark recommendation scoring: per-profile Python loop vs vectorized batch
+
+Generates synthetic shortlists (10k and 100k players by default), checks
+that both implementations give every player the same decision and rounded
+scores, and reports CPU time per shortlist: the loop, the batch scorer fed a
+list of dicts (the app's path) and fed a ready DataFrame.
+
+    python benchmarks/bench_scoring.py
+    python benchmarks/bench_scoring.py --sizes 1000 10000 100000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from scoring import recommend_profiles, score_profiles  # noqa: E402
+
+
+def legacy_recommendation(profile: dict) -> dict:
+    """The original AdvancedFootballScout._generate_recommendation"""
+
+    goals = profile.get('goals', 0)
+    assists = profile.get('assists', 0)
+    age = profile.get('age', 25)
+    confidence = profile.get('confidence', 0)
+
+    total_contributions = goals + assists
+
+    if age <= 20:
+        age_factor = 1.3
+    elif age <= 25:
+        age_factor = 1.1
+    else:
+        age_factor = 0.9
+
+    performance_score = total_contributions * age_factor
+
+    confidence_factor = confidence / 100
+    final_score = performance_score * (0.7 + 0.3 * confidence_factor)
+
+    if final_score >= 20 and confidence >= 60:
+        decision = "STRONG BUY"
+        reasoning = f"Excellent output ({total_contributions} contributions) with good data confidence"
+    elif final_score >= 15 and confidence >= 50:
+        decision = "BUY"
+        reasoning = f"Strong performance ({total_contributions} contributions) justifies acquisition"
+    elif final_score >= 10 or confidence >= 40:
+        decision = "MONITOR"
+        reasoning = f"Promising profile ({total_contributions} contributions) worth tracking"
+    elif confidence >= 30:
+        decision = "SCOUT FURTHER"
+        reasoning = "Interesting profile but needs more detailed analysis"
+    else:
+        decision = "INSUFFICIENT DATA"
+        reasoning = "Limited information available for proper assessment"
+
+    return {
+        'decision': decision,
+        'reasoning': reasoning,
+        'confidence': round(confidence_factor * 100, 1),
+        'performance_score': round(final_score, 1)
+    }
+
+
+def make_profiles(count: int, seed: int = 42) -> list:
+    """Synthetic profiles shaped like consolidated ones, with some fields missing"""
+
+    rng = np.random.default_rng(seed)
+    ages = rng.integers(15, 36, count)
+    goals = rng.poisson(6, count)
+    assists = rng.poisson(4, count)
+    confidence = rng.choice([10, 20, 30, 40, 50, 60, 70, 80, 90, 100], count)
+    missing = rng.random((count, 3)) < 0.15
+
+    profiles = []
+    for i in range(count):
+        profile = {'name': f"Player {i}", 'confidence': int(confidence[i])}
+        if not missing[i, 0]:
+            profile['age'] = int(ages[i])
+        if not missing[i, 1]:
+            profile['goals'] = int(goals[i])
+        if not missing[i, 2]:
+            profile['assists'] = int(assists[i])
+        profiles.append(profile)
+    return profiles
+
+
+def cpu_time_per_call(func, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help='shortlist sizes')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per size')
+    args = parser.parse_args()
+
+    mismatches = 0
+
+    print(f"{'players':>8} {'loop ms':>10} {'batch ms':>10} {'frame ms':>10} {'speedup':>8}  same")
+
+    for size in args.sizes:
+        profiles = make_profiles(size)
+        frame = pd.DataFrame(profiles)
+
+        expected = [legacy_recommendation(p) for p in profiles]
+        actual = recommend_profiles(profiles)
+        differing = sum(e != a for e, a in zip(expected, actual))
+        mismatches += differing
+
+        loop = cpu_time_per_call(lambda: [legacy_recommendation(p) for p in profiles], args.repeat)
+        # From a list of dicts (the app's path) and from a ready DataFrame (stored/imported shortlists)
+        batch = cpu_time_per_call(lambda: score_profiles(profiles), args.repeat)
+        framed = cpu_time_per_call(lambda: score_profiles(frame), args.repeat)
+
+        print(f"{size:>8} {loop * 1000:>10.1f} {batch * 1000:>10.1f} {framed * 1000:>10.1f} "
+              f"{loop / framed:>7.1f}x  {'yes' if not differing else f'NO ({differing})'}")
+
+    if mismatches:
+        sys.exit(f"{mismatches} profile(s) scored differently")
+
+
+if __name__ == '__main__':
+    main()
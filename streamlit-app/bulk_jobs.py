@@ -0,0 +1,337 @@
+"""Persistent job queue and background runner for bulk shortlist scouting
+
+A batch is a list of queries (player names or search criteria) stored in
+SQLite together with its scouting options. Each query is a job. Workers
+claim pending jobs, run them and record a compact summary of the report.
+Every finished job is committed immediately, so the queue itself is the
+checkpoint: after a restart, interrupted jobs go back to pending and the
+batch resumes where it stopped.
+
+Workers run in background threads owned by a process-wide BulkRunner, so a
+batch keeps going when the browser tab is closed or the script reruns.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from scout_cache import cache_path
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FIELDS = ['age', 'position', 'club', 'goals', 'assists', 'market_value']
+
+
+def summarize_report(report: dict) -> dict:
+    """The parts of a scouting report kept per job (one entry per recommendation)"""
+
+    return {
+        'profiles_found': report['search_summary']['profiles_found'],
+        'data_quality': report['metadata']['data_quality_score'],
+        'answered_from_store': bool(report['metadata'].get('answered_from_store')),
+        'players': [
+            dict(
+                {
+                    'player': rec['player'],
+                    'decision': rec['decision'],
+                    'confidence': rec['confidence'],
+                    'sources': ', '.join(rec['profile'].get('sources', [])[:5])
+                },
+                **{field: rec['profile'].get(field) for field in SUMMARY_FIELDS}
+            )
+            for rec in report['recommendations']
+        ]
+    }
+
+
+class JobQueue:
+    """SQLite-backed queue of bulk scouting jobs"""
+
+    def __init__(self, path: str, max_attempts: int = 2):
+        self.path = path
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS batches (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                options TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                paused INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                batch_id TEXT NOT NULL REFERENCES batches(id),
+                position INTEGER NOT NULL,
+                query TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                result TEXT,
+                started_at REAL,
+                finished_at REAL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_batch_status ON jobs(batch_id, status, position)')
+        self._conn.commit()
+
+    def create_batch(self, name: str, queries: list, options: dict) -> str:
+        """Enqueue `queries` as a new batch and return its id"""
+
+        batch_id = uuid.uuid4().hex[:12]
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO batches (id, name, options, created_at) VALUES (?, ?, ?, ?)',
+                (batch_id, name, json.dumps(options), time.time())
+            )
+            self._conn.executemany(
+                'INSERT INTO jobs (batch_id, position, query) VALUES (?, ?, ?)',
+                [(batch_id, position, query) for position, query in enumerate(queries)]
+            )
+            self._conn.commit()
+
+        return batch_id
+
+    def claim(self):
+        """Mark the next pending job as running and return (job_id, query, options), or None
+
+        Batches are served oldest first; paused batches are skipped.
+        """
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT j.id, j.query, b.options FROM jobs j JOIN batches b ON b.id = j.batch_id "
+                "WHERE j.status = 'pending' AND b.paused = 0 ORDER BY b.created_at, j.position LIMIT 1"
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ? WHERE id = ?",
+                (time.time(), row[0])
+            )
+            self._conn.commit()
+
+        return row[0], row[1], json.loads(row[2])
+
+    def complete(self, job_id: int, result: dict):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', error = NULL, result = ?, finished_at = ? WHERE id = ?",
+                (json.dumps(result, ensure_ascii=False), time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def fail(self, job_id: int, error: str):
+        """Record a failure; the job is retried until it has used max_attempts"""
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+                "error = ?, finished_at = ? WHERE id = ?",
+                (self.max_attempts, error, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def requeue_interrupted(self) -> int:
+        """Return jobs left running by a previous process to pending"""
+
+        with self._lock:
+            count = self._conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0) WHERE status = 'running'"
+            ).rowcount
+            self._conn.commit()
+
+        return count
+
+    def set_paused(self, batch_id: str, paused: bool):
+        with self._lock:
+            self._conn.execute('UPDATE batches SET paused = ? WHERE id = ?', (int(paused), batch_id))
+            self._conn.commit()
+
+    def batch(self, batch_id: str):
+        """Batch dict with options and job counts, or None"""
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, name, options, created_at, paused FROM batches WHERE id = ?', (batch_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            counts = dict(self._conn.execute(
+                'SELECT status, COUNT(*) FROM jobs WHERE batch_id = ? GROUP BY status', (batch_id,)
+            ).fetchall())
+
+        return self._batch_dict(row, counts)
+
+    def batches(self, limit: int = 20) -> list:
+        """Most recent batches first"""
+
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                'SELECT id FROM batches ORDER BY created_at DESC LIMIT ?', (limit,)
+            ).fetchall()]
+
+        return [self.batch(batch_id) for batch_id in ids]
+
+    def has_pending(self) -> bool:
+        """Whether any unpaused batch still has pending jobs"""
+
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM jobs j JOIN batches b ON b.id = j.batch_id "
+                "WHERE j.status = 'pending' AND b.paused = 0 LIMIT 1"
+            ).fetchone() is not None
+
+    def results_frame(self, batch_id: str) -> pd.DataFrame:
+        """One row per (query, recommended player); queries without players get one row"""
+
+        with self._lock:
+            jobs = self._conn.execute(
+                'SELECT position, query, status, attempts, error, result, finished_at FROM jobs '
+                'WHERE batch_id = ? ORDER BY position',
+                (batch_id,)
+            ).fetchall()
+
+        rows = []
+        for position, query, status, attempts, error, result, finished_at in jobs:
+            base = {
+                'row': position + 1,
+                'query': query,
+                'status': status,
+                'attempts': attempts,
+                'error': error,
+                'finished_at': pd.to_datetime(finished_at, unit='s') if finished_at else None
+            }
+            summary = json.loads(result) if result else {}
+            base['profiles_found'] = summary.get('profiles_found')
+            base['data_quality'] = summary.get('data_quality')
+            base['answered_from_store'] = summary.get('answered_from_store')
+
+            players = summary.get('players') or [{}]
+            for rank, player in enumerate(players, 1):
+                rows.append(dict(base, rank=rank if player else None, **player))
+
+        columns = (
+            ['row', 'query', 'status', 'rank', 'player', 'decision', 'confidence'] + SUMMARY_FIELDS +
+            ['sources', 'profiles_found', 'data_quality', 'answered_from_store', 'attempts', 'error', 'finished_at']
+        )
+        frame = pd.DataFrame(rows).reindex(columns=columns)
+        for column in ['rank', 'age', 'goals', 'assists', 'profiles_found']:
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').round().astype('Int64')
+        return frame
+
+    @staticmethod
+    def _batch_dict(row, counts: dict) -> dict:
+        total = sum(counts.values())
+        return {
+            'id': row[0],
+            'name': row[1],
+            'options': json.loads(row[2]),
+            'created_at': row[3],
+            'paused': bool(row[4]),
+            'total': total,
+            'pending': counts.get('pending', 0),
+            'running': counts.get('running', 0),
+            'done': counts.get('done', 0),
+            'failed': counts.get('failed', 0)
+        }
+
+
+class BulkRunner:
+    """Bounded pool of background workers draining a JobQueue
+
+    `scout_fn(query, **options)` returns a scouting report. At most
+    `max_workers` jobs run at once across all batches; HTTP rate limits are
+    enforced by the scout engine's shared per-host limiter.
+    """
+
+    def __init__(self, queue: JobQueue, scout_fn, max_workers: int = 2):
+        self.queue = queue
+        self.scout_fn = scout_fn
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def start(self):
+        """Start workers (up to max_workers) if there is pending work"""
+
+        if not self.queue.has_pending():
+            return
+
+        with self._lock:
+            self._workers = [worker for worker in self._workers if worker.is_alive()]
+            for _ in range(self.max_workers - len(self._workers)):
+                worker = threading.Thread(target=self._work, name='bulk-scout-worker', daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def pause(self, batch_id: str):
+        """Stop claiming jobs from a batch; running jobs finish normally"""
+
+        self.queue.set_paused(batch_id, True)
+
+    def resume(self, batch_id: str):
+        self.queue.set_paused(batch_id, False)
+        self.start()
+
+    def active_workers(self) -> int:
+        with self._lock:
+            return sum(worker.is_alive() for worker in self._workers)
+
+    def _work(self):
+        while True:
+            job = self.queue.claim()
+            if job is None:
+                # Leave the pool under the runner lock: a batch enqueued since the
+                # claim either is seen here or finds this worker gone and starts a new one
+                with self._lock:
+                    if self.queue.has_pending():
+                        continue
+                    self._workers.remove(threading.current_thread())
+                    return
+
+            job_id, query, options = job
+            try:
+                report = self.scout_fn(query, **options)
+                self.queue.complete(job_id, summarize_report(report))
+            except Exception as e:
+                logger.exception("Bulk scouting job %s (%r) failed", job_id, query)
+                self.queue.fail(job_id, str(e))
+
+
+_bulk_runners = {}
+_bulk_runners_lock = threading.Lock()
+
+
+def get_bulk_runner(scout_fn, path: str = None, max_workers: int = 2, auto_resume: bool = True) -> BulkRunner:
+    """Return the process-wide BulkRunner for the queue at `path`
+
+    On first use in a process, jobs left running by a previous process are
+    requeued and, with `auto_resume`, unfinished batches start again.
+    """
+
+    path = path or cache_path('bulk_jobs.sqlite3')
+
+    with _bulk_runners_lock:
+        if path not in _bulk_runners:
+            queue = JobQueue(path)
+            queue.requeue_interrupted()
+            _bulk_runners[path] = BulkRunner(queue, scout_fn, max_workers)
+            if auto_resume:
+                _bulk_runners[path].start()
+        return _bulk_runners[path]
@@ -0,0 +1,272 @@
+"""DOM extraction for scraped pages
+
+`extract_page` returns the page text plus the data found in JSON-LD,
+site-specific markup (Transfermarkt, youth sites) and stats tables.
+
+With lxml installed this is a single walk over the tree; otherwise it falls
+back to BeautifulSoup with html.parser and one search per data source.
+"""
+
+import json
+import re
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+YOUTH_CATEGORY_RE = re.compile(r'U(\d{2})|Under[- ]?(\d{2})')
+MARKET_VALUE_RE = re.compile(r'€([\d.,]+)(?:m|Mio)')
+FIRST_NUMBER_RE = re.compile(r'(\d+)')
+
+# Elements whose text is not part of the visible page text
+NON_TEXT_TAGS = {'script', 'style', 'template'}
+STATS_HEADERS = ['goals', 'assists', 'gol', 'reti']
+
+
+def detect_site_type(url: str) -> str:
+    """Detect website type for targeted extraction"""
+
+    url_lower = url.lower()
+
+    if 'transfermarkt' in url_lower:
+        return 'transfermarkt'
+    elif 'whoscored' in url_lower:
+        return 'whoscored'
+    elif any(site in url_lower for site in ['nextgen', 'youth', 'primavera', 'giovanili']):
+        return 'youth'
+    elif 'tuttomercatoweb' in url_lower or 'calciomercato' in url_lower:
+        return 'italian'
+    else:
+        return 'generic'
+
+
+def default_parser() -> str:
+    return 'lxml' if HAS_LXML else 'bs4'
+
+
+def extract_page(html: bytes, site_type: str, parser: str = None) -> dict:
+    """Extract text, structured data and table stats from a page
+
+    Returns {'text', 'structured_data', 'table_data'}.
+    """
+
+    parser = parser or default_parser()
+    if parser == 'lxml':
+        return _extract_page_lxml(html, site_type)
+    return _extract_page_bs4(html, site_type)
+
+
+def parse_json_ld(json_data: dict) -> dict:
+    """Parse JSON-LD structured data"""
+
+    data = {}
+
+    if json_data.get('name'):
+        data['structured_name'] = json_data['name']
+    if json_data.get('birthDate'):
+        # Calculate age from birthdate
+        try:
+            birth_year = int(json_data['birthDate'][:4])
+            data['age'] = datetime.now().year - birth_year
+        except:
+            pass
+
+    return data
+
+
+def _json_ld_data(raw: str) -> dict:
+    try:
+        json_data = json.loads(raw)
+        if isinstance(json_data, dict):
+            if json_data.get('@type') in ['Person', 'SportsTeam']:
+                return parse_json_ld(json_data)
+    except:
+        pass
+    return {}
+
+
+def _youth_data(text: str) -> dict:
+    match = YOUTH_CATEGORY_RE.search(text)
+    if not match:
+        return {}
+    age = match.group(1) or match.group(2)
+    return {
+        'youth_category': f"U{age}",
+        'estimated_age': int(age) - 1  # Approximate age
+    }
+
+
+def _market_value_data(value_text: str) -> dict:
+    match = MARKET_VALUE_RE.search(value_text)
+    if match:
+        return {'market_value': f"€{match.group(1)}M"}
+    return {}
+
+
+def _info_row_data(label_text: str, value_text: str) -> dict:
+    if 'age' in label_text or 'alter' in label_text:
+        age_match = FIRST_NUMBER_RE.search(value_text)
+        if age_match:
+            return {'age': int(age_match.group(1))}
+    elif 'position' in label_text:
+        return {'position': value_text}
+    return {}
+
+
+def _table_stats(headers: list, rows: list) -> dict:
+    """Goals/assists from the first rows of a stats table (rows are lists of cell texts)"""
+
+    data = {}
+
+    if not any(stat in headers for stat in STATS_HEADERS):
+        return data
+
+    for cells in rows[:5]:  # Limit to first 5 rows
+        if len(cells) < 2:
+            continue
+        for i, header in enumerate(headers):
+            if i < len(cells):
+                if 'goal' in header or 'gol' in header:
+                    try:
+                        data['table_goals'] = int(cells[i].strip())
+                    except:
+                        pass
+                elif 'assist' in header:
+                    try:
+                        data['table_assists'] = int(cells[i].strip())
+                    except:
+                        pass
+
+    return data
+
+
+def _has_class(element, class_name: str) -> bool:
+    return class_name in (element.get('class') or '').split()
+
+
+def _extract_page_lxml(html: bytes, site_type: str) -> dict:
+    """Single pass over the lxml tree collecting text, JSON-LD, site markup and tables"""
+
+    root = lxml_html.document_fromstring(html)
+
+    text_parts = []
+    structured_data = {}
+    site_data = {}
+    table_data = {}
+    market_value_found = False
+    info_table_found = False
+    skip_depth = 0
+
+    for event, element in etree.iterwalk(root, events=('start', 'end')):
+        tag = element.tag
+
+        if event == 'end':
+            if isinstance(tag, str) and tag in NON_TEXT_TAGS:
+                skip_depth -= 1
+            if element.tail and skip_depth == 0:
+                text_parts.append(element.tail)
+                if site_type == 'youth':
+                    site_data.update(_youth_data(element.tail))
+            continue
+
+        # Comments and processing instructions only contribute their tail
+        if not isinstance(tag, str):
+            continue
+
+        if tag in NON_TEXT_TAGS:
+            skip_depth += 1
+            if tag == 'script' and element.get('type') == 'application/ld+json' and element.text:
+                structured_data.update(_json_ld_data(element.text))
+            continue
+
+        if element.text and skip_depth == 0:
+            text_parts.append(element.text)
+            if site_type == 'youth':
+                site_data.update(_youth_data(element.text))
+
+        if tag == 'table':
+            headers = [th.text_content().strip().lower() for th in element.iter('th')]
+            if any(stat in headers for stat in STATS_HEADERS):
+                rows = [
+                    [cell.text_content() for cell in row.iter('td', 'th')]
+                    for row in list(element.iter('tr'))[1:6]
+                ]
+                table_data.update(_table_stats(headers, rows))
+
+            if site_type == 'transfermarkt' and not info_table_found and _has_class(element, 'auflistung'):
+                info_table_found = True
+                for row in element.iter('tr'):
+                    label = next(row.iter('th'), None)
+                    value = next(row.iter('td'), None)
+                    if label is not None and value is not None:
+                        site_data.update(_info_row_data(
+                            label.text_content().strip().lower(),
+                            value.text_content().strip()
+                        ))
+
+        elif tag == 'div' and site_type == 'transfermarkt' and not market_value_found and _has_class(element, 'dataMarktwert'):
+            market_value_found = True
+            site_data.update(_market_value_data(element.text_content()))
+
+    structured_data.update(site_data)
+
+    return {
+        'text': ''.join(text_parts),
+        'structured_data': structured_data,
+        'table_data': table_data
+    }
+
+
+def _extract_page_bs4(html: bytes, site_type: str) -> dict:
+    """BeautifulSoup fallback: one search per data source"""
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    structured_data = {}
+
+    # Try to extract JSON-LD data first
+    for script in soup.find_all('script', {'type': 'application/ld+json'}):
+        if script.string:
+            structured_data.update(_json_ld_data(script.string))
+
+    # Site-specific extraction
+    if site_type == 'transfermarkt':
+        value_elem = soup.find('div', {'class': 'dataMarktwert'})
+        if value_elem:
+            structured_data.update(_market_value_data(value_elem.get_text()))
+
+        info_table = soup.find('table', {'class': 'auflistung'})
+        if info_table:
+            for row in info_table.find_all('tr'):
+                label = row.find('th')
+                value = row.find('td')
+                if label and value:
+                    structured_data.update(_info_row_data(
+                        label.get_text().strip().lower(),
+                        value.get_text().strip()
+                    ))
+    elif site_type == 'youth':
+        for elem in soup.find_all(string=YOUTH_CATEGORY_RE):
+            structured_data.update(_youth_data(elem))
+
+    # Stats tables
+    table_data = {}
+    for table in soup.find_all('table'):
+        headers = [th.get_text().strip().lower() for th in table.find_all('th')]
+        rows = [
+            [cell.get_text() for cell in row.find_all(['td', 'th'])]
+            for row in table.find_all('tr')[1:6]
+        ]
+        table_data.update(_table_stats(headers, rows))
+
+    return {
+        'text': soup.get_text(),
+        'structured_data': structured_data,
+        'table_data': table_data
+    }
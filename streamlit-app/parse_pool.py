@@ -0,0 +1,179 @@
+"""Page parsing, in-process or on a pool of worker processes
+
+`parse_page` turns fetched HTML into the compact result dict stored with
+each search result. `ParsePool` runs it in worker processes so large pages
+do not hold the GIL in the Streamlit server process; only the HTML goes in
+and only the result dict comes back.
+
+Each page gets a CPU time budget. The worker interrupts the parse with
+SIGPROF when the budget runs out; a parse stuck inside C code (lxml, re)
+is killed by an RLIMIT_CPU backstop at twice the budget, and the pool is
+restarted.
+"""
+
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import resource
+except ImportError:  # Windows: budgets are not enforced
+    resource = None
+
+from page_extractor import detect_site_type, extract_page
+from text_patterns import extract_fields, extract_player_names
+
+
+class PageBudgetExceeded(BaseException):
+    """Raised in a worker when a page uses up its CPU budget
+
+    BaseException so the broad `except Exception` in parse_page does not
+    swallow it.
+    """
+
+
+def parse_page(html: bytes, url: str) -> dict:
+    """Parse a fetched page and extract player data"""
+
+    try:
+        site_type = detect_site_type(url)
+
+        # Single pass over the DOM: structured data, tables and page text
+        page = extract_page(html, site_type)
+        extracted_data = page['structured_data']
+        page_text = page['text']
+
+        # Extract names (for youth/unknown players)
+        extracted_names = extract_player_names(page_text)
+        if extracted_names:
+            extracted_data['extracted_names'] = extracted_names
+
+        # Extract stats from text
+        text_data = extract_fields(page_text, site_type)
+        extracted_data.update(text_data)
+
+        # Extract from tables
+        extracted_data.update(page['table_data'])
+
+        return {
+            'scraped_data': extracted_data,
+            'scraping_success': True,
+            'page_size': len(page_text)
+        }
+
+    except Exception as e:
+        return {
+            'scraping_success': False,
+            'scraping_error': str(e)
+        }
+
+
+def budget_exceeded_result(cpu_budget: float) -> dict:
+    return {
+        'scraping_success': False,
+        'scraping_error': f"Page parse exceeded CPU budget of {cpu_budget}s"
+    }
+
+
+def _on_budget_exceeded(signum, frame):
+    raise PageBudgetExceeded()
+
+
+def _init_worker():
+    if hasattr(signal, 'SIGPROF'):
+        signal.signal(signal.SIGPROF, _on_budget_exceeded)
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _parse_in_worker(html: bytes, url: str, cpu_budget: float) -> dict:
+    """Worker entry point: parse one page within its CPU budget"""
+
+    if not cpu_budget or resource is None or not hasattr(signal, 'setitimer'):
+        return parse_page(html, url)
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    backstop = int(_cpu_seconds() + cpu_budget * 2) + 1
+    if hard == resource.RLIM_INFINITY or backstop <= hard:
+        resource.setrlimit(resource.RLIMIT_CPU, (backstop, hard))
+
+    signal.setitimer(signal.ITIMER_PROF, cpu_budget)
+    try:
+        return parse_page(html, url)
+    except PageBudgetExceeded:
+        return budget_exceeded_result(cpu_budget)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+class ParsePool:
+    """Process pool for page parsing that survives workers killed by the CPU backstop"""
+
+    def __init__(self, workers: int = None, cpu_budget: float = 5.0):
+        self.workers = workers or os.cpu_count() or 2
+        self.cpu_budget = cpu_budget
+
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: the Streamlit server is multi-threaded, so forking it is unsafe
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+
+    def _restart(self, generation: int):
+        """Replace a broken executor, once per breakage"""
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            self._generation += 1
+
+    def parse(self, html: bytes, url: str) -> dict:
+        """Parse a page in a worker process (blocks the calling thread)"""
+
+        # One retry: the pool may have been broken by a different page
+        for attempt in range(2):
+            with self._lock:
+                executor = self._executor
+                generation = self._generation
+
+            try:
+                return executor.submit(_parse_in_worker, html, url, self.cpu_budget).result()
+            except BrokenProcessPool:
+                self._restart(generation)
+
+        # Killed twice: this page is the pathological one
+        return budget_exceeded_result(self.cpu_budget)
+
+    def shutdown(self):
+        with self._lock:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_parse_pools = {}
+_parse_pools_lock = threading.Lock()
+
+
+def get_parse_pool(workers: int = None, cpu_budget: float = 5.0) -> ParsePool:
+    """Process-wide pool per configuration, shared by every session"""
+
+    key = (workers, cpu_budget)
+
+    with _parse_pools_lock:
+        if key not in _parse_pools:
+            _parse_pools[key] = ParsePool(workers, cpu_budget)
+        return _parse_pools[key]
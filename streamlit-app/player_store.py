@@ -0,0 +1,357 @@
+"""Persistent local store of consolidated player profiles
+
+Every profile the scout builds is upserted here together with the
+observations it came from (field, value, source, URL, time), so knowledge
+accumulates across searches instead of being rebuilt from five results
+each time. Profiles are re-consolidated from all stored observations on
+every upsert.
+
+Names and clubs are indexed with an FTS5 trigram table for fuzzy lookup
+("Kvaratskelia", "Leao", "Rossi Mario"); candidates are re-ranked with
+difflib. SQLite builds without FTS5 trigram support fall back to LIKE
+scans over the normalized keys.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from scout_cache import cache_path
+
+NUMERIC_FIELDS = ['goals', 'assists', 'age']
+
+
+def normalize_name(value: str) -> str:
+    """Case, accent and punctuation insensitive key for names and clubs"""
+
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    cleaned = ''.join(c if c.isalnum() else ' ' for c in stripped.casefold())
+    return ' '.join(cleaned.split())
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Similarity of normalized name `a` to `b`, ignoring word order
+
+    A shorter `a` is also compared with each run of as many words in `b`
+    ("kvaratskelia" against "khvicha kvaratskhelia"), slightly discounted
+    so full-name matches rank first.
+    """
+
+    if not a or not b:
+        return 0.0
+    direct = SequenceMatcher(None, a, b).ratio()
+    reordered = SequenceMatcher(None, ' '.join(sorted(a.split())), ' '.join(sorted(b.split()))).ratio()
+
+    a_words, b_words = a.split(), b.split()
+    partial = 0.0
+    for i in range(len(b_words) - len(a_words) + 1 if len(a_words) < len(b_words) else 0):
+        window = ' '.join(b_words[i:i + len(a_words)])
+        partial = max(partial, SequenceMatcher(None, a, window).ratio() * 0.95)
+
+    return max(direct, reordered, partial)
+
+
+def consolidate_fields(data_points: list) -> dict:
+    """Select the best value per field from [{'field', 'value', ...}] observations
+
+    Numeric fields take the maximum; text fields take the most common value
+    (first seen wins ties).
+    """
+
+    field_values = defaultdict(list)
+    for dp in data_points:
+        field_values[dp['field']].append(dp['value'])
+
+    consolidated = {}
+    for field, values in field_values.items():
+        if field in NUMERIC_FIELDS:
+            numeric_values = []
+            for value in values:
+                try:
+                    numeric_values.append(int(value))
+                except (TypeError, ValueError):
+                    pass
+            if numeric_values:
+                consolidated[field] = max(numeric_values)
+        else:
+            value_counts = defaultdict(int)
+            for value in values:
+                value_counts[value] += 1
+            if value_counts:
+                consolidated[field] = max(value_counts.items(), key=lambda x: x[1])[0]
+
+    return consolidated
+
+
+class PlayerStore:
+    """SQLite store of player profiles with per-source provenance
+
+    Profiles older than `ttl` seconds are reported as stale so callers can
+    re-enrich them from the web.
+    """
+
+    def __init__(self, path: str, ttl: int = 7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'stale': 0, 'misses': 0, 'upserts': 0}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS players (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                name_key TEXT NOT NULL UNIQUE,
+                club TEXT,
+                club_key TEXT,
+                profile TEXT NOT NULL,
+                confidence INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS player_facts (
+                player_id INTEGER NOT NULL REFERENCES players(id),
+                field TEXT NOT NULL,
+                value TEXT NOT NULL,
+                source TEXT NOT NULL,
+                url TEXT NOT NULL DEFAULT '',
+                observed_at REAL NOT NULL,
+                PRIMARY KEY (player_id, field, source, url)
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_players_club ON players(club_key)')
+
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS players_fts USING fts5(name_key, club_key, tokenize='trigram')"
+            )
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite older than 3.34 or built without FTS5
+            self.has_fts = False
+        self._conn.commit()
+
+    def upsert(self, profile: dict, data_points: list = None) -> dict:
+        """Merge a freshly consolidated profile into the store and return the stored profile
+
+        `data_points` are the observations behind the profile:
+        [{'field', 'value', 'source', 'url'}]. The latest observation per
+        (field, source, URL) replaces the previous one, so two pages of the
+        same site count as two observations, as they do in consolidate_fields.
+        """
+
+        name = profile.get('name')
+        name_key = normalize_name(name)
+        if not name_key:
+            raise ValueError('profile has no name to store')
+
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, profile, created_at FROM players WHERE name_key = ?', (name_key,)
+            ).fetchone()
+
+            if row is None:
+                stored = {}
+                created_at = now
+                player_id = self._conn.execute(
+                    'INSERT INTO players (name, name_key, profile, confidence, created_at, updated_at) '
+                    'VALUES (?, ?, ?, 0, ?, ?)',
+                    (name, name_key, '{}', now, now)
+                ).lastrowid
+            else:
+                player_id, stored, created_at = row[0], json.loads(row[1]), row[2]
+
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO player_facts (player_id, field, value, source, url, observed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(player_id, dp['field'], json.dumps(dp['value'], ensure_ascii=False),
+                  dp.get('source') or 'Unknown', dp.get('url') or '', now)
+                 for dp in data_points or []]
+            )
+
+            provenance = self._provenance(player_id)
+            sources = list(dict.fromkeys(
+                stored.get('sources', []) + profile.get('sources', []) + [p['source'] for p in provenance]
+            ))
+
+            merged = {
+                'name': stored.get('name', name),
+                'confidence': min(max(stored.get('confidence', 0), profile.get('confidence', 0)), 100),
+                'sources': sources,
+                'source_count': len(sources)
+            }
+            merged.update(consolidate_fields(provenance))
+
+            club = merged.get('club')
+            self._conn.execute(
+                'UPDATE players SET club = ?, club_key = ?, profile = ?, confidence = ?, updated_at = ? '
+                'WHERE id = ?',
+                (club, normalize_name(club) or None, json.dumps(merged, ensure_ascii=False),
+                 merged['confidence'], now, player_id)
+            )
+            if self.has_fts:
+                self._conn.execute('DELETE FROM players_fts WHERE rowid = ?', (player_id,))
+                self._conn.execute(
+                    'INSERT INTO players_fts (rowid, name_key, club_key) VALUES (?, ?, ?)',
+                    (player_id, name_key, normalize_name(club))
+                )
+            self._conn.commit()
+            self.stats['upserts'] += 1
+
+        return self._with_store_info(merged, created_at, now, provenance)
+
+    def get(self, name: str):
+        """Stored profile for an exact (normalized) name, or None"""
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, profile, created_at, updated_at FROM players WHERE name_key = ?',
+                (normalize_name(name),)
+            ).fetchone()
+
+            if row is None:
+                return None
+            return self._with_store_info(json.loads(row[1]), row[2], row[3], self._provenance(row[0]))
+
+    def find_by_name(self, name: str, limit: int = 5, min_similarity: float = 0.8) -> list:
+        """Stored profiles whose name fuzzily matches `name`, best match first"""
+
+        return self._find('name_key', name, limit, min_similarity)
+
+    def find_by_club(self, club: str, limit: int = 20, min_similarity: float = 0.75) -> list:
+        """Stored profiles whose club fuzzily matches `club`, best match first"""
+
+        return self._find('club_key', club, limit, min_similarity)
+
+    def lookup(self, name: str, limit: int = 5, min_similarity: float = 0.8) -> tuple:
+        """Return (profiles, state) for a name query
+
+        Only matches about as close as the best one are kept, so "Mario Rossi"
+        does not also return "Marco Rossi". state is 'fresh' when every match
+        is younger than the TTL, 'stale' when some need re-enrichment, and
+        None when nothing matched.
+        """
+
+        profiles = self.find_by_name(name, limit, min_similarity)
+        if profiles:
+            best = profiles[0]['store']['similarity']
+            profiles = [p for p in profiles if p['store']['similarity'] >= best - 0.03]
+
+        if not profiles:
+            state = None
+        elif any(p['store']['stale'] for p in profiles):
+            state = 'stale'
+        else:
+            state = 'fresh'
+
+        with self._lock:
+            self.stats[{'fresh': 'hits', 'stale': 'stale', None: 'misses'}[state]] += 1
+
+        return profiles, state
+
+    def size(self) -> int:
+        """Number of stored players"""
+
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM players').fetchone()[0]
+
+    def _find(self, column: str, text: str, limit: int, min_similarity: float) -> list:
+        key = normalize_name(text)
+        if not key:
+            return []
+
+        with self._lock:
+            candidates = self._candidates(column, key)
+
+            scored = []
+            for player_id, candidate_key in candidates:
+                score = name_similarity(key, candidate_key)
+                if score >= min_similarity:
+                    scored.append((score, player_id))
+            scored.sort(reverse=True)
+
+            profiles = []
+            for score, player_id in scored[:limit]:
+                row = self._conn.execute(
+                    'SELECT profile, created_at, updated_at FROM players WHERE id = ?', (player_id,)
+                ).fetchone()
+                profile = self._with_store_info(json.loads(row[0]), row[1], row[2], self._provenance(player_id))
+                profile['store']['similarity'] = round(score, 3)
+                profiles.append(profile)
+
+        return profiles
+
+    def _candidates(self, column: str, key: str, max_candidates: int = 200) -> list:
+        """[(player_id, key)] sharing at least one trigram (or word) with `key`"""
+
+        if self.has_fts and len(key) >= 3:
+            trigrams = {key[i:i + 3] for i in range(len(key) - 2)}
+            # FTS5 string literals: double quotes, doubled inside (not JSON escapes,
+            # which would turn non-ASCII trigrams into \uXXXX text that matches nothing)
+            quoted = ('"' + t.replace('"', '""') + '"' for t in sorted(trigrams))
+            match = f"{column} : ({' OR '.join(quoted)})"
+            try:
+                return self._conn.execute(
+                    f'SELECT p.id, p.{column} FROM players_fts JOIN players p ON p.id = players_fts.rowid '
+                    'WHERE players_fts MATCH ? ORDER BY bm25(players_fts) LIMIT ?',
+                    (match, max_candidates)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                pass
+
+        words = [word for word in key.split() if len(word) >= 3] or [key]
+        where = ' OR '.join(f'{column} LIKE ?' for _ in words)
+        return self._conn.execute(
+            f'SELECT id, {column} FROM players WHERE {column} IS NOT NULL AND ({where}) LIMIT ?',
+            [f'%{word}%' for word in words] + [max_candidates]
+        ).fetchall()
+
+    def _provenance(self, player_id: int) -> list:
+        rows = self._conn.execute(
+            'SELECT field, value, source, url, observed_at FROM player_facts '
+            'WHERE player_id = ? ORDER BY observed_at DESC, rowid',
+            (player_id,)
+        ).fetchall()
+        # Newest first, and in the order they were observed within a search, so
+        # consolidate_fields breaks ties the same way as on the live data points
+        return [
+            {'field': field, 'value': json.loads(value), 'source': source, 'url': url or None,
+             'observed_at': observed_at}
+            for field, value, source, url, observed_at in rows
+        ]
+
+    def _with_store_info(self, profile: dict, created_at: float, updated_at: float, provenance: list) -> dict:
+        profile = dict(profile)
+        profile['provenance'] = provenance
+        profile['store'] = {
+            'first_seen': created_at,
+            'updated_at': updated_at,
+            'stale': time.time() - updated_at >= self.ttl
+        }
+        return profile
+
+
+_player_stores = {}
+_player_stores_lock = threading.Lock()
+
+
+def get_player_store(path: str = None, **kwargs) -> PlayerStore:
+    """Return the process-wide PlayerStore for `path`"""
+
+    path = path or cache_path('players.sqlite3')
+
+    with _player_stores_lock:
+        if path not in _player_stores:
+            _player_stores[path] = PlayerStore(path, **kwargs)
+        return _player_stores[path]
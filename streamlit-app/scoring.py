@@ -0,0 +1,147 @@
+"""Vectorized recommendation scoring for batches of player profiles
+
+`score_profiles` computes the same age factor, performance score,
+confidence adjustment and decision as the original per-profile
+`_generate_recommendation`, for a whole DataFrame at once, so shortlists
+of thousands of stored or imported players score in milliseconds.
+
+Every constant of the model is a weight that can be overridden (for
+example from a `[SCORING_WEIGHTS]` table in secrets.toml).
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_WEIGHTS = {
+    # Contribution weights per goal and per assist
+    'goals': 1.0,
+    'assists': 1.0,
+    # Age factor: young up to young_age, prime up to prime_age, veteran above
+    'young_age': 20,
+    'young_factor': 1.3,
+    'prime_age': 25,
+    'prime_factor': 1.1,
+    'veteran_factor': 0.9,
+    'default_age': 25,
+    # Final score = performance * (confidence_floor + confidence_weight * confidence / 100)
+    'confidence_floor': 0.7,
+    'confidence_weight': 0.3,
+    # Decision thresholds
+    'strong_buy_score': 20,
+    'strong_buy_confidence': 60,
+    'buy_score': 15,
+    'buy_confidence': 50,
+    'monitor_score': 10,
+    'monitor_confidence': 40,
+    'scout_further_confidence': 30
+}
+
+DECISIONS = ['STRONG BUY', 'BUY', 'MONITOR', 'SCOUT FURTHER']
+DEFAULT_DECISION = 'INSUFFICIENT DATA'
+
+REASONING = {
+    'STRONG BUY': "Excellent output ({contributions} contributions) with good data confidence",
+    'BUY': "Strong performance ({contributions} contributions) justifies acquisition",
+    'MONITOR': "Promising profile ({contributions} contributions) worth tracking",
+    'SCOUT FURTHER': "Interesting profile but needs more detailed analysis",
+    'INSUFFICIENT DATA': "Limited information available for proper assessment"
+}
+
+
+def make_weights(overrides: dict = None) -> dict:
+    """DEFAULT_WEIGHTS with `overrides` applied; unknown keys raise ValueError"""
+
+    weights = dict(DEFAULT_WEIGHTS)
+    if overrides:
+        unknown = set(overrides) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown scoring weights: {', '.join(sorted(unknown))}")
+        weights.update({key: float(value) for key, value in overrides.items()})
+    return weights
+
+
+def _column(df: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    if name not in df:
+        return np.full(len(df), default, dtype='float64')
+    return pd.to_numeric(df[name], errors='coerce').fillna(default).to_numpy(dtype='float64')
+
+
+def _round(values: np.ndarray, digits: int) -> np.ndarray:
+    """np.round, with exact ties resolved like Python's round() (9.35 -> 9.3)"""
+
+    rounded = np.round(values, digits)
+    scaled = values * 10 ** digits
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6):
+        rounded[i] = round(float(values[i]), digits)
+    return rounded
+
+
+def score_profiles(profiles, weights: dict = None) -> pd.DataFrame:
+    """Score a DataFrame (or list of dicts) of profiles
+
+    Missing goals/assists count as 0, a missing age as `default_age` and a
+    missing confidence as 0. Returns a DataFrame on the same index with
+    contributions, age_factor, raw_performance, confidence_factor,
+    final_score and decision, plus the rounded `confidence` and
+    `performance_score` values reported by the app.
+    """
+
+    df = profiles if isinstance(profiles, pd.DataFrame) else pd.DataFrame(list(profiles))
+    w = weights or DEFAULT_WEIGHTS
+
+    goals = _column(df, 'goals', 0)
+    assists = _column(df, 'assists', 0)
+    age = _column(df, 'age', w['default_age'])
+    confidence = _column(df, 'confidence', 0)
+
+    age_factor = np.select(
+        [age <= w['young_age'], age <= w['prime_age']],
+        [w['young_factor'], w['prime_factor']],
+        w['veteran_factor']
+    )
+
+    performance = (goals * w['goals'] + assists * w['assists']) * age_factor
+    confidence_factor = confidence / 100
+    final_score = performance * (w['confidence_floor'] + w['confidence_weight'] * confidence_factor)
+
+    decision = np.select(
+        [
+            (final_score >= w['strong_buy_score']) & (confidence >= w['strong_buy_confidence']),
+            (final_score >= w['buy_score']) & (confidence >= w['buy_confidence']),
+            (final_score >= w['monitor_score']) | (confidence >= w['monitor_confidence']),
+            confidence >= w['scout_further_confidence']
+        ],
+        DECISIONS,
+        DEFAULT_DECISION
+    )
+
+    return pd.DataFrame({
+        'contributions': goals + assists,
+        'age_factor': age_factor,
+        'raw_performance': performance,
+        'confidence_factor': confidence_factor,
+        'final_score': final_score,
+        'decision': decision,
+        'confidence': _round(confidence_factor * 100, 1),
+        'performance_score': _round(final_score, 1)
+    }, index=df.index)
+
+
+def recommend_profiles(profiles: list, weights: dict = None) -> list:
+    """Recommendation dicts ({decision, reasoning, confidence, performance_score}) per profile"""
+
+    if not profiles:
+        return []
+
+    scores = score_profiles(profiles, weights)
+    return [
+        {
+            'decision': decision,
+            'reasoning': REASONING[decision].format(contributions=round(contributions)),
+            'confidence': confidence,
+            'performance_score': performance_score
+        }
+        for decision, contributions, confidence, performance_score in zip(
+            scores['decision'], scores['contributions'], scores['confidence'], scores['performance_score']
+        )
+    ]
@@ -0,0 +1,306 @@
+"""Persistent SQLite caches for the APES Football Scout app"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.scout_cache')
+
+
+def cache_path(filename: str) -> str:
+    """Resolve a cache file inside APES_CACHE_DIR (or the default cache dir)"""
+
+    cache_dir = os.environ.get('APES_CACHE_DIR', DEFAULT_CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, filename)
+
+
+class SearchCache:
+    """On-disk cache of Google CSE responses keyed by optimized query + num
+
+    Entries younger than `ttl` are fresh. Entries older than `ttl` but inside
+    `stale_ttl` are served while the caller refreshes them in the background.
+    Older entries are kept (until LRU eviction) so they can still be served
+    when the API quota is exhausted.
+    """
+
+    def __init__(self, path: str, ttl: int = 6 * 3600, stale_ttl: int = 24 * 3600, max_entries: int = 5000):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.stats = {'hits': 0, 'stale': 0, 'misses': 0, 'fallbacks': 0}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                num INTEGER NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_search_cache_access ON search_cache(last_access)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, num: int) -> str:
+        """Normalize the optimized query so case/spacing variants share an entry"""
+
+        return f"{' '.join(query.lower().split())}|{num}"
+
+    def get(self, query: str, num: int):
+        """Return (response, state) where state is 'fresh', 'stale' or None on a miss"""
+
+        key = self.make_key(query, num)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created_at FROM search_cache WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                self.stats['misses'] += 1
+                return None, None
+
+            age = now - row[1]
+            if age < self.ttl:
+                state = 'fresh'
+                self.stats['hits'] += 1
+            elif age < self.ttl + self.stale_ttl:
+                state = 'stale'
+                self.stats['stale'] += 1
+            else:
+                self.stats['misses'] += 1
+                return None, None
+
+            self._conn.execute('UPDATE search_cache SET last_access = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+
+        return json.loads(row[0]), state
+
+    def get_any(self, query: str, num: int):
+        """Return a cached response regardless of age (used when quota is exhausted)"""
+
+        key = self.make_key(query, num)
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response FROM search_cache WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                # Any cached answer for the same query is better than nothing
+                prefix = key.rsplit('|', 1)[0] + '|'
+                row = self._conn.execute(
+                    'SELECT response FROM search_cache WHERE substr(key, 1, length(?)) = ? '
+                    'ORDER BY num DESC LIMIT 1',
+                    (prefix, prefix)
+                ).fetchone()
+
+            if row is None:
+                return None
+
+            self.stats['fallbacks'] += 1
+
+        return json.loads(row[0])
+
+    def put(self, query: str, num: int, response: dict):
+        """Store a response and evict least recently used entries over the limit"""
+
+        key = self.make_key(query, num)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO search_cache (key, query, num, response, created_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, query, num, json.dumps(response, ensure_ascii=False), now, now)
+            )
+            self._conn.execute(
+                'DELETE FROM search_cache WHERE key IN ('
+                'SELECT key FROM search_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def refresh_async(self, query: str, num: int, fetch):
+        """Revalidate a stale entry in a background thread, once per key
+
+        `fetch` returns the new response or None; failures keep the stale entry.
+        """
+
+        key = self.make_key(query, num)
+
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                response = fetch()
+                if response is not None:
+                    self.put(query, num, response)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_refresh, daemon=True).start()
+
+    def size(self) -> int:
+        """Number of cached responses"""
+
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM search_cache').fetchone()[0]
+
+
+class PageCache:
+    """On-disk cache of scraped pages keyed by URL
+
+    Stores the raw HTML (zlib-compressed), the validators needed for a
+    conditional GET (ETag / Last-Modified) and the extracted result, so a
+    fresh or revalidated page skips both the download and the parse.
+    """
+
+    def __init__(self, path: str, max_entries: int = 2000):
+        self.path = path
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS page_cache (
+                url TEXT PRIMARY KEY,
+                html BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                result TEXT NOT NULL,
+                extractor_version INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_page_cache_access ON page_cache(last_access)')
+        self._conn.commit()
+
+    def get(self, url: str):
+        """Return the cached entry dict for `url` or None"""
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT html, etag, last_modified, result, extractor_version, fetched_at '
+                'FROM page_cache WHERE url = ?', (url,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self._conn.execute('UPDATE page_cache SET last_access = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+
+        return {
+            'html': zlib.decompress(row[0]),
+            'etag': row[1],
+            'last_modified': row[2],
+            'result': json.loads(row[3]),
+            'extractor_version': row[4],
+            'fetched_at': row[5]
+        }
+
+    def put(self, url: str, html: bytes, etag: str, last_modified: str, result: dict, extractor_version: int):
+        """Store a fetched page and evict least recently used pages over the limit"""
+
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO page_cache '
+                '(url, html, etag, last_modified, result, extractor_version, fetched_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, zlib.compress(html), etag, last_modified,
+                 json.dumps(result, ensure_ascii=False), extractor_version, now, now)
+            )
+            self._conn.execute(
+                'DELETE FROM page_cache WHERE url IN ('
+                'SELECT url FROM page_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def touch(self, url: str, result: dict = None, extractor_version: int = None):
+        """Mark a page as revalidated (304), optionally replacing a re-extracted result"""
+
+        now = time.time()
+
+        with self._lock:
+            if result is None:
+                self._conn.execute(
+                    'UPDATE page_cache SET fetched_at = ?, last_access = ? WHERE url = ?', (now, now, url)
+                )
+            else:
+                self._conn.execute(
+                    'UPDATE page_cache SET fetched_at = ?, last_access = ?, result = ?, extractor_version = ? '
+                    'WHERE url = ?',
+                    (now, now, json.dumps(result, ensure_ascii=False), extractor_version, url)
+                )
+            self._conn.commit()
+
+    def record(self, outcome: str):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def size(self) -> int:
+        """Number of cached pages"""
+
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM page_cache').fetchone()[0]
+
+
+_search_caches = {}
+_search_caches_lock = threading.Lock()
+
+
+def get_search_cache(path: str = None, **kwargs) -> SearchCache:
+    """Return the process-wide SearchCache for `path`
+
+    Streamlit re-executes app.py on every rerun, so the cache (and its hit/miss
+    counters) lives in this module to survive reruns.
+    """
+
+    path = path or cache_path('search_cache.sqlite3')
+
+    with _search_caches_lock:
+        if path not in _search_caches:
+            _search_caches[path] = SearchCache(path, **kwargs)
+        return _search_caches[path]
+
+
+_page_caches = {}
+_page_caches_lock = threading.Lock()
+
+
+def get_page_cache(path: str = None, **kwargs) -> PageCache:
+    """Return the process-wide PageCache for `path`"""
+
+    path = path or cache_path('page_cache.sqlite3')
+
+    with _page_caches_lock:
+        if path not in _page_caches:
+            _page_caches[path] = PageCache(path, **kwargs)
+        return _page_caches[path]
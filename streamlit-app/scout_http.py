@@ -0,0 +1,78 @@
+"""HTTP helpers shared by the scout engine: per-host rate limiting"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+# Requests per second and burst size per host; everything else uses the default
+DEFAULT_HOST_RATES = {
+    'www.googleapis.com': (5.0, 10),
+}
+DEFAULT_RATE = (2.0, 2)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; `acquire` blocks until a token is available"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it"""
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """One token bucket per host, created on first use"""
+
+    def __init__(self, host_rates: dict = None, default_rate: tuple = DEFAULT_RATE):
+        self.host_rates = dict(DEFAULT_HOST_RATES)
+        self.host_rates.update(host_rates or {})
+        self.default_rate = default_rate
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self.host_rates.get(host, self.default_rate)
+                self._buckets[host] = TokenBucket(rate, burst)
+            return self._buckets[host]
+
+    def acquire(self, url: str):
+        """Block until a request to `url`'s host is allowed"""
+
+        host = urlparse(url).netloc.lower()
+        self.bucket(host).acquire()
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Process-wide limiter so every engine and session shares the same budget"""
+
+    global _rate_limiter
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = HostRateLimiter()
+        return _rate_limiter
@@ -0,0 +1,221 @@
+"""Precompiled regex extraction for scraped text and search snippets
+
+Every pattern is compiled once at import, together with the literal text a
+match must contain (taken from the parsed pattern). Pages are case-folded
+once and a pattern whose literal is absent is skipped without running the
+regex, which is most patterns on most pages. Results match the previous
+per-call `re.search` / `re.findall` loops exactly.
+"""
+
+import re
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Enhanced patterns for youth and unknown players
+EXTRACTION_PATTERNS = {
+    'transfermarkt': {
+        'age': [r'Age:\s*(\d{1,2})', r'(\d{1,2})\s*years old', r'Born:.*\((\d{1,2})\)'],
+        'position': [r'Position:\s*([^,\n]+)', r'Main position:\s*([^,\n]+)'],
+        'market_value': [r'Market value:\s*€([\d.]+)m', r'€([\d.]+)\s*million', r'Value:\s*€([\d.]+)'],
+        'goals': [r'Goals:\s*(\d+)', r'(\d+)\s*goals?', r'Scored:\s*(\d+)'],
+        'assists': [r'Assists:\s*(\d+)', r'(\d+)\s*assists?'],
+        'club': [r'Club:\s*([^,\n]+)', r'Current club:\s*([^,\n]+)', r'Team:\s*([^,\n]+)'],
+        'league': [r'League:\s*([^,\n]+)', r'Competition:\s*([^,\n]+)']
+    },
+    'youth': {
+        'age': [r'U(\d{2})', r'Under[- ]?(\d{2})', r'(\d{1,2})\s*(?:years old|age|anni)'],
+        'team': [r'Academy:\s*([^,\n]+)', r'Youth team:\s*([^,\n]+)', r'Primavera\s*([^,\n]+)'],
+        'goals': [r'(\d+)\s*goals?\s*(?:this season|in \d+ matches)', r'Scored:\s*(\d+)'],
+        'appearances': [r'(\d+)\s*appearances', r'(\d+)\s*matches', r'(\d+)\s*games'],
+        'position': [r'Position:\s*([^,\n]+)', r'Plays as:\s*([^,\n]+)']
+    },
+    'generic': {
+        'age': [r'(\d{1,2})\s*(?:years old|age|anni)', r'Age:?\s*(\d{1,2})', r'nato\s*(?:nel\s*)?\d{4}\s*\((\d{1,2})', r'born\s*\d{4}\s*\((\d{1,2})'],
+        'goals': [r'(\d+)\s*(?:goals?|gol)', r'Goals:?\s*(\d+)', r'scored\s*(\d+)', r'(\d+)\s*reti'],
+        'assists': [r'(\d+)\s*assists?', r'Assists:?\s*(\d+)', r'(\d+)\s*assist'],
+        'market_value': [r'€([\d.]+)(?:\s*(?:million|m|mil))?', r'worth\s*€([\d.]+)', r'valore\s*€([\d.]+)'],
+        'position': [r'Position:?\s*([^,\n]+)', r'plays as\s*([^,\n]+)', r'ruolo:?\s*([^,\n]+)'],
+        'club': [r'(?:club|team|squadra):?\s*([A-Z][^,\n]+)', r'plays for\s*([A-Z][^,\n]+)', r'gioca\s*(?:per|nel)?\s*([A-Z][^,\n]+)']
+    }
+}
+
+# Pattern for Italian/Latin names
+NAME_PATTERN = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,2})\b'
+
+# Common contexts where names appear
+NAME_CONTEXTS = [
+    r'(?:scorer|marcatore|goalscorer):\s*' + NAME_PATTERN,
+    r'(?:player|giocatore|calciatore)\s+' + NAME_PATTERN,
+    NAME_PATTERN + r'\s*\(\d{1,2}\)',  # Name (age)
+    NAME_PATTERN + r'\s*-\s*\d+\s*goals?'  # Name - X goals
+]
+NAME_STOPWORDS = ['the', 'and', 'for', 'with']
+
+INT_FIELDS = {'age', 'goals', 'assists', 'appearances'}
+
+MARKET_VALUE_NUMBER_RE = re.compile(r'([\d.,]+)')
+
+
+def _best_requirement(items) -> tuple:
+    """Literals (any one of them) that every match of a parsed sequence contains"""
+
+    candidates = []
+    run = []
+
+    def flush():
+        if run:
+            candidates.append((''.join(run),))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            requirement = _best_requirement(av[-1])
+        elif op is sre_parse.BRANCH:
+            alternatives = [_best_requirement(alternative) for alternative in av[1]]
+            requirement = tuple(lit for alt in alternatives for lit in alt) if all(alternatives) else None
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            requirement = _best_requirement(av[2])
+        else:
+            requirement = None
+        if requirement:
+            candidates.append(requirement)
+
+    flush()
+
+    if not candidates:
+        return None
+    return max(candidates, key=lambda requirement: min(len(lit) for lit in requirement))
+
+
+class CompiledPattern:
+    """A compiled regex plus the literals that must be present for it to match"""
+
+    def __init__(self, pattern: str, flags: int = 0):
+        self.regex = re.compile(pattern, flags)
+        self.ignorecase = bool(flags & re.IGNORECASE)
+
+        try:
+            requirement = _best_requirement(sre_parse.parse(pattern, flags))
+        except Exception:
+            requirement = None
+        if requirement and self.ignorecase:
+            requirement = tuple(lit.casefold() for lit in requirement)
+        self.requirement = requirement
+
+    def may_match(self, text: str, folded_text: str) -> bool:
+        if not self.requirement:
+            return True
+        haystack = folded_text if self.ignorecase else text
+        return any(lit in haystack for lit in self.requirement)
+
+    def search(self, text: str, folded_text: str):
+        if not self.may_match(text, folded_text):
+            return None
+        return self.regex.search(text)
+
+    def findall(self, text: str, folded_text: str) -> list:
+        if not self.may_match(text, folded_text):
+            return []
+        return self.regex.findall(text)
+
+
+class FieldExtractor:
+    """Field extraction for one site type's pattern set"""
+
+    def __init__(self, field_patterns: dict):
+        self.fields = [
+            (field, [CompiledPattern(pattern, re.IGNORECASE | re.MULTILINE) for pattern in pattern_list])
+            for field, pattern_list in field_patterns.items()
+        ]
+
+    def extract(self, text: str) -> dict:
+        """Extract data using regex patterns"""
+
+        data = {}
+        folded_text = text.casefold()
+
+        # Apply patterns
+        for field, patterns in self.fields:
+            for pattern in patterns:
+                match = pattern.search(text, folded_text)
+                if match:
+                    value = match.group(1).strip()
+
+                    # Process based on field type
+                    if field in INT_FIELDS:
+                        try:
+                            data[field] = int(value)
+                            break
+                        except:
+                            continue
+                    elif field == 'market_value':
+                        # Standardize market value format
+                        data[field] = standardize_market_value(value)
+                        break
+                    else:
+                        if 2 < len(value) < 50:  # Reasonable length
+                            data[field] = value
+                            break
+
+        return data
+
+
+FIELD_EXTRACTORS = {
+    site_type: FieldExtractor(field_patterns)
+    for site_type, field_patterns in EXTRACTION_PATTERNS.items()
+}
+NAME_PATTERNS = [CompiledPattern(context, re.MULTILINE) for context in NAME_CONTEXTS]
+
+
+def extract_fields(text: str, site_type: str) -> dict:
+    """Extract player fields from text with the pattern set for `site_type`"""
+
+    # Choose appropriate patterns
+    extractor = FIELD_EXTRACTORS.get(site_type, FIELD_EXTRACTORS['generic'])
+    return extractor.extract(text)
+
+
+def extract_player_names(text: str, limit: int = 5) -> list:
+    """Extract potential player names from text"""
+
+    names = []
+    for pattern in NAME_PATTERNS:
+        names.extend(pattern.findall(text, text))
+
+    # Clean and deduplicate
+    cleaned_names = []
+    for name in names:
+        name = name.strip()
+        # Filter out common false positives
+        if (len(name.split()) >= 2 and
+                not any(word in name.lower() for word in NAME_STOPWORDS)):
+            cleaned_names.append(name)
+
+    unique_names = list(dict.fromkeys(cleaned_names))
+    return unique_names[:limit] if limit else unique_names
+
+
+def standardize_market_value(value: str) -> str:
+    """Standardize market value format"""
+
+    # Extract numeric value
+    match = MARKET_VALUE_NUMBER_RE.search(value)
+    if match:
+        num = match.group(1).replace(',', '.')
+        try:
+            num_float = float(num)
+            if num_float < 100:  # Assume millions
+                return f"€{num}M"
+            else:  # Assume thousands
+                return f"€{num_float/1000:.1f}M"
+        except:
+            return f"€{value}"
+    return f"€{value}"